@@ -0,0 +1,216 @@
+"""
+Benchmarks of the overhead the library adds per call, against a local HTTP server.
+
+Usage:
+    PYTHONPATH=. python benchmarks/run.py --quick
+    PYTHONPATH=. python benchmarks/run.py --save main
+    PYTHONPATH=. python benchmarks/run.py --compare main
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import requests
+from pydantic import BaseModel
+from requests import HTTPError
+
+import server
+from clientapi import APIHTTPError, ClientAPI, parse, responses
+from clientapi.sessions import SessionRegistry
+
+BASELINES = Path(__file__).parent / "baselines"
+SIZES = {
+    "1KB": 1024,
+    "10KB": 10 * 1024,
+    "100KB": 100 * 1024,
+    "1MB": 1024**2,
+    "10MB": 10 * 1024**2,
+    "50MB": 50 * 1024**2,
+}
+QUICK_SIZES = ("1KB", "100KB", "1MB")
+CONCURRENCY = (1, 8, 32)
+QUICK_CONCURRENCY = (1, 8)
+
+
+class Employee(BaseModel):
+    id: str
+    type: str
+    email: str
+    active: bool
+    salary: float
+    description: str
+
+
+def percentile(values, q):
+    """Nearest rank percentile of a list of values"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+
+def measure(func, iterations, warmup=2):
+    """
+    Runs a function many times and measures its latency, and its allocations in one extra run
+    Returns:
+        Dict[str, float]
+    """
+    for _ in range(warmup):
+        func()
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(latencies, 0.5), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "peak_alloc_kb": round(peak / 1024, 1),
+    }
+
+
+def iterations_for(size, args):
+    # Big payloads get fewer iterations, so every case moves about the same amount of bytes
+    return max(args.min_iterations, min(args.iterations, args.budget // size))
+
+
+def run(args):
+    httpd, url = server.start()
+    registry = SessionRegistry(pool_maxsize=max(args.concurrency))
+    session = registry.get(url)
+
+    bench_logger = logging.getLogger("clientapi.benchmarks")
+    bench_logger.setLevel(logging.DEBUG)
+    bench_logger.propagate = False
+    with open(os.devnull, "w") as devnull:
+        bench_logger.addHandler(logging.StreamHandler(devnull))
+        clients = {
+            "off": ClientAPI(session, url, log_requests=False),
+            "on": ClientAPI(session, url, logger=bench_logger),
+        }
+
+        results = {}
+        try:
+            for size_name in args.sizes:
+                size = SIZES[size_name]
+                iterations = iterations_for(size, args)
+
+                for logging_mode, api in clients.items():
+                    results[f"execute_request[{size_name},log={logging_mode}]"] = measure(
+                        lambda api=api, size=size: api.execute_request("/entity", params={"size": size}),
+                        iterations,
+                    )
+
+                entity_response = clients["off"].execute_request("/entity", params={"size": size})
+                results[f"parse_entity[{size_name}]"] = measure(
+                    lambda response=entity_response: parse(response, responses.entity(Employee)),
+                    iterations,
+                )
+
+                collection_response = clients["off"].execute_request("/collection", params={"size": size})
+                results[f"parse_collection[{size_name}]"] = measure(
+                    lambda response=collection_response: parse(response, responses.collection(Employee)),
+                    iterations,
+                )
+
+            error_response = session.get(f"{url}/error")
+            http_error = HTTPError(response=error_response, request=error_response.request)
+            results["wrap"] = measure(lambda: APIHTTPError.wrap(http_error), args.iterations)
+
+            for concurrency in args.concurrency:
+                specs = [{"resource": "/entity", "params": {"size": 1024}} for _ in range(concurrency * 10)]
+                stats = measure(
+                    lambda specs=specs, concurrency=concurrency: list(
+                        clients["off"].execute_many(specs, max_workers=concurrency)
+                    ),
+                    max(args.min_iterations, args.iterations // 10),
+                )
+                stats["requests_per_s"] = round(len(specs) / (stats["mean_ms"] / 1000), 1)
+                results[f"execute_many[1KB,workers={concurrency}]"] = stats
+        finally:
+            registry.close_all()
+            httpd.shutdown()
+
+    return results
+
+
+def report(results, baseline=None, tolerance=0.25, min_delta_ms=0.05):
+    """
+    Prints the results, compared with a baseline if any. A case regresses when its p50 or its peak of allocations
+    grow more than `tolerance`, and its p50 grows more than `min_delta_ms`, as sub-millisecond timings are noisy
+    Returns:
+        List[str]: the cases that regressed more than the tolerance
+    """
+    regressions = []
+    print(f"{'case':<40} {'p50 ms':>10} {'p99 ms':>10} {'peak KB':>10}  vs baseline")
+    for case, stats in results.items():
+        comparison = ""
+        previous = (baseline or {}).get(case)
+        if previous:
+            changes = {
+                metric: (stats[metric] - previous[metric]) / previous[metric]
+                for metric in ("p50_ms", "peak_alloc_kb")
+                if previous[metric]
+            }
+            comparison = "  ".join(f"{metric} {change:+.0%}" for metric, change in changes.items())
+            slower = stats["p50_ms"] - previous["p50_ms"] > min_delta_ms and changes.get("p50_ms", 0) > tolerance
+            if slower or changes.get("peak_alloc_kb", 0) > tolerance:
+                regressions.append(case)
+                comparison += "  REGRESSION"
+        print(f"{case:<40} {stats['p50_ms']:>10} {stats['p99_ms']:>10} {stats['peak_alloc_kb']:>10}  {comparison}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="Small payloads and concurrency levels only")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), help="Payload sizes")
+    parser.add_argument("--concurrency", nargs="+", type=int, help="Number of workers of execute_many")
+    parser.add_argument("--iterations", type=int, default=200, help="Max iterations per case")
+    parser.add_argument("--min-iterations", type=int, default=5, help="Min iterations per case")
+    parser.add_argument("--budget", type=int, default=200 * 1024**2, help="Bytes to move per case at most")
+    parser.add_argument("--save", metavar="NAME", help="Save the results as a baseline")
+    parser.add_argument("--compare", metavar="NAME", help="Compare with a baseline, failing on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown over the baseline")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="Slowdowns below it are noise")
+    args = parser.parse_args()
+    args.sizes = args.sizes or (QUICK_SIZES if args.quick else list(SIZES))
+    args.concurrency = args.concurrency or (QUICK_CONCURRENCY if args.quick else CONCURRENCY)
+
+    results = run(args)
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads((BASELINES / f"{args.compare}.json").read_text())["results"]
+    regressions = report(results, baseline, args.tolerance, args.min_delta_ms)
+
+    if args.save:
+        BASELINES.mkdir(exist_ok=True)
+        document = {
+            "python": platform.python_version(),
+            "requests": requests.__version__,
+            "platform": platform.platform(),
+            "results": results,
+        }
+        (BASELINES / f"{args.save}.json").write_text(json.dumps(document, indent=2) + "\n")
+
+    if regressions:
+        print(f"\n{len(regressions)} regressions over {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Local HTTP server serving JsonAPI documents of any size, to benchmark the clients against real sockets"""
+import json
+import threading
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ITEM_PADDING = 150
+
+
+@lru_cache(maxsize=32)
+def entity(size):
+    """JsonAPI entity document of about `size` bytes"""
+    document = {"data": _item(0, padding=0)}
+    padding = max(0, size - len(json.dumps(document)) - len('"description"'))
+    return json.dumps({"data": _item(0, padding=padding)}).encode()
+
+
+@lru_cache(maxsize=32)
+def collection(size):
+    """JsonAPI collection document of about `size` bytes"""
+    item_size = len(json.dumps(_item(0, padding=ITEM_PADDING))) + 2
+    count = max(1, size // item_size)
+    return json.dumps({"data": [_item(index, padding=ITEM_PADDING) for index in range(count)]}).encode()
+
+
+ERROR = json.dumps({"code": "employee_not_found", "detail": "The employee does not exist", "source": None}).encode()
+
+
+def _item(index, padding):
+    return {
+        "id": f"{index:08d}",
+        "type": "employees",
+        "email": f"employee{index}@company.com",
+        "active": index % 2 == 0,
+        "salary": 1000.5 + index,
+        "description": "x" * padding,
+    }
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, Nagle's algorithm would delay the body until the client ACKs
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        url = urlsplit(self.path)
+        size = int(parse_qs(url.query).get("size", ["1024"])[0])
+        if url.path == "/entity":
+            self._reply(HTTPStatus.OK, entity(size))
+        elif url.path == "/collection":
+            self._reply(HTTPStatus.OK, collection(size))
+        elif url.path == "/error":
+            self._reply(HTTPStatus.NOT_FOUND, ERROR)
+        else:
+            self._reply(HTTPStatus.NOT_FOUND, b"{}")
+
+    def _reply(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def start():
+    """
+    Starts the server on a free port in a background thread
+    Returns:
+        Tuple[ThreadingHTTPServer, str]: the server, to shut it down, and its base URL
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="benchmark-server", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -1,9 +1,10 @@
-from . import responses
+from . import jsoncodec, responses
 from .client import ClientAPI, ContentType
 from .exceptions import APIClientError, APIHTTPError, APIValidationError
-from .parsers import parse
+from .parsers import parse, parse_stream
 
 __all__ = [
+    "jsoncodec",
     "responses",
     "ClientAPI",
     "ContentType",
@@ -11,5 +12,6 @@ __all__ = [
     "APIHTTPError",
     "APIValidationError",
     "parse",
+    "parse_stream",
     "sessions",
 ]
@@ -0,0 +1,7 @@
+from . import sessions
+from .client import AsyncClientAPI
+
+__all__ = [
+    "AsyncClientAPI",
+    "sessions",
+]
@@ -0,0 +1,139 @@
+import httpx
+
+from clientapi.client import (
+    ContentType,
+    _create_headers,
+    _get_request_log_detail,
+    _get_response_log_detail,
+    _is_log_enabled,
+)
+from clientapi.exceptions import APIHTTPError
+from clientapi.logger import LazyLogDetail, LogPolicy, clientapi_logger
+from clientapi.ratelimit import RateLimiter
+from clientapi.timing import clock
+
+
+def _encode_params(params):
+    """httpx only accepts primitive values in query params, so values like UUIDs are converted
+    to strings the same way requests does it implicitly."""
+    if not params:
+        return params
+
+    primitives = (str, int, float, bool, list)
+    return {key: value if isinstance(value, primitives) else str(value) for key, value in params.items()}
+
+
+def _get_body_kwargs(data):
+    if isinstance(data, (str, bytes)):
+        return {"content": data}
+    return {"data": data}
+
+
+class AsyncClientAPI:  # pylint: disable=too-few-public-methods
+    """Base class to define thin asyncio clients to API Clients.
+
+    It mirrors `clientapi.ClientAPI` but runs on top of an `httpx.AsyncClient`, so many
+    concurrent calls can share one event loop and one connection pool.
+
+    Usage:
+    >>> from clientapi import parse
+    >>> from clientapi.aio import AsyncClientAPI
+    >>>
+    >>> class YourAPI(AsyncClientAPI):
+    >>>
+    >>>    async def update_something(self, thing_id, payload: PayloadPydanticModel) -> SomethingPydanticModel:
+    >>>         path = f"/something/{thing_id}"
+    >>>         response = await self.execute_request(
+    >>>             path,
+    >>>             method="PATCH",
+    >>>             data=payload.json(),
+    >>>         )
+    >>>         return parse(response, model=SomethingPydanticModel)
+
+    """
+
+    def __init__(
+        self,
+        session,
+        url,
+        logger=None,
+        log_requests=True,
+        log_policy: LogPolicy = None,
+        rate_limiter: RateLimiter = None,
+    ):  # pylint: disable=too-many-arguments
+        """Instantiates a thin asyncio client to communicate with an API.
+
+        Args:
+            session (httpx.AsyncClient): A initialized async session instance.
+            url (str): Base URL of the API.
+            logger (Logger): Logger to use for debugging purposes. Defaults to lib logger
+            log_requests (bool): Whether to log requests and responses at all. Defaults to True
+            log_policy (LogPolicy): Truncation, redaction and sampling of the logs. Defaults to `LogPolicy()`
+            rate_limiter (RateLimiter): Client side rate limiter, usually shared by many clients. Defaults to None
+        """
+        self._session = session
+        self._url = url
+        self._logger = logger or clientapi_logger
+        self._log_requests = log_requests
+        self._log_policy = log_policy or LogPolicy()
+        self._rate_limiter = rate_limiter
+
+    async def execute_request(
+        self,
+        resource,
+        method="GET",
+        params=None,
+        headers=None,
+        data=None,
+        timeout=None,
+        content_type: ContentType = ContentType.JSON,
+    ) -> httpx.Response:  # pylint: disable=too-many-arguments
+        """Low-level coroutine for API calls.
+        It wraps the httpx library for managing sessions and custom Exceptions
+
+        Args:
+            resource (str): Path of the resource.
+            method (str, optional): HTTP method to execute. Defaults to "GET".
+            params (Dict[str, str], optional): Query parameters to include in the URL. Defaults to None.
+            headers (Dict[str, str], optional): HTTP method to execute. Defaults to None.
+            data (Any, optional): Payload to send in the body. Defaults to None.
+            timeout (int, optional): Amount of seconds to wait for a timeout and raise an exception.
+                Defaults to the timeout configured in the session.
+            content_type (ContentType, optional): Content-type of data. Only used if data is present. Defaults to JSON.
+        Raises:
+            APIHTTPError: Error that occurred during the execution of the request if HTTPStatusError takes place.
+            RateLimitExceeded: If the client has a rate limiter and it ran out of tokens.
+
+        Returns:
+            httpx.Response: Model for the HTTP response in httpx
+        """
+        url = f"{self._url}{resource}"
+        if self._rate_limiter:
+            await self._rate_limiter.acquire_async(self._url, method)
+
+        try:
+            headers = _create_headers(headers, data, content_type)
+
+            log_enabled = _is_log_enabled(self._logger, self._log_requests, self._log_policy)
+            if log_enabled:
+                request = {"url": url, "method": method, "params": params, "headers": headers, "data": data}
+                self._logger.debug("Request: %s", LazyLogDetail(_get_request_log_detail, request, self._log_policy))
+            start = clock()
+            response = await self._session.request(
+                method,
+                url,
+                params=_encode_params(params),
+                headers=headers,
+                timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout,
+                **_get_body_kwargs(data),
+            )
+            end = clock()
+            if log_enabled:
+                self._logger.debug(
+                    "Response: %s",
+                    LazyLogDetail(_get_response_log_detail, response, start, end, self._log_policy),
+                )
+            response.raise_for_status()
+            return response
+        except httpx.HTTPStatusError as err:
+            raise APIHTTPError.wrap(err) from err
@@ -0,0 +1,85 @@
+from contextlib import asynccontextmanager
+
+import httpx
+from requests.auth import AuthBase
+
+from clientapi.auth import Bearer, SharedSecret
+
+
+@asynccontextmanager
+async def no_auth(**client_kwargs):
+    """
+    Creates an async HTTP session with the default configuration
+    Args:
+        client_kwargs: extra arguments for httpx.AsyncClient (e.g. limits, timeout)
+
+    Returns:
+        httpx.AsyncClient
+    """
+    async with httpx.AsyncClient(**client_kwargs) as session:
+        yield session
+
+
+@asynccontextmanager
+async def bearer(bearer_token, **client_kwargs):
+    """
+    Creates an async HTTP session with a bearer token
+
+    Args:
+        bearer_token: token to use as a bearer
+        client_kwargs: extra arguments for httpx.AsyncClient (e.g. limits, timeout)
+
+    Returns:
+        httpx.AsyncClient
+    """
+    async with httpx.AsyncClient(auth=Bearer(bearer_token), **client_kwargs) as session:
+        yield session
+
+
+@asynccontextmanager
+async def shared_secret(secret_key, **client_kwargs):
+    """
+    Creates an async HTTP session with shared secret auth
+    Args:
+        secret_key (str): shared secret key value
+        client_kwargs: extra arguments for httpx.AsyncClient (e.g. limits, timeout)
+
+    Returns:
+        httpx.AsyncClient
+    """
+    async with httpx.AsyncClient(auth=SharedSecret(secret_key), **client_kwargs) as session:
+        yield session
+
+
+@asynccontextmanager
+async def basic(username, password, **client_kwargs):
+    """
+    Creates an async HTTP session with basic auth
+    Args:
+        username (str): username to use in the session
+        password (str): password to use in the session
+        client_kwargs: extra arguments for httpx.AsyncClient (e.g. limits, timeout)
+
+    Returns:
+        httpx.AsyncClient
+    """
+    async with httpx.AsyncClient(auth=httpx.BasicAuth(username, password), **client_kwargs) as session:
+        yield session
+
+
+@asynccontextmanager
+async def base(base_auth: AuthBase, **client_kwargs):
+    """
+    Creates an async HTTP session using a AuthBase object
+
+    The auth object is called with every outgoing request, so any requests AuthBase that only
+    sets headers (like the ones in `clientapi.auth`) or any httpx.Auth works.
+    Args:
+        base_auth (AuthBase): AuthBase
+        client_kwargs: extra arguments for httpx.AsyncClient (e.g. limits, timeout)
+
+    Returns:
+        httpx.AsyncClient
+    """
+    async with httpx.AsyncClient(auth=base_auth, **client_kwargs) as session:
+        yield session
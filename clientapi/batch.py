@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from requests import RequestException, Response
+
+from clientapi.exceptions import APIClientError
+
+DEFAULT_MAX_WORKERS = 10
+
+
+class BatchResult:  # pylint: disable=too-few-public-methods
+    """Outcome of one of the requests of a batch.
+
+    Attributes:
+        index (int): Position of the request in the batch.
+        request (Dict[str, Any]): Keyword arguments used to execute the request.
+        response (Response): The response, if the request succeeded.
+        error (Exception): The error raised by the request, if it failed.
+    """
+    __slots__ = ("index", "request", "response", "error")
+
+    def __init__(self, index, request, response=None, error=None):
+        self.index: int = index
+        self.request: Dict[str, Any] = request
+        self.response: Optional[Response] = response
+        self.error: Optional[Exception] = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        outcome = f"error={self.error!r}" if self.error else f"response={self.response!r}"
+        return f"BatchResult(index={self.index}, {outcome})"
+
+
+def execute_many(
+    execute,
+    requests: Iterable[Dict[str, Any]],
+    max_workers=DEFAULT_MAX_WORKERS,
+    ordered=True,
+) -> Iterator[BatchResult]:
+    """
+    Runs independent requests on a bounded thread pool
+    Args:
+        execute (Callable): function executing a single request, e.g. `ClientAPI.execute_request`
+        requests: keyword arguments for every call to `execute`
+        max_workers (int): max number of concurrent requests
+        ordered (bool): yield the results in input order if True, or as soon as they complete otherwise
+
+    Returns:
+        Iterator of BatchResult
+    """
+    requests = list(requests)
+    if not requests:
+        return
+
+    def run(index, request):
+        try:
+            return BatchResult(index, request, response=execute(**request))
+        except (APIClientError, RequestException) as err:
+            return BatchResult(index, request, error=err)
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(requests)))
+    futures = [executor.submit(run, index, request) for index, request in enumerate(requests)]
+    try:
+        for future in (futures if ordered else as_completed(futures)):
+            yield future.result()
+    finally:
+        # Don't keep sending requests nobody is going to consume
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
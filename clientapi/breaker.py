@@ -0,0 +1,209 @@
+import threading
+import time
+from collections import deque
+from enum import Enum
+from http import HTTPStatus
+
+from clientapi.exceptions import APIClientError
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(APIClientError):
+    code = "circuit_open"
+    detail = "The circuit breaker is open, so the request was not sent"
+    source = None
+
+
+class CircuitBreaker:
+    """Thread safe circuit breaker for the requests of a client (or of every client of a base URL).
+
+    While CLOSED, the outcome of the last `window_size` calls is recorded. Once there are at least
+    `minimum_calls` of them, the circuit OPENs if the rate of failures or the rate of slow calls
+    reaches its threshold. While OPEN, calls fail immediately with CircuitOpenError. After
+    `open_timeout` seconds the circuit becomes HALF_OPEN and lets `half_open_max_calls` trial calls
+    through: it closes again if all of them succeed, or re-opens on the first failure.
+
+    Usage:
+    >>> from clientapi import ClientAPI
+    >>> from clientapi.breaker import CircuitBreaker
+    >>>
+    >>> breaker = CircuitBreaker(failure_rate_threshold=0.5, slow_call_duration=2, open_timeout=10)
+    >>> breaker.add_listener(lambda breaker, old, new: print(f"{old} -> {new}"))
+    >>> api = ClientAPI(session, url, circuit_breaker=breaker)
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold=0.5,
+        slow_call_rate_threshold=1.0,
+        slow_call_duration=None,
+        window_size=20,
+        minimum_calls=10,
+        open_timeout=30,
+        half_open_max_calls=1,
+        clock=time.monotonic,
+    ):  # pylint: disable=too-many-arguments
+        """
+        Args:
+            failure_rate_threshold (float): Rate of failed calls (0 to 1) that opens the circuit.
+            slow_call_rate_threshold (float): Rate of slow calls (0 to 1) that opens the circuit.
+            slow_call_duration (float, optional): Seconds after which a call is considered slow.
+                Defaults to None (latency is not taken into account).
+            window_size (int): Number of recent calls used to compute the rates.
+            minimum_calls (int): Min number of recorded calls before the rates are evaluated.
+            open_timeout (float): Seconds to stay OPEN before letting trial calls through.
+            half_open_max_calls (int): Number of trial calls while HALF_OPEN.
+            clock (Callable[[], float]): Monotonic clock in seconds.
+        """
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.minimum_calls = min(minimum_calls, window_size)
+        self.open_timeout = open_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._calls = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = None
+        self._half_open_calls = 0
+        self._half_open_successes = 0
+        self._generation = 0
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            transition = self._refresh_state()
+        self._notify(transition)
+        return self._state
+
+    def add_listener(self, listener):
+        """
+        Registers a function called on every state change
+        Args:
+            listener (Callable[[CircuitBreaker, CircuitState, CircuitState], None]): called with the
+                breaker, the old state and the new state
+        """
+        self._listeners.append(listener)
+
+    def before_call(self):
+        """
+        Checks whether a call can go through
+        Returns:
+            int: the permit of the call, to pass to `record` or `release` once the call is done
+        Raises:
+            CircuitOpenError: when the circuit is open, or half open without trial calls left
+        """
+        with self._lock:
+            transition = self._refresh_state()
+            allowed = self._state == CircuitState.CLOSED
+            if self._state == CircuitState.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                allowed = True
+            permit = self._generation
+        self._notify(transition)
+
+        if not allowed:
+            raise CircuitOpenError(source={"state": self._state.value, "retry_after": self._get_retry_after()})
+        return permit
+
+    def record(self, failed, duration, permit=None):
+        """
+        Records the outcome of a call that went through `before_call`. Every call that went through
+        has to be either recorded or released
+        Args:
+            failed (bool): whether the call failed
+            duration (float): seconds the call took
+            permit (int, optional): permit returned by `before_call`. The outcome of a call let through
+                before the last state change is ignored. Defaults to None (always recorded)
+        """
+        slow = self.slow_call_duration is not None and duration >= self.slow_call_duration
+
+        transition = None
+        with self._lock:
+            if self._is_stale(permit):
+                return
+            if self._state == CircuitState.HALF_OPEN:
+                transition = self._record_half_open(failed or slow)
+            elif self._state == CircuitState.CLOSED:
+                self._calls.append((failed, slow))
+                if self._is_over_threshold():
+                    transition = self._open()
+        self._notify(transition)
+
+    def release(self, permit=None):
+        """Gives back the permit of a call that went through `before_call` but whose outcome says nothing
+        about the server (e.g. its request body failed), so a trial call of HALF_OPEN is not lost"""
+        with self._lock:
+            if not self._is_stale(permit) and self._state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_success(self, duration=0.0, permit=None):
+        self.record(False, duration, permit)
+
+    def record_failure(self, duration=0.0, permit=None):
+        self.record(True, duration, permit)
+
+    @staticmethod
+    def is_failure(response=None, error=None):
+        """Errors and server errors count as failures. Client errors (4xx) are the caller's fault"""
+        return error is not None or response is None or response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+
+    def _record_half_open(self, failed):
+        if failed:
+            return self._open()
+
+        self._half_open_successes += 1
+        if self._half_open_successes >= self.half_open_max_calls:
+            return self._transition(CircuitState.CLOSED)
+        return None
+
+    def _is_stale(self, permit):
+        return permit is not None and permit != self._generation
+
+    def _is_over_threshold(self):
+        total = len(self._calls)
+        if total < self.minimum_calls:
+            return False
+
+        failures = sum(1 for failed, _ in self._calls if failed)
+        slow_calls = sum(1 for _, slow in self._calls if slow)
+        return failures / total >= self.failure_rate_threshold or slow_calls / total >= self.slow_call_rate_threshold
+
+    def _refresh_state(self):
+        if self._state == CircuitState.OPEN and self._clock() - self._opened_at >= self.open_timeout:
+            return self._transition(CircuitState.HALF_OPEN)
+        return None
+
+    def _open(self):
+        self._opened_at = self._clock()
+        return self._transition(CircuitState.OPEN)
+
+    def _transition(self, new_state):
+        old_state = self._state
+        self._state = new_state
+        self._calls.clear()
+        self._half_open_calls = 0
+        self._half_open_successes = 0
+        self._generation += 1
+        return old_state, new_state
+
+    def _get_retry_after(self):
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.open_timeout - (self._clock() - self._opened_at))
+
+    def _notify(self, transition):
+        # Listeners are called outside of the lock, so they can safely check the breaker
+        if transition is None:
+            return
+
+        old_state, new_state = transition
+        for listener in self._listeners:
+            listener(self, old_state, new_state)
@@ -0,0 +1,351 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from clientapi import jsoncodec
+
+CACHEABLE_METHODS = frozenset({"GET", "HEAD"})
+CACHEABLE_STATUSES = frozenset({
+    HTTPStatus.OK,
+    HTTPStatus.NON_AUTHORITATIVE_INFORMATION,
+    HTTPStatus.MOVED_PERMANENTLY,
+    HTTPStatus.PERMANENT_REDIRECT,
+})
+# Headers that differ on every request without changing the response, e.g. the ones of tracing
+IGNORED_HEADERS = frozenset({
+    "baggage",
+    "sentry-trace",
+    "traceparent",
+    "tracestate",
+    "x-amzn-trace-id",
+    "x-correlation-id",
+    "x-request-id",
+})
+
+
+def request_key(method, url, params=None, headers=None, ignored_headers=IGNORED_HEADERS):
+    """
+    Builds a stable key for a request out of its method, URL, query parameters and headers
+
+    Every header is part of the key but the `ignored_headers`, as any of them (a tenant, the
+    credentials...) can change the response. Their values are hashed, so credentials don't end up
+    in the key, which is logged and stored
+    Args:
+        method (str): HTTP method
+        url (str): URL of the request, without query parameters
+        params (Union[Dict, List[Tuple]], optional): query parameters
+        headers (Dict[str, str], optional): headers of the request
+        ignored_headers (Iterable[str]): lowercase names of the headers left out of the key
+
+    Returns:
+        str
+    """
+    key = f"{method.upper()} {url}"
+
+    if params:
+        items = params.items() if hasattr(params, "items") else params
+        query = []
+        for name, value in items:
+            values = value if isinstance(value, (list, tuple)) else [value]
+            query.extend((str(name), str(v)) for v in values)
+        key += f"?{urlencode(sorted(query))}"
+
+    if headers:
+        varying = sorted((str(name).lower(), str(value)) for name, value in headers.items())
+        varying = [(name, value) for name, value in varying if name not in ignored_headers]
+        if varying:
+            digest = hashlib.sha256(repr(varying).encode("utf-8")).hexdigest()[:16]
+            key += f" [{', '.join(name for name, _ in varying)} {digest}]"
+
+    return key
+
+
+class CachedResponse:
+    """Copy of a response stored in a cache, with its freshness information"""
+    __slots__ = ("status_code", "reason", "headers", "content", "url", "encoding", "expires_at")
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, status_code, reason, headers, content, url, encoding, expires_at):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = dict(headers)
+        self.content = content
+        self.url = url
+        self.encoding = encoding
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_response(cls, response: Response, expires_at):
+        return cls(
+            status_code=response.status_code,
+            reason=response.reason,
+            headers=response.headers,
+            content=response.content,
+            url=response.url,
+            encoding=response.encoding,
+            expires_at=expires_at,
+        )
+
+    @property
+    def size(self):
+        return len(self.content)
+
+    def is_fresh(self, now=None):
+        return self.expires_at > (time.time() if now is None else now)
+
+    def validators(self):
+        """Conditional headers to revalidate the response with the server"""
+        headers = CaseInsensitiveDict(self.headers)
+        validators = {}
+        if "ETag" in headers:
+            validators["If-None-Match"] = headers["ETag"]
+        if "Last-Modified" in headers:
+            validators["If-Modified-Since"] = headers["Last-Modified"]
+        return validators
+
+    def to_response(self) -> Response:
+        response = Response()
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        response.url = self.url
+        response.encoding = self.encoding
+        return response
+
+
+class MemoryCache:
+    """Thread safe in-memory LRU cache backend, bounded by number of entries and bytes of content"""
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry: CachedResponse):
+        if entry.size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = entry
+            self._size += entry.size
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def delete(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+
+class SQLiteCache:
+    """Thread safe on-disk cache backend on top of SQLite, with LRU eviction bounded by bytes of content"""
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024):
+        """
+        Args:
+            path (str): Path of the SQLite database file. It is created if it doesn't exist.
+            max_bytes (int): Max bytes of content to keep. Least recently used entries are evicted first.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, status_code INTEGER, reason TEXT, headers TEXT, content BLOB, url TEXT, "
+            "encoding TEXT, expires_at REAL, size INTEGER, accessed_at REAL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    def get(self, key):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status_code, reason, headers, content, url, encoding, expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+
+        status_code, reason, headers, content, url, encoding, expires_at = row
+        return CachedResponse(status_code, reason, jsoncodec.loads(headers), bytes(content), url, encoding, expires_at)
+
+    def set(self, key, entry: CachedResponse):
+        if entry.size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.status_code,
+                    entry.reason,
+                    jsoncodec.dumps(entry.headers),
+                    entry.content,
+                    entry.url,
+                    entry.encoding,
+                    entry.expires_at,
+                    entry.size,
+                    time.time(),
+                ),
+            )
+            self._evict()
+
+    def delete(self, key):
+        with self._lock:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+
+    def close(self):
+        self._connection.close()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _evict(self):
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._connection.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                return
+
+
+class ResponseCache:
+    """HTTP cache for the safe requests of a client.
+
+    Freshness comes from the `Cache-Control` (`max-age`, `no-cache`, `no-store`) and `Expires` headers
+    of the responses, falling back to `default_ttl`. Stale responses with an `ETag` or `Last-Modified`
+    are revalidated with a conditional request, and a `304 Not Modified` is served from the cache.
+
+    Every header of the request is part of the cache key (see `request_key`), and responses with
+    `Vary: *` are not stored. The session auth and headers are not part of it though, so a cache must
+    not be shared by clients with different credentials.
+
+    Usage:
+    >>> from clientapi import ClientAPI
+    >>> from clientapi.cache import ResponseCache, SQLiteCache
+    >>>
+    >>> api = ClientAPI(session, url, cache=ResponseCache(SQLiteCache("/tmp/clientapi.sqlite")))
+    """
+
+    def __init__(self, backend=None, default_ttl=0, methods=CACHEABLE_METHODS, statuses=CACHEABLE_STATUSES):
+        """
+        Args:
+            backend (Union[MemoryCache, SQLiteCache], optional): Storage of the responses. Defaults to MemoryCache.
+            default_ttl (float): Seconds a response without freshness information is fresh. Defaults to 0
+                (revalidated on every use if it has validators, not stored otherwise).
+            methods (Iterable[str]): Methods whose responses are cached.
+            statuses (Iterable[int]): Status codes of the responses that are cached.
+        """
+        self.backend = backend if backend is not None else MemoryCache()
+        self.default_ttl = default_ttl
+        self.methods = frozenset(method.upper() for method in methods)
+        self.statuses = frozenset(statuses)
+
+    def is_cacheable(self, method):
+        return method.upper() in self.methods
+
+    def get(self, key):
+        return self.backend.get(key)
+
+    def store(self, key, response: Response):
+        """Stores a response if it is cacheable and it can be used in the future"""
+        if response.status_code not in self.statuses:
+            return
+        if response.headers.get("Vary", "").strip() == "*":
+            return
+
+        expires_at = self._get_expires_at(response)
+        if expires_at is None:
+            return
+
+        entry = CachedResponse.from_response(response, expires_at)
+        if entry.is_fresh() or entry.validators():
+            self.backend.set(key, entry)
+
+    def revalidate(self, key, entry: CachedResponse, not_modified: Response) -> Response:
+        """Refreshes a stored response with the headers of a 304 and returns the stored response"""
+        entry.headers.update(not_modified.headers)
+        expires_at = self._get_expires_at(entry)
+        if expires_at is None:
+            self.backend.delete(key)
+        else:
+            entry.expires_at = expires_at
+            self.backend.set(key, entry)
+        return entry.to_response()
+
+    def _get_expires_at(self, response):
+        """Timestamp until the response is fresh, or None if it must not be stored"""
+        headers = CaseInsensitiveDict(response.headers)
+        now = time.time()
+
+        directives = _parse_cache_control(headers.get("Cache-Control", ""))
+        if "no-store" in directives:
+            return None
+        if "no-cache" in directives:
+            return now
+
+        max_age = directives.get("max-age")
+        if max_age is not None:
+            try:
+                return now + int(max_age)
+            except ValueError:
+                return now
+
+        if "Expires" in headers:
+            try:
+                return parsedate_to_datetime(headers["Expires"]).timestamp()
+            except (TypeError, ValueError):
+                return now
+
+        return now + self.default_ttl
+
+
+def _parse_cache_control(value):
+    directives = {}
+    for directive in value.split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
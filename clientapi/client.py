@@ -1,18 +1,32 @@
 import json
+import logging
 import time
+from collections.abc import Iterator
 from enum import Enum
-from uuid import UUID
+from http import HTTPStatus
 
 import requests
-from requests import HTTPError, Response
+from pydantic import ValidationError
+from requests import HTTPError, RequestException, Response
+from requests.structures import CaseInsensitiveDict
 
-from clientapi.exceptions import APIHTTPError
-from clientapi.logger import clientapi_logger
+from clientapi import batch, jsoncodec, pagination, responses, timing, transfer
+from clientapi.breaker import CircuitBreaker
+from clientapi.cache import ResponseCache, request_key
+from clientapi.compression import Compression
+from clientapi.exceptions import APIHTTPError, APIValidationError
+from clientapi.instrumentation import RequestInfo
+from clientapi.logger import LazyLogDetail, LogPolicy, clientapi_logger
+from clientapi.parsers import DEFAULT_PARSE_POLICY, ParsePolicy, parse
+from clientapi.ratelimit import RateLimiter
+from clientapi.retry import RetryPolicy
+from clientapi.singleflight import SAFE_METHODS, SingleFlight
 
 
 class ContentType(str, Enum):
     JSON = "application/json"
     XML = "text/xml"
+    OCTET_STREAM = "application/octet-stream"
 
 
 def _create_headers(headers, data, content_type):
@@ -48,17 +62,55 @@ class ClientAPI:  # pylint: disable=too-few-public-methods
 
     """
 
-    def __init__(self, session, url, logger=None):
+    def __init__(
+        self,
+        session,
+        url,
+        logger=None,
+        log_requests=True,
+        log_policy: LogPolicy = None,
+        retry: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        circuit_breaker: CircuitBreaker = None,
+        cache: ResponseCache = None,
+        single_flight=False,
+        parse_policy: ParsePolicy = None,
+        compression: Compression = None,
+        instrumentation=None,
+    ):  # pylint: disable=too-many-arguments
         """Instantiates a thin client to communicate with an API.
 
         Args:
             session (requests.Session): A initialized session instance.
             url (str): Base URL of the API.
             logger (Logger): Logger to use for debugging purposes. Defaults to lib logger
+            log_requests (bool): Whether to log requests and responses at all. Defaults to True
+            log_policy (LogPolicy): Truncation, redaction and sampling of the logs. Defaults to `LogPolicy()`
+            retry (RetryPolicy): Policy to retry failed requests. Defaults to None (no retries)
+            rate_limiter (RateLimiter): Client side rate limiter, usually shared by many clients. Defaults to None
+            circuit_breaker (CircuitBreaker): Breaker to fail fast while the API is down. Defaults to None
+            cache (ResponseCache): HTTP cache for the responses of safe methods. Defaults to None
+            single_flight (bool): Whether concurrent identical safe requests (see `cache.request_key`) share a single
+                upstream call. Defaults to False
+            parse_policy (ParsePolicy): Whether `parse` and `paginate` validate the responses. Defaults to validating
+                all of them
+            compression (Compression): Compression of the request bodies. Defaults to None (not compressed)
+            instrumentation (Iterable[Instrumentation]): Hooks called on every request, e.g. for metrics or
+                tracing. Defaults to None
         """
         self._session = session
         self._url = url
         self._logger = logger or clientapi_logger
+        self._log_requests = log_requests
+        self._log_policy = log_policy or LogPolicy()
+        self._retry = retry
+        self._rate_limiter = rate_limiter
+        self._circuit_breaker = circuit_breaker
+        self._cache = cache
+        self._single_flight = SingleFlight() if single_flight else None
+        self._parse_policy = parse_policy or DEFAULT_PARSE_POLICY
+        self._compression = compression
+        self._instrumentation = tuple(instrumentation or ())
 
     def execute_request(
         self,
@@ -69,6 +121,9 @@ class ClientAPI:  # pylint: disable=too-few-public-methods
         data=None,
         timeout=None,
         content_type: ContentType = ContentType.JSON,
+        stream=False,
+        compression=None,
+        route=None,
     ) -> Response:  # pylint: disable=too-many-arguments
         """Low-level function for API calls.
         It wraps the requests library for managing sessions and custom Exceptions
@@ -78,65 +133,459 @@ class ClientAPI:  # pylint: disable=too-few-public-methods
             method (str, optional): HTTP method to execute. Defaults to "GET".
             params (Dict[str, str], optional): Query parameters to include in the URL. Defaults to None.
             headers (Dict[str, str], optional): HTTP method to execute. Defaults to None.
-            data (Any, optional): Payload to send in the body. Defaults to None.
+            data (Any, optional): Payload to send in the body. Besides strings and bytes, it can be an upload source
+                streamed without loading it nor logging it: a binary file, an iterator of bytes (sent with chunked
+                transfer encoding), an mmap or a memoryview. Defaults to None.
             timeout (int, optional): Amount of seconds to wait for a timeout and raise an exception
             content_type (ContentType, optional): Content-type of data. Only used if data is present. Defaults to JSON.
+            stream (bool, optional): Whether to return as soon as the headers arrive, leaving the body to be read
+                with `Response.iter_content` (see `clientapi.parse_stream`). Streamed responses are neither
+                cached, coalesced nor logged with their body. Defaults to False.
+            compression (Union[Compression, bool], optional): Compression of the body of this request, or False to
+                not compress it. Defaults to the compression of the client.
+            route (str, optional): Template of the path of the resource, e.g. `Path.EMPLOYEE`, to group the requests
+                in the instrumentation. Defaults to the resource.
         Raises:
             APIHTTPError: Error that occurred during the execution of the request if HTTPError takes place.
+                If the client has a retry policy, it is raised once the policy gives up.
+            RateLimitExceeded: If the client has a rate limiter and it ran out of tokens.
+            CircuitOpenError: If the client has a circuit breaker and it is open.
 
         Returns:
             Response: Model for the HTTP response in requests
         """
+        start = timing.clock()
         url = f"{self._url}{resource}"
+        request = {
+            "url": url,
+            "method": method,
+            "params": params,
+            "headers": _create_headers(headers, data, content_type),
+            "data": data,
+            "timeout": timeout,
+            "stream": stream,
+            "timing": timing.Timing(),
+        }
+
+        compression = self._compression if compression is None else compression
+        if compression:
+            _compress_request(request, compression)
+
+        call = None
+        if self._instrumentation:
+            request["headers"] = dict(request["headers"])
+            call = request["call"] = RequestInfo(method, route or resource, url, request["headers"])
+            self._instrument("before_request", call)
+
+        try:
+            if self._single_flight and method.upper() in SAFE_METHODS and not data and not stream:
+                key = request_key(method, url, params, request["headers"])
+                response = self._single_flight.do(key, lambda: self._dispatch(request))
+            else:
+                response = self._dispatch(request)
+        except Exception as err:
+            if call is not None:
+                self._instrument("on_error", call, err)
+            raise
+
+        # Callers coalesced by single flight get a copy of the response of the leader, with their own timing
+        request["timing"].total_ms = timing.elapsed_ms(start)
+        response.timing = request["timing"]
+        if call is not None:
+            self._instrument("after_response", call, response)
+        return response
+
+    def _instrument(self, hook, call, *args):
+        for instrumentation in self._instrumentation:
+            try:
+                getattr(instrumentation, hook)(call, *args)
+            except Exception:  # pylint: disable=broad-except
+                self._logger.exception("Instrumentation hook %s failed for %s %s", hook, call.method, call.route)
+
+    def _dispatch(self, request):
+        if self._cache and self._cache.is_cacheable(request["method"]) and not request["stream"]:
+            return self._execute_cached(request)
+
+        return self._execute(request)
+
+    def _execute_cached(self, request):
+        key = request_key(request["method"], request["url"], request["params"], request["headers"])
+        entry = self._cache.get(key)
+        if entry is not None:
+            if entry.is_fresh():
+                if self._log_requests:
+                    self._logger.debug("Cache hit: %s", key)
+                request["timing"].cached = True
+                return entry.to_response()
+            request = {**request, "headers": {**request["headers"], **entry.validators()}}
+
+        response = self._execute(request)
+        if entry is not None and response.status_code == HTTPStatus.NOT_MODIFIED:
+            return self._cache.revalidate(key, entry, response)
+
+        self._cache.store(key, response)
+        return response
+
+    def _execute(self, request):
+        attempt = 1
+        started_at = time.monotonic()
+        first_attempt_at = timing.clock()
+        body_position = _get_body_position(request["data"])
+        can_retry = self._retry is not None and _can_resend(request["data"], body_position)
+        while True:
+            response, error = self._attempt(request)
+            delay = None
+            if can_retry:
+                delay = self._retry.next_delay(request["method"], attempt, started_at, response, error)
+            if delay is None:
+                break
+
+            if response is not None:
+                response.close()
+            self._log_retry(request, attempt, delay, response, error)
+            if "call" in request:
+                self._instrument("on_retry", request["call"], attempt, delay, response, error)
+            self._retry.sleep(delay)
+            if body_position is not None:
+                request["data"].seek(body_position)
+            request["timing"].retry_ms = timing.elapsed_ms(first_attempt_at)
+            attempt += 1
+
+        if error is not None:
+            raise error
+
         try:
-            headers = _create_headers(headers, data, content_type)
-
-            self._logger.debug(f"Request: %s", _get_request_log_detail(url, method, headers, data, params))
-            start = time.time()
-            response = self._session.request(
-                url=url,
-                method=method,
-                params=params,
-                headers=headers,
-                data=data,
-                timeout=timeout,
-            )
-            end = time.time()
-            self._logger.debug(f"Response: %s", _get_response_log_detail(response, start, end))
             response.raise_for_status()
             return response
         except HTTPError as err:
             raise APIHTTPError.wrap(err) from err
 
+    def _attempt(self, request):
+        """Sends the request once, going through the circuit breaker and rate limiter.
+        Returns the response and the error (if any) of the attempt"""
+        queued_at = timing.clock()
+        # The token is taken first, so a rate limited call doesn't hold a trial call of a half open breaker
+        if self._rate_limiter:
+            self._rate_limiter.acquire(self._url, request["method"])
+        permit = None
+        if self._circuit_breaker:
+            permit = self._circuit_breaker.before_call()
+        if self._circuit_breaker or self._rate_limiter:
+            request["timing"].add_queue(queued_at)
+
+        response = error = None
+        sent = False
+        start = time.monotonic()
+        try:
+            try:
+                response = self._send(request)
+            except RequestException as err:
+                error = err
+            sent = True
+        finally:
+            if self._circuit_breaker:
+                if sent:
+                    failed = self._circuit_breaker.is_failure(response, error)
+                    self._circuit_breaker.record(failed, time.monotonic() - start, permit)
+                else:
+                    # Any other error (e.g. a failing upload) says nothing about the server
+                    self._circuit_breaker.release(permit)
+
+        return response, error
+
+    def _send(self, request) -> Response:
+        log_enabled = _is_log_enabled(self._logger, self._log_requests, self._log_policy)
+        if log_enabled:
+            self._logger.debug("Request: %s", LazyLogDetail(_get_request_log_detail, request, self._log_policy))
+
+        request_timing = request["timing"]
+        request_timing.attempts += 1
+        # The body is read here rather than by requests, so the time to first byte and the download can be told apart
+        start = timing.clock()
+        response = self._session.request(**{name: request[name] for name in _SESSION_ARGS}, stream=True)
+        headers_at = timing.clock()
+        request_timing.ttfb_ms = timing.elapsed_ms(start, headers_at)
+        if not request["stream"]:
+            _ = response.content
+            request_timing.download_ms = timing.elapsed_ms(headers_at)
+        end = timing.clock()
+
+        if log_enabled:
+            self._logger.debug(
+                "Response: %s",
+                LazyLogDetail(
+                    _get_response_log_detail,
+                    response,
+                    start,
+                    end,
+                    self._log_policy,
+                    request["stream"],
+                    request_timing.compress_ms,
+                ),
+            )
+        return response
+
+    def _log_retry(self, request, attempt, delay, response, error):  # pylint: disable=too-many-arguments
+        if self._log_requests and self._logger.isEnabledFor(logging.INFO):
+            self._logger.info(
+                "Retry: %s",
+                LazyLogDetail(_get_retry_log_detail, request, attempt, delay, response, error),
+            )
+
+    def execute_many(self, requests, max_workers=batch.DEFAULT_MAX_WORKERS, ordered=True):
+        """Executes many independent requests concurrently on a bounded thread pool.
+
+        All of them share the session of the client, so its connection pool should be at least as big
+        as `max_workers` (see `clientapi.sessions.SessionRegistry`). Errors of single requests are
+        captured in their result and do not abort the rest of the batch.
+
+        Usage:
+        >>> ids = ["id1", "id2"]
+        >>> specs = [{"resource": Path.EMPLOYEE.format(employee_id=i)} for i in ids]
+        >>> for result in api.execute_many(specs, max_workers=20):
+        >>>     if result.ok:
+        >>>         employee = parse(result.response, entity(Employee))
+
+        Args:
+            requests (Iterable[Dict[str, Any]]): Keyword arguments of `execute_request` for every request.
+            max_workers (int, optional): Max number of concurrent requests. Defaults to 10.
+            ordered (bool, optional): Yield results in input order, or as they complete if False. Defaults to True.
+
+        Returns:
+            Iterator[BatchResult]: One result per request, with either the response or the error.
+        """
+        return batch.execute_many(self.execute_request, requests, max_workers=max_workers, ordered=ordered)
+
+    def download(
+        self,
+        resource,
+        dest,
+        params=None,
+        headers=None,
+        timeout=None,
+        chunk_size=transfer.DOWNLOAD_CHUNK_SIZE,
+        checksum=None,
+        resume=False,
+    ) -> transfer.DownloadResult:  # pylint: disable=too-many-arguments
+        """Streams the body of a resource into a file, a binary handle or a preallocated buffer.
+
+        The body is read in chunks of `chunk_size` bytes and written as they arrive, so it is never held
+        in memory (nor logged) as a whole.
+
+        Usage:
+        >>> result = api.download(Path.REPORT, "/tmp/report.csv", checksum="sha256", resume=True)
+        >>> print(result.size, result.checksum)
+
+        Args:
+            resource (str): Path of the resource.
+            dest (Union[str, PathLike, BinaryIO, bytearray, memoryview]): Where to write the body.
+            params (Dict[str, str], optional): Query parameters to include in the URL. Defaults to None.
+            headers (Dict[str, str], optional): Headers of the request. Defaults to None.
+            timeout (int, optional): Amount of seconds to wait for a timeout. Defaults to None.
+            chunk_size (int, optional): Bytes to read from the network at a time. Defaults to 1 MiB.
+            checksum (str, optional): `hashlib` algorithm to compute while streaming, e.g. "sha256". Defaults to None.
+            resume (bool, optional): Whether to continue the partial download of a file path with an HTTP Range.
+                Defaults to False.
+        Raises:
+            APIHTTPError: If the request fails.
+            DownloadError: If the body doesn't fit in the buffer or the server answers with another range.
 
-def _get_request_log_detail(url, method, headers, data, params):
+        Returns:
+            DownloadResult: Bytes written, total size and checksum of the content.
+        """
+        return transfer.download(
+            self.execute_request,
+            resource,
+            dest,
+            params=params,
+            headers=headers,
+            timeout=timeout,
+            chunk_size=chunk_size,
+            checksum=checksum,
+            resume=resume,
+        )
+
+    def parse(self, response: Response, model):
+        """Parses the content of a response to a pydantic model following the parse policy of the client
+
+        Usage:
+        >>> response = self.execute_request(Path.EMPLOYEE.format(employee_id=employee_id))
+        >>> return self.parse(response, model=responses.entity(Employee))
+
+        Args:
+            response (Response): Response of a request.
+            model (Type[BaseModel]): Pydantic model of the content.
+        Raises:
+            APIValidationError: If the content is not valid (when validated).
+
+        Returns:
+            BaseModel: Instance of the model.
+        """
+        return parse(response, model, policy=self._parse_policy)
+
+    def paginate(
+        self,
+        resource,
+        model,
+        params=None,
+        headers=None,
+        timeout=None,
+        paginator=None,
+        prefetch=1,
+    ):  # pylint: disable=too-many-arguments
+        """Lazily iterates over the items of every page of a JsonAPI collection.
+
+        The next pages are fetched in a background thread, at most `prefetch` of them ahead of the
+        one being processed, so network latency overlaps with the processing of the items.
+
+        Usage:
+        >>> from clientapi.pagination import Cursor
+        >>>
+        >>> for employee in api.paginate(Path.EMPLOYEES, Employee, paginator=Cursor()):
+        >>>     ...
+
+        Args:
+            resource (str): Path of the first page.
+            model (Type[BaseModel]): Pydantic model of every item.
+            params (Dict[str, Any], optional): Query parameters of the first page. Defaults to None.
+            headers (Dict[str, str], optional): Headers of every page request. Defaults to None.
+            timeout (int, optional): Amount of seconds to wait for every page. Defaults to None.
+            paginator (optional): Pagination scheme from `clientapi.pagination`. Defaults to `LinksNext()`.
+            prefetch (int, optional): Max pages fetched ahead, 0 to fetch them synchronously. Defaults to 1.
+        Raises:
+            APIHTTPError: If a page request fails.
+            APIValidationError: If a page is not a valid collection of the model.
+            PaginationError: If the link to the next page is not under the base URL of the client.
+
+        Returns:
+            Iterator[BaseModel]: Items of every page.
+        """
+        collection = responses.collection(model)
+
+        def fetch_page(page_resource, page_params):
+            response = self.execute_request(page_resource, params=page_params, headers=headers, timeout=timeout)
+            try:
+                body = jsoncodec.loads(response.content)
+                return body, self._parse_policy.build(collection, body).data or []
+            except ValidationError as err:
+                raise APIValidationError.wrap(err) from err
+            except ValueError as err:
+                raise APIValidationError(source=[{"msg": str(err), "type": "value_error.jsondecode"}]) from err
+
+        return pagination.iter_pages(
+            fetch_page,
+            paginator or pagination.LinksNext(),
+            self._url,
+            resource,
+            params,
+            prefetch=prefetch,
+        )
+
+
+def _get_body_position(data):
+    """Position of a file-like body, to rewind it before sending it again. None for other bodies"""
+    if not (hasattr(data, "read") and hasattr(data, "seek")):
+        return None
+    try:
+        return data.tell()
+    except OSError:
+        return None
+
+
+def _can_resend(data, body_position):
+    """Iterators and unseekable files are consumed by the first attempt, so they can't be retried"""
+    if hasattr(data, "read"):
+        return body_position is not None
+    return not isinstance(data, Iterator)
+
+
+_SESSION_ARGS = ("url", "method", "params", "headers", "data", "timeout")
+
+
+def _compress_request(request, compression: Compression):
+    headers = dict(request["headers"])
+    # Header names are case insensitive, the ones of the caller are kept as they are though
+    names = CaseInsensitiveDict(headers)
+    if compression.accept_encoding and "Accept-Encoding" not in names:
+        headers["Accept-Encoding"] = compression.accept_encoding
+
+    # A body that is already encoded is sent as it is
+    result = None if "Content-Encoding" in names else compression.compress(request["data"])
+    if result is not None:
+        data, detail = result
+        headers["Content-Encoding"] = detail["encoding"]
+        # The original body is kept for the logs
+        request["compression"] = {**detail, "body": request["data"]}
+        request["data"] = data
+        request["timing"].compress_ms = detail["time_ms"]
+
+    request["headers"] = headers
+
+
+def _is_log_enabled(logger, log_requests, log_policy: LogPolicy):
+    return log_requests and logger.isEnabledFor(logging.DEBUG) and log_policy.sample()
+
+
+def _get_request_log_detail(request, log_policy: LogPolicy):
     log_fields = {
-        "url": url,
-        "method": method,
+        "url": request["url"],
+        "method": request["method"],
     }
 
-    if headers:
-        log_fields["headers"] = headers
-    if data:
-        log_fields["data"] = data
-    if params:
-        log_fields["params"] = params
+    compression = request.get("compression")
+    if request["headers"]:
+        log_fields["headers"] = log_policy.headers(request["headers"])
+    if request["data"]:
+        # Compressed bodies are logged as they were before compressing them
+        log_fields["data"] = log_policy.body(compression["body"] if compression else request["data"])
+    if request["params"]:
+        log_fields["params"] = request["params"]
+    if compression:
+        log_fields["compression"] = {name: value for name, value in compression.items() if name != "body"}
 
-    return json.dumps(log_fields, cls=LogEncoder)
+    return jsoncodec.dumps(log_fields)
 
 
-def _get_response_log_detail(response: requests.Response, start, end):
+def _get_response_log_detail(
+    response: requests.Response,
+    start,
+    end,
+    log_policy: LogPolicy,
+    stream=False,
+    compress_ms=None,
+):  # pylint: disable=too-many-arguments
     log_fields = {
         "status_code": response.status_code,
         "time_ms": _get_elapsed_time_ms(start, end),
     }
+    if compress_ms is not None:
+        # Time spent compressing the request body, not included in time_ms
+        log_fields["compress_ms"] = compress_ms
 
-    if response.text:
-        log_fields["body"] = response.text
+    # The body of a streamed response is read by the caller, logging it would load it all in memory
+    body = None if stream else log_policy.response_body(response)
+    if body:
+        log_fields["body"] = body
     if response.headers:
-        log_fields["headers"] = dict(response.headers)
+        log_fields["headers"] = log_policy.headers(response.headers)
+
+    return jsoncodec.dumps(log_fields)
+
+
+def _get_retry_log_detail(request, attempt, delay, response, error):
+    log_fields = {
+        "url": request["url"],
+        "method": request["method"],
+        "attempt": attempt,
+        "delay_ms": round(delay * 1000, 2),
+    }
+
+    if response is not None:
+        log_fields["status_code"] = response.status_code
+    if error is not None:
+        log_fields["error"] = repr(error)
 
-    return json.dumps(log_fields)
+    return jsoncodec.dumps(log_fields)
 
 
 def _get_elapsed_time_ms(start, end):
@@ -155,6 +604,4 @@ class LogEncoder(json.JSONEncoder):
     """
 
     def default(self, o):
-        if isinstance(o, UUID):
-            return str(o)
-        return json.JSONEncoder.default(self, o)
+        return jsoncodec.default(o)
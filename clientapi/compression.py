@@ -0,0 +1,94 @@
+import gzip
+import time
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+def _gzip(data, level):
+    # mtime=0 keeps the output deterministic
+    return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+
+
+def _deflate(data, level):
+    return zlib.compress(data, 6 if level is None else level)
+
+
+def _brotli(data, level):
+    return brotli.compress(data, quality=4 if level is None else level)
+
+
+def _zstd(data, level):
+    return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+
+
+ENCODERS = {"gzip": _gzip, "deflate": _deflate}
+if brotli is not None:
+    ENCODERS["br"] = _brotli
+if zstandard is not None:
+    ENCODERS["zstd"] = _zstd
+
+
+class Compression:
+    """Compression of the request bodies of a client, and the encodings it accepts in the responses.
+
+    Only string and bytes bodies of at least `threshold` bytes are compressed, upload sources (files,
+    iterators...) are sent as they are. Responses are decompressed by requests for any encoding it supports.
+
+    Usage:
+    >>> from clientapi.compression import Compression
+    >>>
+    >>> api = ClientAPI(session, url, compression=Compression("gzip", threshold=4096))
+    """
+
+    def __init__(self, encoding="gzip", threshold=1024, level=None, accept_encoding=None):
+        """
+        Args:
+            encoding (str): One of "gzip", "deflate", "br" (needs brotli) or "zstd" (needs zstandard).
+            threshold (int): Min bytes of a body to compress it.
+            level (int, optional): Compression level of the encoding. Defaults to a fast one.
+            accept_encoding (str, optional): Value of the `Accept-Encoding` header of every request, e.g.
+                "identity" to get uncompressed responses. Defaults to None (the one of requests).
+        """
+        if encoding not in ENCODERS:
+            raise ValueError(f"Not supported or not installed encoding: {encoding}. Available: {sorted(ENCODERS)}")
+
+        self.encoding = encoding
+        self.threshold = threshold
+        self.level = level
+        self.accept_encoding = accept_encoding
+        self._encoder = ENCODERS[encoding]
+
+    def compress(self, data):
+        """
+        Compresses a body if it is worth it
+        Args:
+            data (Any): body of a request
+
+        Returns:
+            Tuple[bytes, Dict]: the compressed body and the details of the compression, or None if the body
+                is not compressed
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if not isinstance(data, bytes) or len(data) < self.threshold:
+            return None
+
+        start = time.perf_counter()
+        compressed = self._encoder(data, self.level)
+        elapsed = time.perf_counter() - start
+
+        return compressed, {
+            "encoding": self.encoding,
+            "original_bytes": len(data),
+            "compressed_bytes": len(compressed),
+            "time_ms": round(elapsed * 1000, 2),
+        }
@@ -1,10 +1,11 @@
+import re
 from http import HTTPStatus
 from typing import Any
 
 from pydantic import ValidationError
 from requests import HTTPError
 
-from clientapi.responses import JsonAPIErrorResponse
+from clientapi import jsoncodec, responses
 
 
 class APIClientError(Exception):
@@ -22,13 +23,28 @@ class APIClientError(Exception):
         if source:
             self.source = source
 
-        message = f"({self.code}) {self.detail}. "
+        # The message is only formatted when it is used, formatting big sources is expensive and most errors are
+        # handled without printing them
+        self._with_source = bool(source)
+        self._message = None
 
-        if source:
-            message += f"Source: {str(source)}"
-            self.source = source
+        # Cheap arguments, so `args` still tells the errors apart without formatting the message
+        super().__init__(self.code, self.detail)
+
+    def __str__(self):
+        if self._message is None:
+            message = f"({self.code}) {self.detail}. "
+            if self._with_source:
+                message += f"Source: {str(self.source)}"
+            self._message = message
+        return self._message
 
-        super().__init__(message)
+    def __repr__(self):
+        return f"{type(self).__name__}(code={self.code!r}, detail={self.detail!r})"
+
+    def __reduce__(self):
+        # Rebuilt from its attributes, as the arguments of the constructor are not kept
+        return type(self).__new__, (type(self), *self.args), self.__dict__
 
     @property
     def content(self):
@@ -55,31 +71,92 @@ class APIValidationError(APIClientError):
 
 class APIHTTPError(APIClientError):
     status_code: HTTPStatus = None
+    max_text_length = 2048
 
-    def __init__(self, code, detail, source, status_code):
+    def __init__(self, code, detail, source, status_code, errors=None):
         if status_code:
             self.status_code = status_code
 
+        self.errors = errors if errors is not None else responses.JsonAPIErrors()
+
         super().__init__(code, detail, source)
 
     @classmethod
     def wrap(cls, http_error: HTTPError):
+        """
+        Builds the error out of the JsonAPI error document in the body of the response, or out of the
+        request and a snapshot of the body (at most `max_text_length` chars) when the body is not one.
+
+        Documents with an `errors` array take the code, detail and source of its first error, and expose
+        all of them lazily in `errors`. Bodies that can't be a JsonAPI error (another Content-Type, or not
+        a JSON object) are not parsed, so storms of HTML error pages from proxies are cheap to wrap.
+        """
+        response = http_error.response
+        status_code = response.status_code
+
+        errors = _parse_errors(response)
+        if errors:
+            first = errors[0]
+            return cls(
+                code=first.code or "unknown",
+                detail=first.detail or first.title or str(http_error),
+                source=first.source,
+                status_code=status_code,
+                errors=errors,
+            )
+
+        url = getattr(response, "url", None)
+        source = {
+            "method": getattr(http_error.request, "method", None),
+            "url": str(url) if url is not None else None,
+            "status_code": getattr(response, "status_code", None),
+            "text": _get_text_snapshot(response, cls.max_text_length),
+        }
+        return cls(code="unknown", detail=str(http_error), source=source, status_code=status_code)
 
-        try:
-            error = JsonAPIErrorResponse.parse_raw(http_error.response.content)
-            code = error.code
-            detail = error.detail
-            source = error.source
-        except ValidationError:
-            code = "unknown"
-            detail = str(http_error)
-            source = {
-                "method": getattr(http_error.request, "method", None),
-                "url": getattr(http_error.response, "url", None),
-                "status_code": getattr(http_error.response, "status_code", None),
-                "text": getattr(http_error.response, "text", None),
-            }
-
-        status_code = http_error.response.status_code
-
-        return cls(code=code, detail=detail, source=source, status_code=status_code)
+
+_JSON_OBJECT_START = re.compile(rb"\s*{")
+
+
+def _parse_errors(response):
+    headers = getattr(response, "headers", None) or {}
+    content_type = headers.get("Content-Type")
+    if content_type and "json" not in content_type.lower():
+        return None
+
+    content = response.content
+    if not content or not _JSON_OBJECT_START.match(content):
+        return None
+
+    try:
+        document = jsoncodec.loads(content)
+    except ValueError:
+        return None
+
+    raw_errors = document.get("errors") if isinstance(document, dict) else None
+    if isinstance(raw_errors, list):
+        return responses.JsonAPIErrors(raw_errors)
+
+    try:
+        error = responses.JsonAPIErrorResponse.parse_obj(document)
+    except ValueError:
+        # Not a JsonAPI error document (ValidationError is a ValueError)
+        return None
+    return responses.JsonAPIErrors([error.dict()])
+
+
+def _get_text_snapshot(response, max_length):
+    content = getattr(response, "content", None)
+    if content is None:
+        return getattr(response, "text", None)
+
+    # The encoding of the headers is used when there is one, guessing it from the content is expensive
+    encoding = getattr(response, "encoding", None) or "utf-8"
+    try:
+        "".encode(encoding)
+    except LookupError:
+        encoding = "utf-8"
+
+    if len(content) <= max_length:
+        return content.decode(encoding, errors="replace")
+    return f"{content[:max_length].decode(encoding, errors='ignore')}...[truncated, {len(content)} in total]"
@@ -0,0 +1,235 @@
+import bisect
+import threading
+from collections import namedtuple
+
+from clientapi.exceptions import APIHTTPError
+from clientapi.timing import clock, elapsed_ms
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # pragma: no cover
+    propagate = trace = SpanKind = Status = StatusCode = None
+
+DEFAULT_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+Labels = namedtuple("Labels", ("method", "route", "status_code", "error_code"))
+
+
+class RequestInfo:  # pylint: disable=too-few-public-methods
+    """A call to `execute_request`, as seen by the instrumentation hooks.
+
+    Attributes:
+        method (str): HTTP method.
+        route (str): Template of the path, e.g. "/employees/{employee_id}", to group the calls in metrics.
+        url (str): Expanded URL, without query parameters.
+        headers (Dict[str, str]): Headers of the request. `before_request` can add some, e.g. to propagate a trace.
+        start (float): Reading of `clientapi.timing.clock` when the call started.
+        context (Dict[str, Any]): State of the hooks for this call, e.g. a span.
+    """
+    __slots__ = ("method", "route", "url", "headers", "start", "context")
+
+    def __init__(self, method, route, url, headers):
+        self.method = method.upper()
+        self.route = str(getattr(route, "value", route))
+        self.url = url
+        self.headers = headers
+        self.start = clock()
+        self.context = {}
+
+    def elapsed_ms(self):
+        return elapsed_ms(self.start)
+
+
+class Instrumentation:
+    """Hooks called on every call to `execute_request`. They do nothing by default, subclasses override
+    the ones they need. Errors raised by a hook are logged, and never break the request.
+
+    Usage:
+    >>> from clientapi.instrumentation import InMemoryMetrics
+    >>>
+    >>> metrics = InMemoryMetrics()
+    >>> api = ClientAPI(session, url, instrumentation=[metrics])
+    >>> api.execute_request(Path.EMPLOYEE.format(employee_id=employee_id), route=Path.EMPLOYEE)
+    """
+
+    def before_request(self, call: RequestInfo):
+        """Called before sending the request, or looking it up in the cache"""
+
+    def after_response(self, call: RequestInfo, response):
+        """Called with the successful response of the call"""
+
+    def on_error(self, call: RequestInfo, error):
+        """Called with the error raised by the call, e.g. APIHTTPError or CircuitOpenError"""
+
+    def on_retry(self, call: RequestInfo, attempt, delay, response, error):  # pylint: disable=too-many-arguments
+        """Called before waiting `delay` seconds to retry a failed `attempt`, with its response or error"""
+
+
+def get_labels(call: RequestInfo, response=None, error=None) -> Labels:
+    """Labels of a call for metrics: method, route, status code and error code"""
+    status_code = response.status_code if response is not None else getattr(error, "status_code", None)
+    error_code = None
+    if error is not None:
+        error_code = getattr(error, "code", None) or type(error).__name__
+    return Labels(call.method, call.route, int(status_code) if status_code else None, error_code)
+
+
+class Histogram:
+    """Thread safe histogram with fixed buckets and no dependencies
+
+    Usage:
+    >>> histogram = Histogram(buckets=(10, 100, 1000))
+    >>> histogram.observe(42)
+    >>> histogram.quantile(0.99)
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets (Iterable[float]): Upper bounds of the buckets, in increasing order. Values above the last
+                one are counted in an extra overflow bucket.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, q):
+        """
+        Estimates a quantile interpolating linearly within its bucket
+        Args:
+            q (float): quantile between 0 and 1, e.g. 0.99 for p99
+
+        Returns:
+            float, or None if nothing was observed
+        """
+        with self._lock:
+            if not self.count:
+                return None
+
+            rank = q * self.count
+            seen = 0
+            for index, count in enumerate(self.counts):
+                if count and seen + count >= rank:
+                    # The observed min and max narrow the first, last and overflow buckets
+                    lower = max(self.buckets[index - 1], self.min) if index > 0 else self.min
+                    upper = min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+                    return lower + (upper - lower) * (rank - seen) / count
+                seen += count
+            return self.max
+
+
+class InMemoryMetrics(Instrumentation):
+    """Counters and latency histograms of the calls, kept in memory and labeled by method, route,
+    status code and error code.
+
+    Attributes:
+        requests (Dict[Labels, int]): Number of calls.
+        latency (Dict[Labels, Histogram]): Duration of the calls in milliseconds, retries included.
+        retries (Dict[Labels, int]): Number of retries, labeled with the outcome of the retried attempt.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.requests = {}
+        self.latency = {}
+        self.retries = {}
+        self._lock = threading.Lock()
+
+    def after_response(self, call, response):
+        self._record(get_labels(call, response=response), call.elapsed_ms())
+
+    def on_error(self, call, error):
+        self._record(get_labels(call, error=error), call.elapsed_ms())
+
+    def on_retry(self, call, attempt, delay, response, error):  # pylint: disable=too-many-arguments
+        labels = get_labels(call, response, error)
+        with self._lock:
+            self.retries[labels] = self.retries.get(labels, 0) + 1
+
+    def histogram(self, method, route, status_code=None, error_code=None):
+        """Latency histogram of some labels, or None if there were no such calls"""
+        return self.latency.get(Labels(method.upper(), str(getattr(route, "value", route)), status_code, error_code))
+
+    def _record(self, labels, duration_ms):
+        with self._lock:
+            self.requests[labels] = self.requests.get(labels, 0) + 1
+            histogram = self.latency.get(labels)
+            if histogram is None:
+                histogram = self.latency[labels] = Histogram(self.buckets)
+        histogram.observe(duration_ms)
+
+
+class OpenTelemetryTracing(Instrumentation):
+    """Traces every call with a client span of an OpenTelemetry tracer, following the HTTP semantic
+    conventions. Retries are recorded as span events.
+
+    The tracer is only used through `start_span`, and its spans through `set_attribute`, `add_event`,
+    `record_exception` and `end`, so any object with that interface works. When the `opentelemetry-api`
+    package is installed, the span is marked as a client one, its status is set on errors and its
+    context is propagated in the headers of the request.
+
+    Usage:
+    >>> from opentelemetry import trace
+    >>> from clientapi.instrumentation import OpenTelemetryTracing
+    >>>
+    >>> api = ClientAPI(session, url, instrumentation=[OpenTelemetryTracing(trace.get_tracer("clientapi"))])
+    """
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def before_request(self, call):
+        attributes = {
+            "http.request.method": call.method,
+            "http.route": call.route,
+            "url.full": call.url,
+        }
+        if SpanKind is not None:
+            span = self.tracer.start_span(f"{call.method} {call.route}", kind=SpanKind.CLIENT, attributes=attributes)
+            propagate.inject(call.headers, context=trace.set_span_in_context(span))
+        else:
+            span = self.tracer.start_span(f"{call.method} {call.route}", attributes=attributes)
+        call.context["span"] = span
+
+    def after_response(self, call, response):
+        span = call.context.pop("span")
+        span.set_attribute("http.response.status_code", response.status_code)
+        span.end()
+
+    def on_error(self, call, error):
+        span = call.context.pop("span")
+        labels = get_labels(call, error=error)
+        if labels.status_code is not None:
+            span.set_attribute("http.response.status_code", labels.status_code)
+        span.set_attribute("error.type", labels.error_code)
+        span.record_exception(error)
+        if Status is not None:
+            detail = error.detail if isinstance(error, APIHTTPError) else str(error)
+            span.set_status(Status(StatusCode.ERROR, detail))
+        span.end()
+
+    def on_retry(self, call, attempt, delay, response, error):  # pylint: disable=too-many-arguments
+        labels = get_labels(call, response, error)
+        attributes = {"attempt": attempt, "delay_ms": round(delay * 1000, 2)}
+        if labels.status_code is not None:
+            attributes["http.response.status_code"] = labels.status_code
+        if labels.error_code is not None:
+            attributes["error.type"] = labels.error_code
+        call.context["span"].add_event("retry", attributes=attributes)
@@ -0,0 +1,82 @@
+import datetime
+import json
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def default(o):
+    """Serializes the types the stdlib JSON encoder doesn't know about"""
+    if isinstance(o, UUID):
+        return str(o)
+    if isinstance(o, (datetime.datetime, datetime.date, datetime.time)):
+        return o.isoformat()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class StdlibCodec:
+    """JSON codec on top of the stdlib `json` module"""
+    name = "json"
+
+    def dumps(self, obj) -> str:
+        return json.dumps(obj, default=default)
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """JSON codec on top of `orjson`. UUIDs and datetimes are serialized natively, in the same format as the stdlib
+    codec, but the output is compact (no whitespace after separators).
+
+    Unlike the stdlib codec, integers that don't fit in 64 bits are decoded as (rounded) floats, and NaN and
+    Infinity are rejected, so it is opt-in through `set_codec`"""
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+        self._option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj) -> str:
+        return orjson.dumps(obj, default=default, option=self._option).decode()
+
+    def loads(self, data):
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+        return orjson.loads(data)
+
+
+_codec = StdlibCodec()
+
+
+def get_codec():
+    """The codec used to encode and decode JSON across the package"""
+    return _codec
+
+
+def set_codec(codec):
+    """
+    Replaces the codec used to encode and decode JSON across the package
+
+    Usage:
+    >>> from clientapi import jsoncodec
+    >>>
+    >>> jsoncodec.set_codec(jsoncodec.OrjsonCodec())
+
+    Args:
+        codec: object with `dumps(obj) -> str` and `loads(Union[str, bytes])` methods. `loads` must raise a ValueError
+            on malformed documents.
+    """
+    global _codec  # pylint: disable=global-statement,invalid-name
+    _codec = codec
+
+
+def dumps(obj) -> str:
+    return _codec.dumps(obj)
+
+
+def loads(data):
+    return _codec.loads(data)
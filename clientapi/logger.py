@@ -1,4 +1,9 @@
 import logging
+import mmap
+import random
+from collections.abc import Iterator
+
+from requests.utils import super_len
 
 DEFAULT_FORMAT = "%(asctime)s %(levelname)s [%(name)s] [%(filename)s:%(lineno)d] - %(message)s"
 
@@ -11,3 +16,112 @@ def setup_logger():
 
 
 clientapi_logger = setup_logger()
+
+
+class LazyLogDetail:  # pylint: disable=too-few-public-methods
+    """Defers the serialization of a log detail until a handler actually formats the record.
+
+    The logging module only calls `str()` on the arguments of a record when it is emitted, so
+    passing an instance of this class as a `%s` argument skips the work for filtered records.
+    """
+    __slots__ = ("_func", "_args", "_value")
+
+    def __init__(self, func, *args):
+        self._func = func
+        self._args = args
+        self._value = None
+
+    def __str__(self):
+        if self._value is None:
+            self._value = self._func(*self._args)
+        return self._value
+
+
+class LogPolicy:  # pylint: disable=too-few-public-methods
+    """Controls how much of every request and response ends up in the debug logs.
+
+    Usage:
+    >>> from clientapi import ClientAPI
+    >>> from clientapi.logger import LogPolicy
+    >>>
+    >>> policy = LogPolicy(max_body_length=2048, sample_rate=0.1)
+    >>> api = ClientAPI(session, url, log_policy=policy)
+    """
+    REDACTED = "[REDACTED]"
+    DEFAULT_REDACTED_HEADERS = ("Authorization", "SHARED_SECRET")
+    DEFAULT_MAX_BYTES_BODY_LENGTH = 4096
+
+    def __init__(self, max_body_length=None, redact_headers=DEFAULT_REDACTED_HEADERS, sample_rate=1.0):
+        """
+        Args:
+            max_body_length (int, optional): Max amount of characters of a body to log. Longer bodies are
+                truncated. Defaults to None (no limit, except for bytes request bodies, which could be binary
+                and are capped to DEFAULT_MAX_BYTES_BODY_LENGTH).
+            redact_headers (Iterable[str]): Name of the headers whose value is replaced in the logs. The match
+                is case insensitive. Defaults to Authorization and SHARED_SECRET (see `clientapi.auth`).
+            sample_rate (float): Fraction of the requests to log, between 0 and 1. Defaults to 1 (all of them).
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"sample_rate must be between 0 and 1, got {sample_rate}")
+
+        self.max_body_length = max_body_length
+        self.redact_headers = frozenset(header.lower() for header in redact_headers)
+        self.sample_rate = sample_rate
+
+    def sample(self):
+        """Decides whether the current request has to be logged"""
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def headers(self, headers):
+        return {
+            name: self.REDACTED if name.lower() in self.redact_headers else value
+            for name, value in headers.items()
+        }
+
+    def body(self, body):
+        if _is_stream(body):
+            return _describe_stream(body)
+
+        if isinstance(body, bytes):
+            max_length = self.DEFAULT_MAX_BYTES_BODY_LENGTH if self.max_body_length is None else self.max_body_length
+            return _truncate_bytes(body, "utf-8", max_length)
+
+        if not isinstance(body, str) or self.max_body_length is None or len(body) <= self.max_body_length:
+            return body
+
+        return _truncated(body[:self.max_body_length], len(body))
+
+    def response_body(self, response):
+        """Returns the body of the response to log without decoding more than what is going to be logged"""
+        if self.max_body_length is None:
+            return response.text
+
+        return _truncate_bytes(response.content, response.encoding or "utf-8", self.max_body_length)
+
+
+def _is_stream(body):
+    """Whether a request body is an upload source (file, iterator, mmap or buffer) rather than an in-memory payload"""
+    return hasattr(body, "read") or isinstance(body, (Iterator, memoryview, bytearray, mmap.mmap))
+
+
+def _describe_stream(body):
+    # Upload sources are never logged, they could be huge and reading them would consume them
+    if isinstance(body, Iterator) and not hasattr(body, "read"):
+        return f"[{type(body).__name__} upload]"
+    try:
+        return f"[{type(body).__name__} upload, {super_len(body)} bytes]"
+    except (OSError, ValueError):
+        return f"[{type(body).__name__} upload]"
+
+
+def _truncate_bytes(content, encoding, max_length):
+    if len(content) <= max_length:
+        return content.decode(encoding, errors="replace")
+
+    # A char is encoded with at least one byte, so this slice always holds enough chars
+    head = content[:max_length].decode(encoding, errors="ignore")
+    return _truncated(head[:max_length], len(content))
+
+
+def _truncated(head, total_length):
+    return f"{head}...[truncated, {total_length} in total]"
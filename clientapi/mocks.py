@@ -3,6 +3,8 @@ import json
 import re
 from http import HTTPStatus
 
+from clientapi import jsoncodec
+
 
 def _strip_xml(xml):
     return re.sub(r"\s+", "", xml)
@@ -12,10 +14,13 @@ def _transform(body, headers):
     headers = headers or {}
     if body is not None:
         if isinstance(body, (dict, list)):
+            # Encoded with the stdlib so bodies keep the format of `json.dumps`, which tests compare against
             body = json.dumps(body)
             headers["Content-Type"] = "application/json"
         elif isinstance(body, str):
             headers["Content-Type"] = "text/xml"
+        elif isinstance(body, bytes):
+            headers.setdefault("Content-Type", "application/octet-stream")
         else:
             raise ValueError(f"Not supported type for body: {type(body)}")
     else:
@@ -26,7 +31,7 @@ def _transform(body, headers):
 def _get_request_body(request):
     content_type = request.headers.get("Content-Type")
     if content_type == "application/json":
-        body = json.loads(request.body)
+        body = jsoncodec.loads(request.body)
     elif content_type == "text/xml":
         body = _strip_xml(request.body)
     else:
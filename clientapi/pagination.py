@@ -0,0 +1,209 @@
+import threading
+from queue import Full, Queue
+from urllib.parse import urljoin, urlsplit
+
+from clientapi.exceptions import APIClientError
+
+
+class PaginationError(APIClientError):
+    code = "pagination_error"
+    detail = "The next page is not under the base URL of the client"
+    source = None
+
+
+class LinksNext:  # pylint: disable=too-few-public-methods
+    """Follows the `links.next` URL of JsonAPI documents until it is missing or null.
+
+    Relative links are resolved against the URL of the current page. The scheme of the links is
+    not checked, but they have to point to the host and path of the base URL of the client.
+
+    Docs:
+    https://jsonapi.org/format/#fetching-pagination
+    """
+
+    def first(self, resource, params):
+        return resource, params
+
+    def next(self, base_url, resource, params, body, items):  # pylint: disable=too-many-arguments,unused-argument
+        link = (body.get("links") or {}).get("next")
+        if isinstance(link, dict):
+            link = link.get("href")
+        if not link:
+            return None
+
+        # The link already carries every query parameter, including the ones of the first request
+        return _get_resource(base_url, resource, link), None
+
+
+class Cursor:  # pylint: disable=too-few-public-methods
+    """Sends the cursor found in the body of a page as a query parameter to get the next one"""
+
+    def __init__(self, param="page[cursor]", path=("meta", "next_cursor")):
+        """
+        Args:
+            param (str): Query parameter to send the cursor in.
+            path (Tuple[str, ...]): Keys to follow in the body of a page to find the next cursor.
+        """
+        self.param = param
+        self.path = path
+
+    def first(self, resource, params):
+        return resource, params
+
+    def next(self, base_url, resource, params, body, items):  # pylint: disable=too-many-arguments,unused-argument
+        cursor = body
+        for key in self.path:
+            cursor = cursor.get(key) if isinstance(cursor, dict) else None
+        if not cursor:
+            return None
+        return resource, {**(params or {}), self.param: cursor}
+
+
+class PageNumber:  # pylint: disable=too-few-public-methods
+    """Increments a page number query parameter until a page comes with less items than its size.
+
+    APIs capping the page size below the requested one send short pages before the last one, so
+    with `stop_on_short_page=False` it only stops on an empty page, at the cost of one more request.
+    """
+
+    def __init__(self, param="page[number]", size_param="page[size]", size=100, start=1, stop_on_short_page=True):
+        """
+        Args:
+            param (str): Query parameter of the page number.
+            size_param (str, optional): Query parameter of the page size. None to not send it.
+            size (int): Items per page.
+            start (int): Number of the first page.
+            stop_on_short_page (bool): Whether a page with less items than `size` is the last one, or only an
+                empty page is.
+        """
+        self.param = param
+        self.size_param = size_param
+        self.size = size
+        self.start = start
+        self.stop_on_short_page = stop_on_short_page
+
+    def first(self, resource, params):
+        params = {**(params or {}), self.param: self.start}
+        if self.size_param:
+            params[self.size_param] = self.size
+        return resource, params
+
+    def next(self, base_url, resource, params, body, items):  # pylint: disable=too-many-arguments,unused-argument
+        if not items or (self.stop_on_short_page and len(items) < self.size):
+            return None
+        return resource, {**params, self.param: params[self.param] + 1}
+
+
+class Offset:  # pylint: disable=too-few-public-methods
+    """Moves an offset query parameter forward until a page comes with less items than the limit.
+
+    As with `PageNumber`, `stop_on_short_page=False` only stops on an empty page, for APIs that cap
+    the limit.
+    """
+
+    def __init__(self, offset_param="page[offset]", limit_param="page[limit]", limit=100, stop_on_short_page=True):
+        """
+        Args:
+            offset_param (str): Query parameter of the offset.
+            limit_param (str): Query parameter of the limit.
+            limit (int): Items per page.
+            stop_on_short_page (bool): Whether a page with less items than `limit` is the last one, or only an
+                empty page is.
+        """
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self.limit = limit
+        self.stop_on_short_page = stop_on_short_page
+
+    def first(self, resource, params):
+        return resource, {**(params or {}), self.offset_param: 0, self.limit_param: self.limit}
+
+    def next(self, base_url, resource, params, body, items):  # pylint: disable=too-many-arguments,unused-argument
+        if not items or (self.stop_on_short_page and len(items) < self.limit):
+            return None
+        return resource, {**params, self.offset_param: params[self.offset_param] + len(items)}
+
+
+def iter_pages(
+    fetch_page,
+    pagination,
+    base_url,
+    resource,
+    params=None,
+    prefetch=1,
+):  # pylint: disable=too-many-arguments
+    """
+    Yields the items of every page, fetching the next pages in a background thread while the
+    current one is processed
+    Args:
+        fetch_page (Callable[[str, Optional[Dict]], Tuple[Dict, List]]): gets a page and returns its
+            body and its parsed items
+        pagination (Union[LinksNext, Cursor, PageNumber, Offset]): pagination scheme
+        base_url (str): base URL of the API
+        resource (str): path of the first page
+        params (Dict[str, Any], optional): query parameters of the first page
+        prefetch (int): max number of pages fetched ahead of the one being processed. 0 to fetch
+            them synchronously
+
+    Returns:
+        Iterator of items
+    """
+    pages = _iter_pages(fetch_page, pagination, base_url, resource, params)
+    if prefetch <= 0:
+        for items in pages:
+            yield from items
+        return
+
+    queue = Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def put(message):
+        while not stop.is_set():
+            try:
+                queue.put(message, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for items in pages:
+                if not put((items, None)):
+                    return
+            put((None, None))
+        except Exception as err:  # pylint: disable=broad-except
+            put((None, err))
+
+    threading.Thread(target=produce, name="clientapi-paginate", daemon=True).start()
+    try:
+        while True:
+            items, error = queue.get()
+            if error is not None:
+                raise error
+            if items is None:
+                return
+            yield from items
+    finally:
+        # Stops the producer if the caller doesn't consume every page
+        stop.set()
+
+
+def _iter_pages(fetch_page, pagination, base_url, resource, params):
+    request = pagination.first(resource, params)
+    while request is not None:
+        resource, params = request
+        body, items = fetch_page(resource, params)
+        yield items
+        request = pagination.next(base_url, resource, params, body, items)
+
+
+def _get_resource(base_url, resource, link):
+    """Path and query of a link relative to the base URL, as `execute_request` takes them"""
+    url = urlsplit(urljoin(f"{base_url}{resource}", link))
+    base = urlsplit(base_url)
+    base_path = base.path.rstrip("/")
+    if url.netloc.lower() != base.netloc.lower() or not (url.path == base_path or url.path.startswith(f"{base_path}/")):
+        raise PaginationError(source={"base_url": base_url, "next": link})
+
+    return url.path[len(base_path):] + (f"?{url.query}" if url.query else "")
@@ -0,0 +1,38 @@
+def sparse_fieldsets(fields):
+    """
+    Builds the query parameters of JsonAPI sparse fieldsets, so the API only sends the requested
+    attributes and relationships of every type of resource
+
+    Docs:
+    https://jsonapi.org/format/#fetching-sparse-fieldsets
+
+    >>> sparse_fieldsets({"employees": ["name", "email"], "departments": ["name"]})
+    {'fields[employees]': 'name,email', 'fields[departments]': 'name'}
+
+    Args:
+        fields (Dict[str, Iterable[str]]): fields to get by type of resource
+
+    Returns:
+        Dict[str, str]
+    """
+    return {f"fields[{type_}]": ",".join(names) for type_, names in fields.items()}
+
+
+def include(*paths):
+    """
+    Builds the query parameter to get the related resources of a JsonAPI document in its `included`
+    array, instead of requesting them one by one
+
+    Docs:
+    https://jsonapi.org/format/#fetching-includes
+
+    >>> include("department", "manager.department")
+    {'include': 'department,manager.department'}
+
+    Args:
+        paths (str): relationship paths, dot separated for relationships of related resources
+
+    Returns:
+        Dict[str, str]
+    """
+    return {"include": ",".join(paths)}
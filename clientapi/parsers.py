@@ -1,23 +1,437 @@
-from typing import Type
+import codecs
+import json
+import random
+import re
+from functools import lru_cache
+from typing import Iterator, Type
 
 from pydantic import BaseModel, ValidationError
+from pydantic.fields import (
+    SHAPE_DICT,
+    SHAPE_GENERIC,
+    SHAPE_LIST,
+    SHAPE_MAPPING,
+    SHAPE_SEQUENCE,
+    SHAPE_SINGLETON,
+    SHAPE_TUPLE,
+    SHAPE_TUPLE_ELLIPSIS,
+)
 from requests import Response
 
+from clientapi import jsoncodec
 from clientapi.exceptions import APIValidationError
+from clientapi.responses import JsonAPIResponse
+from clientapi.timing import Timing, clock, elapsed_ms
 
+STREAM_CHUNK_SIZE = 64 * 1024
 
-def parse(response: Response, model: Type[BaseModel]):
+
+class ParsePolicy:
+    """How the decoded documents become models.
+
+    By default every document is validated by pydantic. For trusted APIs, whose contract is already
+    enforced upstream, `trusted=True` builds the models with `construct` instead: no validation nor
+    coercion (e.g. dates stay strings), which is several times cheaper. A `validation_rate` of the
+    documents are still validated, so contract breaks keep surfacing as APIValidationError.
+
+    Usage:
+    >>> from clientapi.parsers import ParsePolicy
+    >>>
+    >>> api = ClientAPI(session, url, parse_policy=ParsePolicy(trusted=True, validation_rate=0.01))
+    """
+
+    def __init__(self, trusted=False, validation_rate=0.0):
+        """
+        Args:
+            trusted (bool): Whether to skip validation. Defaults to False.
+            validation_rate (float): Fraction of the documents validated anyway when trusted, between 0 and 1.
+                Defaults to 0.
+        """
+        if not 0 <= validation_rate <= 1:
+            raise ValueError(f"validation_rate must be between 0 and 1, got {validation_rate}")
+
+        self.trusted = trusted
+        self.validation_rate = validation_rate
+
+    def sample(self):
+        """Whether the next document has to be validated"""
+        return not self.trusted or self.validation_rate >= 1 or random.random() < self.validation_rate
+
+    def build(self, model: Type[BaseModel], obj):
+        """
+        Builds a model out of a decoded document. The included resources of JsonAPI documents are built
+        with this policy too, when they are resolved
+        Raises:
+            ValidationError: When the document is validated and it is not valid
+        """
+        instance = model.parse_obj(obj) if self.sample() else construct(model, obj)
+        if isinstance(instance, JsonAPIResponse):
+            instance._parse_policy = self  # pylint: disable=protected-access
+        return instance
+
+
+DEFAULT_PARSE_POLICY = ParsePolicy()
+
+
+def parse(response: Response, model: Type[BaseModel], policy: ParsePolicy = None, fields=None):
     """
     Parses a responses content to a pydantic model
+
+    Only the parts of the document in `fields` are kept before building the model, so the rest is
+    neither validated nor kept in memory. A model with a subset of the fields of the document works
+    as a projection too, as fields that are not in the model are ignored.
+
+    Usage:
+    >>> employee = parse(response, responses.entity(EmployeeName), fields=["data.id", "data.attributes.name"])
+
     Args:
         response: requests library model for HTTP response
         model: pydantic model for parsing the response
+        policy: whether to validate the content. Defaults to validating it
+        fields: paths of the parts of the document to keep (see `project`). Defaults to None (all of it)
     Raises:
         APIHTTPError: When a pydantic validation error occurs
     Returns:
         Instance of the specified model
     """
+    response_timing = getattr(response, "timing", None)
+    if not isinstance(response_timing, Timing):
+        response_timing = None
+
+    start = clock()
     try:
-        return model.parse_raw(response.content)
+        obj = jsoncodec.loads(response.content)
+    except ValueError as err:
+        raise APIValidationError(
+            source=[{"loc": ("__root__",), "msg": str(err), "type": "value_error.jsondecode"}]
+        ) from err
+
+    if fields is not None:
+        obj = project(obj, fields)
+
+    decoded_at = clock()
+    try:
+        return (policy or DEFAULT_PARSE_POLICY).build(model, obj)
     except ValidationError as err:
         raise APIValidationError.wrap(err)
+    finally:
+        if response_timing is not None:
+            response_timing.decode_ms = elapsed_ms(start, decoded_at)
+            response_timing.validation_ms = elapsed_ms(decoded_at)
+
+
+def project(obj, fields):
+    """
+    Keeps only some parts of a decoded document.
+
+    Every field is a dotted path of keys. Lists are traversed transparently, so `data.id` keeps the
+    `id` of the entity of a JsonAPI entity document, or of every item of a collection document.
+    A path ending in an object keeps the whole object.
+
+    >>> project({"data": [{"id": 1, "name": "a", "age": 2}]}, ["data.id", "data.name"])
+    {'data': [{'id': 1, 'name': 'a'}]}
+
+    Args:
+        obj: decoded document
+        fields (Iterable[str]): paths of the parts to keep
+    Returns:
+        The projected document
+    """
+    return _project(obj, _get_fields_tree(tuple(fields)))
+
+
+@lru_cache(maxsize=256)
+def _get_fields_tree(fields):
+    # Nested dicts of keys, where None means keeping the whole value
+    tree = {}
+    for field in fields:
+        node = tree
+        keys = field.split(".")
+        for key in keys[:-1]:
+            child = node.setdefault(key, {})
+            if child is None:
+                break
+            node = child
+        else:
+            node[keys[-1]] = None
+    return tree
+
+
+def _project(obj, tree):
+    if tree is None:
+        return obj
+    if isinstance(obj, list):
+        return [_project(item, tree) for item in obj]
+    if isinstance(obj, dict):
+        return {key: _project(obj[key], subtree) for key, subtree in tree.items() if key in obj}
+    return obj
+
+
+def construct(model: Type[BaseModel], obj):
+    """
+    Builds a model and its nested models out of a decoded document without validating it.
+
+    Fields are read by alias and missing ones get their defaults. Nested models are built through
+    any nesting of lists, tuples and dicts, e.g. `Dict[str, List[Model]]`, but not through unions,
+    as there is no way to pick one of their members without validating. Values are not coerced
+    (containers stay lists and dicts), so the document must already have the types of the model.
+    A document that is not an object is validated, so the error surfaces instead of building an
+    empty model.
+    Args:
+        model: pydantic model to build
+        obj: decoded document
+    Raises:
+        ValidationError: When the document is not an object
+    Returns:
+        Instance of the specified model
+    """
+    if model.__custom_root_type__:
+        return model.construct(__root__=_construct_value(model.__fields__["__root__"], obj))
+    if not isinstance(obj, dict):
+        return model.parse_obj(obj)
+
+    by_name = model.__config__.allow_population_by_field_name
+    values = {}
+    for name, field in model.__fields__.items():
+        if field.alias in obj:
+            values[name] = _construct_value(field, obj[field.alias])
+        elif by_name and name in obj:
+            values[name] = _construct_value(field, obj[name])
+
+    return model.construct(_fields_set=set(values), **values)
+
+
+def _construct_value(field, value):
+    # Unions are left as they come too, there is no way to pick a member without validating
+    if value is None or not _has_model(field):
+        return value
+
+    if field.shape == SHAPE_SINGLETON:
+        return construct(field.type_, value) if isinstance(value, dict) else value
+    if field.shape in _ITEMS_SHAPES and isinstance(value, list):
+        item_field = field.sub_fields[0]
+        return [_construct_value(item_field, item) for item in value]
+    if field.shape == SHAPE_TUPLE and isinstance(value, list) and len(value) == len(field.sub_fields):
+        return [_construct_value(item_field, item) for item_field, item in zip(field.sub_fields, value)]
+    if field.shape in (SHAPE_DICT, SHAPE_MAPPING) and isinstance(value, dict):
+        item_field = field.sub_fields[0]
+        return {key: _construct_value(item_field, item) for key, item in value.items()}
+    return value
+
+
+_ITEMS_SHAPES = (SHAPE_LIST, SHAPE_SEQUENCE, SHAPE_TUPLE_ELLIPSIS, SHAPE_GENERIC)
+
+
+@lru_cache(maxsize=None)
+def _has_model(field):
+    """Whether there are models anywhere in the type of a field, e.g. Dict[str, List[Model]]"""
+    if field.shape == SHAPE_SINGLETON:
+        return isinstance(field.type_, type) and issubclass(field.type_, BaseModel)
+    if field.shape == SHAPE_TUPLE or field.shape in _ITEMS_SHAPES or field.shape in (SHAPE_DICT, SHAPE_MAPPING):
+        return bool(field.sub_fields) and any(_has_model(sub_field) for sub_field in field.sub_fields)
+    return False
+
+
+def parse_stream(
+    response: Response,
+    model: Type[BaseModel],
+    chunk_size=STREAM_CHUNK_SIZE,
+    policy: ParsePolicy = None,
+    fields=None,
+) -> Iterator[BaseModel]:
+    """
+    Incrementally parses the items of a JsonAPI collection (`{"data": [...]}`) from a streamed response,
+    so only one item at a time is held in memory no matter how big the collection is.
+
+    Usage:
+    >>> response = api.execute_request(Path.EMPLOYEES, stream=True)
+    >>> for employee in parse_stream(response, Employee):
+    >>>     ...
+
+    Args:
+        response: requests library model for HTTP response, requested with `stream=True`
+        model: pydantic model of every item of the collection
+        chunk_size: bytes to read from the network at a time
+        policy: whether to validate every item. Defaults to validating them
+        fields: paths of the parts of every item to keep (see `project`). Defaults to None (all of them)
+    Raises:
+        APIValidationError: When the body is not a valid JsonAPI document or an item is not valid
+    Returns:
+        Generator of instances of the specified model
+    """
+    policy = policy or DEFAULT_PARSE_POLICY
+    fields_tree = _get_fields_tree(tuple(fields)) if fields is not None else None
+    try:
+        for item in _JsonStream(response.iter_content(chunk_size)).iter_items("data"):
+            try:
+                yield policy.build(model, _project(item, fields_tree))
+            except ValidationError as err:
+                raise APIValidationError.wrap(err)
+    except ValueError as err:
+        raise APIValidationError(source=[{"msg": str(err), "type": "value_error.jsondecode"}]) from err
+    finally:
+        response.close()
+
+
+class _JsonStream:
+    """Minimal pull parser over a stream of JSON bytes.
+
+    It walks the top level object and the array of one of its keys by hand. The end of every
+    value is found first with an incremental scan that only tracks the nesting depth and whether
+    it is in a string, resuming where it stopped when more chunks are read, so each char is scanned
+    once. Items are then decoded with a single call to `json.JSONDecoder.raw_decode`, while the
+    other top level values are skipped without decoding them, nor keeping them in memory.
+    """
+    _WHITESPACE = re.compile(r"[ \t\n\r]*")
+    _STRUCTURAL = re.compile(r'["{}\[\]]')
+    _STRING_SPECIAL = re.compile(r'["\\]')
+    _SCALAR_END = re.compile(r"[,\]} \t\n\r]")
+    _COMPACT_THRESHOLD = 1024 * 1024
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def iter_items(self, key):
+        """Yields the items of the array under `key` in the top level object"""
+        self._expect("{")
+        if self._peek() == "}":
+            return
+
+        while True:
+            name = self._value()
+            self._expect(":")
+            if name == key:
+                if self._peek() != "[":
+                    raise ValueError(f"Expecting an array under '{key}' at char {self._pos} of the current chunk")
+                yield from self._iter_array()
+            else:
+                self._skip()
+
+            if self._separator("}"):
+                return
+
+    def _iter_array(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self._value()
+            if self._separator("]"):
+                return
+
+    def _fill(self):
+        """Reads one more chunk into the buffer. Returns False at the end of the stream"""
+        if self._eof:
+            return False
+
+        if self._pos > self._COMPACT_THRESHOLD:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._buffer += self._decoder.decode(b"", final=True)
+            self._eof = True
+            return True
+
+        self._buffer += self._decoder.decode(chunk)
+        return True
+
+    def _peek(self):
+        while True:
+            self._pos = self._WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of the JSON document")
+
+    def _next_char(self):
+        char = self._peek()
+        self._pos += 1
+        return char
+
+    def _expect(self, char):
+        if self._next_char() != char:
+            raise ValueError(f"Expecting '{char}' at char {self._pos - 1} of the current chunk")
+
+    def _separator(self, closing):
+        """Consumes the char after a value. Returns True if it closes the container, False if it is a comma"""
+        char = self._next_char()
+        if char not in (",", closing):
+            raise ValueError(f"Expecting ',' or '{closing}' at char {self._pos - 1} of the current chunk")
+        return char == closing
+
+    def _value(self):
+        end = self._scan(skip=False)
+        value, value_end = self._json_decoder.raw_decode(self._buffer, self._pos)
+        if value_end != end:
+            raise ValueError(f"Unexpected data at char {value_end} of the current chunk")
+
+        self._pos = end
+        return value
+
+    def _skip(self):
+        self._pos = self._scan(skip=True)
+
+    def _scan(self, skip):
+        """
+        Finds the end of the value at the current position, reading more chunks until it is complete.
+        When skipping the value, the part already scanned can be dropped from the buffer while reading.
+        """
+        if self._peek() not in "{[\"":
+            return self._scan_scalar()
+
+        depth = 0
+        in_string = False
+        pos = self._pos
+        while True:
+            pattern = self._STRING_SPECIAL if in_string else self._STRUCTURAL
+            match = pattern.search(self._buffer, pos)
+            # An escape at the end of the buffer is scanned again along with the char it escapes
+            if match is None or (match.end() == len(self._buffer) and match.group() == "\\"):
+                resume = match.start() if match is not None else len(self._buffer)
+                if skip:
+                    self._pos = resume
+                offset = resume - self._pos
+                if not self._fill():
+                    raise ValueError("Unexpected end of the JSON document")
+                pos = self._pos + offset
+                continue
+
+            char = match.group()
+            pos = match.end()
+            if in_string:
+                if char == "\\":
+                    pos += 1
+                else:
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "{[":
+                depth += 1
+            else:
+                depth -= 1
+
+            if depth == 0 and not in_string:
+                return pos
+
+    def _scan_scalar(self):
+        pos = self._pos
+        while True:
+            match = self._SCALAR_END.search(self._buffer, pos)
+            if match is not None:
+                return match.start()
+
+            # A number (or literal) at the end of the buffer may continue in the next chunk
+            offset = len(self._buffer) - self._pos
+            if not self._fill():
+                return len(self._buffer)
+            pos = self._pos + offset
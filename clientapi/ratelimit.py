@@ -0,0 +1,169 @@
+import asyncio
+import threading
+import time
+
+from clientapi.exceptions import APIClientError
+
+
+class RateLimitExceeded(APIClientError):
+    code = "rate_limit_exceeded"
+    detail = "The client side rate limit was exceeded"
+    source = None
+
+
+class TokenBucket:
+    """Thread safe token bucket.
+
+    Tokens are refilled continuously at `rate` tokens per second, up to `capacity`. Each request
+    takes one token, so `rate` is the sustained throughput and `capacity` the allowed burst.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        """
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float, optional): Max amount of tokens, at least 1. Defaults to `rate` (one second of
+                burst), or 1 for rates under one token per second.
+            clock (Callable[[], float]): Monotonic clock in seconds.
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be greater than 0, got {rate}")
+
+        capacity = capacity or max(rate, 1)
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens=1):
+        """
+        Takes tokens from the bucket if there are enough of them
+        Args:
+            tokens (float): amount of tokens to take
+
+        Raises:
+            ValueError: when the bucket can't hold that many tokens, so waiting for them would never end
+        Returns:
+            float: 0 if the tokens were taken, or the seconds to wait until there are enough of them
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Can't take {tokens} tokens from a bucket of capacity {self.capacity}")
+
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens=1, block=True, timeout=None, sleep=time.sleep):
+        """
+        Takes tokens from the bucket, waiting for them if needed
+        Args:
+            tokens (float): amount of tokens to take
+            block (bool): wait for the tokens if True, fail fast otherwise
+            timeout (float, optional): max seconds to wait for the tokens
+            sleep (Callable[[float], None]): function used to wait
+
+        Raises:
+            RateLimitExceeded: when the tokens can't be taken without waiting (or within the timeout)
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return
+            sleep(self._get_wait(wait, block, deadline))
+
+    async def acquire_async(self, tokens=1, block=True, timeout=None):
+        """Same as `acquire`, but waiting with `asyncio.sleep` so the event loop is not blocked"""
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return
+            await asyncio.sleep(self._get_wait(wait, block, deadline))
+
+    def _get_wait(self, wait, block, deadline):
+        if not block:
+            raise RateLimitExceeded(source={"retry_after": wait})
+
+        if deadline is not None:
+            remaining = deadline - self._clock()
+            if remaining < wait:
+                raise RateLimitExceeded(source={"retry_after": wait})
+
+        return wait
+
+
+class RateLimiter:
+    """Token buckets per base URL, and optionally per HTTP method, shared by many clients.
+
+    Usage:
+    >>> from clientapi import ClientAPI
+    >>> from clientapi.ratelimit import RateLimiter
+    >>>
+    >>> limiter = RateLimiter(rate=50, capacity=100, limits={"https://slow.api.com": (5, 5)})
+    >>> api = ClientAPI(session, url, rate_limiter=limiter)
+    """
+
+    def __init__(
+        self,
+        rate,
+        capacity=None,
+        per_method=False,
+        limits=None,
+        block=True,
+        timeout=None,
+    ):  # pylint: disable=too-many-arguments
+        """
+        Args:
+            rate (float): Default requests per second of every bucket.
+            capacity (float, optional): Default burst of every bucket. Defaults to `rate`, and at least 1.
+            per_method (bool): Whether each HTTP method of a base URL has its own bucket.
+            limits (Dict[Union[str, Tuple[str, str]], Tuple[float, float]], optional): (rate, capacity)
+                overrides keyed by base URL or by (base URL, method).
+            block (bool): Wait for a token if True, or raise RateLimitExceeded right away otherwise.
+            timeout (float, optional): Max seconds to wait for a token when blocking.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.per_method = per_method
+        self.limits = limits or {}
+        self.block = block
+        self.timeout = timeout
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, base_url, method) -> TokenBucket:
+        method = method.upper()
+        per_method = self.per_method or (base_url, method) in self.limits
+        key = (base_url, method) if per_method else base_url
+
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            return bucket
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                rate, capacity = self.limits.get(key) or self.limits.get(base_url) or (self.rate, self.capacity)
+                bucket = TokenBucket(rate, capacity)
+                self._buckets[key] = bucket
+            return bucket
+
+    def acquire(self, base_url, method):
+        """Waits for a token of the bucket of a request (or fails fast if the limiter doesn't block)"""
+        self.bucket(base_url, method).acquire(block=self.block, timeout=self.timeout)
+
+    async def acquire_async(self, base_url, method):
+        """Same as `acquire` for asyncio clients"""
+        await self.bucket(base_url, method).acquire_async(block=self.block, timeout=self.timeout)
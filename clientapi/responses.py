@@ -1,21 +1,21 @@
-from typing import Any, List, Optional, Type
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any, ClassVar, Dict, List, Mapping, Optional, Type, Union
 
 import pydantic
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
+
+# Imported as a module, as the exceptions import this module too
+from clientapi import exceptions
 
 
 class JsonAPIErrorResponse(BaseModel):
     """
     Schema to model a JsonAPI error response
 
-    It only models a subset of the recommended attributes. Also, have in mind
-    that this schema is used as a top level one, not wrapped up in `errors` as the spec
-    recommends.
-
-        "Error objects MUST be returned as an array keyed by errors in the top level of a JSON:API document"
-
-    Future version of this library will try to include that, but so far in this current version
-    there is no need to support it.
+    It only models a subset of the recommended attributes, used as a top level error document
+    instead of wrapped up in `errors` as the spec recommends. Documents with an `errors` array
+    are exposed as `JsonAPIErrors` instead.
 
     Docs:
     https://jsonapi.org/format/#error-objects
@@ -25,47 +25,306 @@ class JsonAPIErrorResponse(BaseModel):
     source: Optional[Any]
 
 
+class JsonAPIError(BaseModel):
+    """
+    Schema to model an error object of the `errors` array of a JsonAPI error document. Every member
+    is optional, as the spec doesn't require any of them
+
+    Docs:
+    https://jsonapi.org/format/#error-objects
+    """
+    id: Optional[str]
+    status: Optional[str]
+    code: Optional[str]
+    title: Optional[str]
+    detail: Optional[str]
+    source: Optional[Any]
+    meta: Optional[Any]
+
+    @property
+    def pointer(self) -> Optional[str]:
+        """JSON pointer of the value of the request the error is about, e.g. /data/3/attributes/email"""
+        return _get_pointer(self.source)
+
+
+class JsonAPIErrors(Sequence):
+    """
+    Error objects of a JsonAPI error document, parsed lazily.
+
+    Every error is only validated as a `JsonAPIError` when it is accessed, and the indexes by pointer
+    and by row are built on their first lookup, so bulk endpoints returning hundreds of errors don't
+    cost more than the errors the caller reads.
+
+    Usage:
+    >>> try:
+    >>>     api.create_employees(payload)
+    >>> except APIHTTPError as err:
+    >>>     for row, employee in enumerate(payload.data):
+    >>>         for error in err.errors.for_row(row):
+    >>>             print(employee.email, error.pointer, error.detail)
+    """
+
+    def __init__(self, raw_errors=()):
+        """
+        Args:
+            raw_errors (List[Any]): Decoded items of the `errors` array of the document.
+        """
+        self._raw_errors = list(raw_errors)
+        self._errors = [None] * len(self._raw_errors)
+        self._by_pointer = None
+        self._by_row = {}
+
+    def __len__(self):
+        return len(self._raw_errors)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        error = self._errors[index]
+        if error is None:
+            error = self._errors[index] = _build_error(self._raw_errors[index])
+        return error
+
+    def __repr__(self):
+        return f"JsonAPIErrors({len(self)} errors)"
+
+    def by_pointer(self, pointer: str) -> List[JsonAPIError]:
+        """
+        Errors about a value of the request
+        Args:
+            pointer: JSON pointer of the value, e.g. "/data/attributes/email"
+
+        Returns:
+            List[JsonAPIError]: empty if there is none
+        """
+        if self._by_pointer is None:
+            by_pointer = {}
+            for index, raw_error in enumerate(self._raw_errors):
+                by_pointer.setdefault(_get_raw_pointer(raw_error), []).append(index)
+            self._by_pointer = by_pointer
+        return [self[index] for index in self._by_pointer.get(pointer, ())]
+
+    def for_row(self, row: int, prefix: str = "/data") -> List[JsonAPIError]:
+        """
+        Errors about an item of an array of the request, or any of its values, e.g. "/data/3" and
+        "/data/3/attributes/email" for the row 3 of a bulk request
+        Args:
+            row: index of the item in the array
+            prefix: JSON pointer of the array
+
+        Returns:
+            List[JsonAPIError]: empty if there is none
+        """
+        by_row = self._by_row.get(prefix)
+        if by_row is None:
+            by_row = {}
+            start = len(prefix) + 1
+            for index, raw_error in enumerate(self._raw_errors):
+                pointer = _get_raw_pointer(raw_error)
+                if not pointer or not pointer.startswith(prefix + "/"):
+                    continue
+                segment = pointer[start:].split("/", 1)[0]
+                if segment.isdigit():
+                    by_row.setdefault(int(segment), []).append(index)
+            self._by_row[prefix] = by_row
+        return [self[index] for index in by_row.get(row, ())]
+
+
+def _get_pointer(source):
+    return source.get("pointer") if isinstance(source, dict) else None
+
+
+def _get_raw_pointer(raw_error):
+    return _get_pointer(raw_error.get("source")) if isinstance(raw_error, dict) else None
+
+
+def _build_error(raw_error):
+    if not isinstance(raw_error, dict):
+        return JsonAPIError(detail=str(raw_error))
+    try:
+        return JsonAPIError.parse_obj(raw_error)
+    except pydantic.ValidationError:
+        # Members of unexpected types are kept as they are, rather than losing the whole error
+        return JsonAPIError.construct(**raw_error)
+
+
+class ResourceIdentifier(BaseModel):
+    """
+    Schema to model a resource identifier object, the linkage of a relationship
+
+    Docs:
+    https://jsonapi.org/format/#document-resource-identifier-objects
+    """
+    type: str
+    id: str
+    meta: Optional[Any]
+
+
+class Relationship(BaseModel):
+    """
+    Schema to model a relationship of a resource, to use in the `relationships` of the models
+
+    Docs:
+    https://jsonapi.org/format/#document-resource-object-relationships
+    """
+    data: Union[List[ResourceIdentifier], ResourceIdentifier, None]
+    links: Optional[Any]
+    meta: Optional[Any]
+
+
 class JsonAPIResponse(BaseModel):
     """
     Schema to model a JsonAPI styled primary data response
 
+    The `included` resources of compound documents are kept as they come, and they are only built
+    into models (the ones in `included_models` by type) when a relationship is resolved. The
+    `(type, id)` index of `included` is built on the first resolution, and every resolved resource
+    is memoized.
+
     Docs:
     https://jsonapi.org/format/#document-top-level
+    https://jsonapi.org/format/#document-compound-documents
     """
     data: Any
+    included: Optional[List[Any]]
+
+    included_models: ClassVar[Dict[str, Type[BaseModel]]] = {}
+
+    _parse_policy = PrivateAttr(default=None)
+    _included_index = PrivateAttr(default=None)
+    _resolved = PrivateAttr(default_factory=dict)
 
+    def related(self, resource, name: str):
+        """
+        Resolves a relationship of a resource of the document with the included resources
+        Args:
+            resource: resource of `data` (or an included one), as a model or a dict, with `relationships`
+            name: name of the relationship
 
-def entity(model: Type[BaseModel]) -> Type[JsonAPIResponse]:
+        Raises:
+            APIValidationError: When an included resource is validated and it is not valid
+        Returns:
+            The related resource (or a list of them for to-many relationships). Resources of types
+            without a model in `included_models` are returned as dicts, and the ones that are not
+            included as None.
+        """
+        relationship = _get_member(_get_member(resource, "relationships"), name)
+        linkage = _get_member(relationship, "data")
+        if isinstance(linkage, list):
+            return [self.resolve(_get_member(item, "type"), _get_member(item, "id")) for item in linkage]
+        if linkage is None:
+            return None
+        return self.resolve(_get_member(linkage, "type"), _get_member(linkage, "id"))
+
+    def resolve(self, type_: str, id_):
+        """
+        Included resource of a type and id
+        Raises:
+            APIValidationError: When the resource is validated and it is not valid
+        Returns:
+            The resource built into its model of `included_models`, or as it comes if its type has no model.
+            None if it is not included.
+        """
+        key = (type_, str(id_))
+        if key in self._resolved:
+            return self._resolved[key]
+
+        if self._included_index is None:
+            self._included_index = {
+                (item.get("type"), str(item.get("id"))): item for item in self.included or () if isinstance(item, dict)
+            }
+
+        resource = self._included_index.get(key)
+        model = self.included_models.get(type_)
+        if resource is not None and model is not None:
+            try:
+                if self._parse_policy is not None:
+                    resource = self._parse_policy.build(model, resource)
+                else:
+                    resource = model.parse_obj(resource)
+            except pydantic.ValidationError as err:
+                raise exceptions.APIValidationError.wrap(err) from err
+
+        self._resolved[key] = resource
+        return resource
+
+
+def entity(model: Type[BaseModel], included: Mapping[str, Type[BaseModel]] = None) -> Type[JsonAPIResponse]:
     """
     Wraps a model in the JsonAPIResponse format for an entity
+
+    The wrapper is built once per model, so calling it on every request is cheap
+
+    Usage:
+    >>> response = api.execute_request(Path.EMPLOYEE.format(employee_id=employee_id), params=include("department"))
+    >>> document = parse(response, responses.entity(Employee, included={"departments": Department}))
+    >>> department = document.related(document.data, "department")
+
     Args:
         model: pydantic model to wrap
+        included: models of the included resources of compound documents, by type
 
     Returns:
         JsonAPIResponse
 
     """
-    attrs = {"data": (model, None)}
-    return pydantic.create_model(
-        "JsonAPIEntityResponse",
-        __base__=JsonAPIResponse,
-        **attrs,
-    )
+    return _entity(model, _freeze(included))
 
 
-def collection(model: Type[BaseModel]) -> Type[JsonAPIResponse]:
+def collection(model: Type[BaseModel], included: Mapping[str, Type[BaseModel]] = None) -> Type[JsonAPIResponse]:
     """
     Wraps a model in the JsonAPIResponse format for a collection
+
+    The wrapper is built once per model, so calling it on every request is cheap
     Args:
         model: pydantic model to wrap
+        included: models of the included resources of compound documents, by type
 
     Returns:
         JsonAPIResponse
 
     """
+    return _collection(model, _freeze(included))
+
+
+@lru_cache(maxsize=None)
+def _entity(model, included):
+    attrs = {"data": (model, None)}
+    response_model = pydantic.create_model(
+        f"JsonAPIEntityResponse[{_get_model_name(model)}]",
+        __base__=JsonAPIResponse,
+        **attrs,
+    )
+    response_model.included_models = dict(included)
+    return response_model
+
+
+@lru_cache(maxsize=None)
+def _collection(model, included):
     attrs = {"data": (List[model], None)}
-    return pydantic.create_model(
-        "JsonAPICollectionResponse",
+    response_model = pydantic.create_model(
+        f"JsonAPICollectionResponse[{_get_model_name(model)}]",
         __base__=JsonAPIResponse,
         **attrs,
     )
+    response_model.included_models = dict(included)
+    return response_model
+
+
+def _freeze(included):
+    return tuple(sorted(included.items())) if included else ()
+
+
+def _get_member(obj, name):
+    # Relationships are dicts when their model doesn't declare them, or when it was built without validation
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def _get_model_name(model):
+    if isinstance(model, type):
+        return f"{model.__module__}.{model.__qualname__}"
+    # Type hints such as Optional[Model] share their module and qualified name
+    return repr(model)
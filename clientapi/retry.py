@@ -0,0 +1,144 @@
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+
+from requests import ConnectionError as RequestsConnectionError
+from requests import Timeout
+
+RETRYABLE_ERRORS = (RequestsConnectionError, Timeout)
+
+
+class RetryPolicy:
+    """Decides if and when a failed request has to be retried.
+
+    Delays follow an exponential backoff with full jitter, i.e. a random value between 0 and
+    `backoff_factor * 2 ** (attempt - 1)` capped to `max_backoff`. A `Retry-After` header in the
+    response takes precedence over the backoff, unless it asks to wait more than `max_retry_after`,
+    in which case the request is not retried.
+
+    Usage:
+    >>> from clientapi import ClientAPI
+    >>> from clientapi.retry import RetryPolicy
+    >>>
+    >>> api = ClientAPI(session, url, retry=RetryPolicy(max_attempts=5, total_timeout=10))
+    """
+    DEFAULT_STATUSES = frozenset({
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.INTERNAL_SERVER_ERROR,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    })
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff_factor=0.5,
+        max_backoff=30,
+        statuses=DEFAULT_STATUSES,
+        methods=IDEMPOTENT_METHODS,
+        respect_retry_after=True,
+        total_timeout=None,
+        max_retry_after=60,
+        sleep=time.sleep,
+    ):  # pylint: disable=too-many-arguments
+        """
+        Args:
+            max_attempts (int): Max number of attempts, including the first one.
+            backoff_factor (float): Seconds of the backoff base, doubled after each attempt.
+            max_backoff (float): Max seconds to wait between two attempts because of the backoff.
+            statuses (Iterable[int]): Status codes to retry.
+            methods (Iterable[str]): HTTP methods that can be retried. Defaults to the idempotent ones.
+            respect_retry_after (bool): Whether to wait what the `Retry-After` header of the response says.
+            total_timeout (float, optional): Max seconds since the first attempt to start a new one.
+            max_retry_after (float, optional): Max seconds to wait because of a `Retry-After` header, longer
+                waits give up instead. None to wait whatever the server says.
+            sleep (Callable[[float], None]): Function used to wait between attempts.
+        """
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.respect_retry_after = respect_retry_after
+        self.total_timeout = total_timeout
+        self.max_retry_after = max_retry_after
+        self.sleep = sleep
+
+    def is_retryable(self, method, response=None, error=None):
+        """Whether the outcome of an attempt (a response or a connection error) can be retried"""
+        if method.upper() not in self.methods:
+            return False
+        if error is not None:
+            return isinstance(error, RETRYABLE_ERRORS)
+        return response is not None and response.status_code in self.statuses
+
+    def get_delay(self, attempt, response=None):
+        """
+        Seconds to wait before the next attempt
+        Args:
+            attempt (int): number of the attempt that just failed, starting at 1
+            response (Response, optional): response of the failed attempt, if any
+
+        Returns:
+            Optional[float]: None if the `Retry-After` header asks to wait more than `max_retry_after`
+        """
+        if self.respect_retry_after and response is not None:
+            retry_after = get_retry_after(response)
+            if retry_after is not None:
+                if self.max_retry_after is not None and retry_after > self.max_retry_after:
+                    return None
+                return retry_after
+
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2**(attempt - 1)))
+
+    def next_delay(self, method, attempt, started_at, response=None, error=None):
+        """
+        Delay before the next attempt, or None if the request must not be retried
+        Args:
+            method (str): HTTP method of the request
+            attempt (int): number of the attempt that just failed, starting at 1
+            started_at (float): `time.monotonic()` when the first attempt started
+            response (Response, optional): response of the failed attempt, if any
+            error (Exception, optional): error raised by the failed attempt, if any
+
+        Returns:
+            Optional[float]
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(method, response, error):
+            return None
+
+        delay = self.get_delay(attempt, response)
+        if delay is None:
+            return None
+        if self.total_timeout is not None and time.monotonic() - started_at + delay > self.total_timeout:
+            return None
+
+        return delay
+
+
+def get_retry_after(response):
+    """Seconds to wait according to the `Retry-After` header (delay-seconds or HTTP-date), if any"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
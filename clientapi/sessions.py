@@ -1,6 +1,14 @@
+import atexit
+import threading
 from contextlib import contextmanager
 
 from requests import Session
+from requests.adapters import (
+    DEFAULT_POOLBLOCK,
+    DEFAULT_POOLSIZE,
+    DEFAULT_RETRIES,
+    HTTPAdapter,
+)
 from requests.auth import AuthBase, HTTPBasicAuth
 
 from clientapi.auth import Bearer, SharedSecret
@@ -82,3 +90,127 @@ def base(base_auth: AuthBase):
     session.auth = base_auth
     yield session
     session.close()
+
+
+class SessionRegistry:
+    """Thread safe registry of long-lived sessions keyed by base URL and auth.
+
+    The context managers above close their session on exit, so every `with` block pays a new
+    TCP/TLS handshake. Sessions taken from a registry stay open (and their connections warm)
+    until the registry is closed, so many `ClientAPI` instances can share them.
+
+    Usage:
+    >>> from clientapi import sessions
+    >>> from clientapi.auth import SharedSecret
+    >>>
+    >>> session = sessions.registry.get("https://api.com", auth=SharedSecret("key"))
+    >>> api = YourAPI(session, url="https://api.com")
+    """
+
+    def __init__(
+        self,
+        pool_connections=DEFAULT_POOLSIZE,
+        pool_maxsize=DEFAULT_POOLSIZE,
+        pool_block=DEFAULT_POOLBLOCK,
+        max_retries=DEFAULT_RETRIES,
+    ):
+        """
+        Args:
+            pool_connections (int): Number of connection pools (one per host) to cache per session.
+            pool_maxsize (int): Max number of connections to keep per pool. It should be at least
+                the number of threads sharing a session.
+            pool_block (bool): Whether to block when no free connections are available instead of
+                opening a new one that will be discarded afterwards.
+            max_retries (int): Retries of failed connections, passed to `HTTPAdapter`.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.max_retries = max_retries
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, base_url, auth: AuthBase = None) -> Session:
+        """
+        Returns the session for a base URL and auth, creating it on first use
+        Args:
+            base_url (str): Base URL of the API the session is used for.
+            auth (AuthBase, optional): Auth to attach to the session.
+
+        Returns:
+            Session
+        """
+        key = (base_url, _auth_key(auth))
+        session = self._sessions.get(key)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._create_session(auth)
+                self._sessions[key] = session
+            return session
+
+    def close(self, base_url, auth: AuthBase = None):
+        """Closes and forgets the session for a base URL and auth, if any"""
+        with self._lock:
+            session = self._sessions.pop((base_url, _auth_key(auth)), None)
+        if session is not None:
+            session.close()
+
+    def close_all(self):
+        """Closes every session in the registry"""
+        with self._lock:
+            all_sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in all_sessions:
+            session.close()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _create_session(self, auth):
+        session = Session()
+        session.auth = auth
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=self.max_retries,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+
+def _auth_key(auth):
+    """Hashable identity of an auth object. Auths with the same credentials share a session"""
+    if auth is None:
+        return None
+    if isinstance(auth, Bearer):
+        return Bearer, auth.token
+    if isinstance(auth, SharedSecret):
+        return SharedSecret, auth.key
+    if isinstance(auth, HTTPBasicAuth):
+        return type(auth), auth.username, auth.password
+    return type(auth), id(auth)
+
+
+registry = SessionRegistry()
+atexit.register(registry.close_all)
+
+
+@contextmanager
+def pooled(base_url, auth: AuthBase = None):
+    """
+    Yields the long-lived session of the default registry for a base URL and auth.
+    Unlike the other context managers, the session is not closed on exit
+    Args:
+        base_url (str): Base URL of the API the session is used for.
+        auth (AuthBase, optional): Auth to attach to the session.
+
+    Returns:
+        Session
+    """
+    yield registry.get(base_url, auth)
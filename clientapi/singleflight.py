@@ -0,0 +1,69 @@
+import copy
+import threading
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class _Call:  # pylint: disable=too-few-public-methods
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into a single execution.
+
+    The first caller of a key (the leader) runs the function while the ones arriving before it
+    finishes wait and get the same outcome: a shallow copy of the result, or the same error.
+    Nothing is kept once the call finishes, so there is no risk of serving stale data.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """
+        Runs `func`, or waits for the in-flight execution of the same key
+        Args:
+            key (Hashable): identity of the call
+            func (Callable[[], Any]): function to run
+
+        Returns:
+            The result of the function
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.copy(call.result)
+
+        try:
+            call.result = func()
+            return call.result
+        except Exception as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self, key):
+        """Number of callers waiting for the in-flight call of a key, including the leader, or 0"""
+        with self._lock:
+            call = self._calls.get(key)
+            return 0 if call is None else call.waiters + 1
@@ -0,0 +1,71 @@
+import time
+
+clock = time.perf_counter
+
+
+def elapsed_ms(start, end=None):
+    """Milliseconds between two readings of `clock`, or between one of them and now"""
+    return round(((clock() if end is None else end) - start) * 1000, 3)
+
+
+class Timing:
+    """Breakdown of the time spent in a request, attached to its response as `response.timing`.
+
+    Every phase is in milliseconds, measured with a monotonic high resolution clock, and it is None
+    when it didn't happen (e.g. `download_ms` for streamed responses, which are read by the caller).
+
+    Connection setup (connect and TLS handshake) can't be told apart from the rest of the round
+    trip with requests, so it is part of `ttfb_ms` whenever the pool has to open a connection.
+
+    Attributes:
+        queue_ms (float): Waiting for the circuit breaker and the rate limiter, in every attempt.
+        compress_ms (float): Compressing the body of the request.
+        ttfb_ms (float): From sending the request until the headers of the response arrive (last attempt).
+        download_ms (float): Reading the body of the response (last attempt).
+        retry_ms (float): Failed attempts and the backoff between them.
+        decode_ms (float): Decoding the JSON of the body in `parse`.
+        validation_ms (float): Building the model in `parse`.
+        total_ms (float): The whole call to `execute_request`.
+        attempts (int): Number of times the request was sent.
+        cached (bool): Whether the response was served from the cache without sending the request.
+
+    Usage:
+    >>> response = api.execute_request(Path.EMPLOYEES)
+    >>> employees = parse(response, responses.collection(Employee))
+    >>> print(response.timing.ttfb_ms, response.timing.validation_ms)
+    """
+    __slots__ = (
+        "queue_ms",
+        "compress_ms",
+        "ttfb_ms",
+        "download_ms",
+        "retry_ms",
+        "decode_ms",
+        "validation_ms",
+        "total_ms",
+        "attempts",
+        "cached",
+    )
+
+    def __init__(self):
+        self.queue_ms = None
+        self.compress_ms = None
+        self.ttfb_ms = None
+        self.download_ms = None
+        self.retry_ms = None
+        self.decode_ms = None
+        self.validation_ms = None
+        self.total_ms = None
+        self.attempts = 0
+        self.cached = False
+
+    def add_queue(self, start):
+        self.queue_ms = (self.queue_ms or 0) + elapsed_ms(start)
+
+    def as_dict(self):
+        """Phases that happened, e.g. to log them or to send them to a metrics backend"""
+        return {name: getattr(self, name) for name in self.__slots__ if getattr(self, name) is not None}
+
+    def __repr__(self):
+        phases = ", ".join(f"{name}={value}" for name, value in self.as_dict().items())
+        return f"Timing({phases})"
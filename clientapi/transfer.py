@@ -0,0 +1,162 @@
+import hashlib
+import os
+import re
+from http import HTTPStatus
+
+from clientapi.exceptions import APIClientError, APIHTTPError
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-\d+/(?:\d+|\*)")
+
+
+class DownloadError(APIClientError):
+    code = "download_error"
+    detail = "The downloaded content could not be written"
+    source = None
+
+
+class DownloadResult:  # pylint: disable=too-few-public-methods
+    """Outcome of a download.
+
+    Attributes:
+        bytes_written (int): Bytes written by this download, without the ones already there when resuming.
+        size (int): Total bytes of the content in the destination.
+        checksum (str): Hex digest of the whole content, if a checksum was requested.
+        resumed (bool): Whether the download continued a previous one.
+    """
+    __slots__ = ("bytes_written", "size", "checksum", "resumed")
+
+    def __init__(self, bytes_written, size, checksum=None, resumed=False):
+        self.bytes_written: int = bytes_written
+        self.size: int = size
+        self.checksum: str = checksum
+        self.resumed: bool = resumed
+
+    def __repr__(self):
+        return f"DownloadResult(size={self.size}, bytes_written={self.bytes_written}, resumed={self.resumed})"
+
+
+def download(
+    execute,
+    resource,
+    dest,
+    params=None,
+    headers=None,
+    timeout=None,
+    chunk_size=DOWNLOAD_CHUNK_SIZE,
+    checksum=None,
+    resume=False,
+) -> DownloadResult:  # pylint: disable=too-many-arguments
+    """
+    Streams the body of a response into a destination in chunks, without holding it in memory
+    Args:
+        execute (Callable): function executing a single request, e.g. `ClientAPI.execute_request`
+        resource (str): path of the resource
+        dest (Union[str, os.PathLike, BinaryIO, bytearray, memoryview]): file path, binary handle open for
+            writing, or preallocated writable buffer
+        params (Dict[str, Any], optional): query parameters
+        headers (Dict[str, str], optional): headers of the request
+        timeout (int, optional): seconds to wait for the server
+        chunk_size (int): bytes to read from the network at a time
+        checksum (str, optional): name of a `hashlib` algorithm to compute over the content, e.g. "sha256"
+        resume (bool): when `dest` is a path to a partial download, request the rest of it with an HTTP
+            Range. The server may answer with the whole content, which then replaces the partial one. The
+            content is requested without content-encoding, so the range matches the bytes on disk
+    Raises:
+        APIHTTPError: When the request fails
+        DownloadError: When the content doesn't fit in the buffer or the server answers with another range
+    Returns:
+        DownloadResult
+    """
+    is_path = isinstance(dest, (str, os.PathLike))
+    if resume and not is_path:
+        raise ValueError("Only downloads to a file path can be resumed")
+
+    offset = os.path.getsize(dest) if resume and os.path.exists(dest) else 0
+    headers = dict(headers or {})
+    if resume:
+        # Ranges apply to the encoded content, while a compressed response is written decoded
+        headers = {name: value for name, value in headers.items() if name.lower() != "accept-encoding"}
+        headers["Accept-Encoding"] = "identity"
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+
+    try:
+        response = execute(resource, params=params, headers=headers, timeout=timeout, stream=True)
+    except APIHTTPError as err:
+        # The partial download was already complete
+        if offset and err.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+            return DownloadResult(0, offset, _get_file_checksum(dest, checksum, chunk_size), resumed=True)
+        raise
+
+    try:
+        if offset and response.status_code == HTTPStatus.PARTIAL_CONTENT:
+            match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+            if match is None or int(match.group(1)) != offset:
+                raise DownloadError(source={"range": headers["Range"], "content_range": match and match.group(0)})
+        else:
+            # Not a partial response, the server sent the whole content
+            offset = 0
+
+        digest = hashlib.new(checksum) if checksum else None
+        if offset and digest is not None:
+            _update_file_digest(digest, dest, chunk_size)
+
+        chunks = response.iter_content(chunk_size)
+        if is_path:
+            with open(dest, "ab" if offset else "wb") as file:
+                written = _write_to_file(chunks, file, digest)
+        elif hasattr(dest, "write"):
+            written = _write_to_file(chunks, dest, digest)
+        else:
+            written = _write_to_buffer(chunks, dest, digest)
+    finally:
+        response.close()
+
+    return DownloadResult(
+        bytes_written=written,
+        size=offset + written,
+        checksum=digest.hexdigest() if digest is not None else None,
+        resumed=bool(offset),
+    )
+
+
+def _write_to_file(chunks, file, digest):
+    written = 0
+    for chunk in chunks:
+        file.write(chunk)
+        if digest is not None:
+            digest.update(chunk)
+        written += len(chunk)
+    return written
+
+
+def _write_to_buffer(chunks, buffer, digest):
+    # Chunks are copied straight into their slice of the buffer, never concatenated
+    view = memoryview(buffer).cast("B")
+    written = 0
+    for chunk in chunks:
+        end = written + len(chunk)
+        if end > len(view):
+            source = {"buffer_size": len(view), "received": end}
+            raise DownloadError(detail="The content is bigger than the buffer", source=source)
+        view[written:end] = chunk
+        if digest is not None:
+            digest.update(chunk)
+        written = end
+    return written
+
+
+def _get_file_checksum(path, checksum, chunk_size):
+    if not checksum:
+        return None
+    digest = hashlib.new(checksum)
+    _update_file_digest(digest, path, chunk_size)
+    return digest.hexdigest()
+
+
+def _update_file_digest(digest, path, chunk_size):
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
@@ -18,6 +18,13 @@ setuptools.setup(
     url="https://github.com/ElectricAI/clientapi",
     packages=setuptools.find_packages(exclude=("tests", "tests.*")),
     install_requires=requirements,
+    extras_require={
+        "async": ["httpx>=0.18.0"],
+        "orjson": ["orjson>=3.5.0"],
+        "brotli": ["brotli>=1.0.9"],
+        "zstd": ["zstandard>=0.15.0"],
+        "otel": ["opentelemetry-api>=1.0.0"],
+    },
     include_package_data=True,
     classifiers=[],
 )
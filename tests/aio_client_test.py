@@ -0,0 +1,141 @@
+import asyncio
+import json
+import logging
+import re
+import uuid
+from http import HTTPStatus
+from logging import DEBUG, INFO
+
+import httpx
+import pytest
+
+from clientapi import APIHTTPError
+from clientapi.aio import AsyncClientAPI
+
+log_regex = re.compile(r"(Response|Request): (.*)")
+
+
+# AsyncClientAPI Scenarios
+# Scenario 01: Success - Execute with default logger disabled
+# Scenario 02: Success - Execute with default logger enabled
+# Scenario 03: Success - Concurrent executions share the session
+# Scenario 04: Failed - Execute HTTP Error
+def test_execute_success_with_default_logger_disabled(caplog):
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    body = {"attribute": 1234}
+
+    clientapi_logger = logging.getLogger("clientapi")
+    clientapi_logger.setLevel(INFO)
+
+    def handler(request):
+        assert str(request.url) == f"{url}{resource}"
+        return httpx.Response(HTTPStatus.OK, json=body)
+
+    # When
+    response = asyncio.run(_execute(handler, url, resource=resource))
+
+    # Then
+    assert json.loads(response.content) == body
+    assert len(caplog.records) == 0
+
+
+def test_execute_success_with_default_logger_enabled(caplog):
+    # Given
+    base_url = "https://url.com"
+    resource = "/hello"
+    body = {"attribute": 1234}
+    request_body = {"attr": "abc"}
+    request_uuid = uuid.uuid4()
+    request_params = {"page": "1", "my_uuid_field": request_uuid}
+
+    clientapi_logger = logging.getLogger("clientapi")
+    clientapi_logger.setLevel(DEBUG)
+
+    def handler(request):
+        assert request.method == "POST"
+        assert request.headers["Content-Type"] == "application/json"
+        assert request.url.params["my_uuid_field"] == str(request_uuid)
+        assert json.loads(request.content) == request_body
+        return httpx.Response(HTTPStatus.OK, json=body)
+
+    # When
+    response = asyncio.run(
+        _execute(
+            handler,
+            base_url,
+            method="POST",
+            resource=resource,
+            data=json.dumps(request_body),
+            params=request_params,
+        )
+    )
+
+    # Then
+    assert json.loads(response.content) == body
+    assert len(caplog.records) == 2
+
+    request_log_groups = log_regex.search(caplog.records[0].message)
+    assert request_log_groups[1] == "Request"
+    request_log_detail = json.loads(request_log_groups[2])
+    assert request_log_detail["url"] == f"{base_url}{resource}"
+    assert request_log_detail["method"] == "POST"
+    assert request_log_detail["params"] == {"page": "1", "my_uuid_field": str(request_uuid)}
+
+    response_log_groups = log_regex.search(caplog.records[1].message)
+    assert response_log_groups[1] == "Response"
+    response_log_detail = json.loads(response_log_groups[2])
+    assert response_log_detail["status_code"] == HTTPStatus.OK
+    assert isinstance(response_log_detail["time_ms"], float)
+    assert json.loads(response_log_detail["body"]) == body
+
+
+def test_execute_concurrent_requests():
+    # Given
+    url = "https://url.com"
+    ids = list(range(20))
+
+    def handler(request):
+        return httpx.Response(HTTPStatus.OK, json={"id": int(request.url.path.rsplit("/", 1)[1])})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as session:
+            api = AsyncClientAPI(session=session, url=url)
+            return await asyncio.gather(*(api.execute_request(resource=f"/items/{i}") for i in ids))
+
+    # When
+    responses = asyncio.run(run())
+
+    # Then
+    assert [response.json()["id"] for response in responses] == ids
+
+
+def test_execute_http_error():
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    body = {"error": "not_found"}
+
+    def handler(_):
+        return httpx.Response(HTTPStatus.NOT_FOUND, json=body)
+
+    # When
+    with pytest.raises(APIHTTPError) as ex_info:
+        asyncio.run(_execute(handler, url, resource=resource))
+
+    # Then
+    err = ex_info.value
+    assert err.code == "unknown"
+    assert err.status_code == HTTPStatus.NOT_FOUND
+    assert err.source["method"] == "GET"
+    assert err.source["url"] == f"{url}{resource}"
+    assert json.loads(err.source["text"]) == body
+
+
+async def _execute(handler, url, **kwargs):
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as session:
+        api = AsyncClientAPI(session=session, url=url)
+        response = await api.execute_request(**kwargs)
+        await response.aread()
+        return response
@@ -0,0 +1,86 @@
+import asyncio
+from base64 import b64encode
+from http import HTTPStatus
+
+import httpx
+from requests.auth import AuthBase
+
+from clientapi.aio import sessions
+
+
+# Scenarios for aio sessions
+# Scenario 01: no_auth
+# Scenario 02: bearer
+# Scenario 03: secret key
+# Scenario 04: basic
+# Scenario 05: base
+def test_sessions_no_auth():
+    # When
+    headers = asyncio.run(_sent_headers(sessions.no_auth))
+
+    # Then
+    assert "Authorization" not in headers
+
+
+def test_sessions_bearer():
+    # Given
+    token = "some_token"
+
+    # When
+    headers = asyncio.run(_sent_headers(sessions.bearer, token))
+
+    # Then
+    assert headers["Authorization"] == f"Bearer {token}"
+
+
+def test_sessions_shared_secret_key():
+    # Given
+    shared_secret = "some_key"
+
+    # When
+    headers = asyncio.run(_sent_headers(sessions.shared_secret, shared_secret))
+
+    # Then
+    assert headers["SHARED_SECRET"] == shared_secret
+
+
+def test_sessions_basic():
+    # Given
+    username = "test_username"
+    password = "test_password"
+
+    # When
+    headers = asyncio.run(_sent_headers(sessions.basic, username, password))
+
+    # Then
+    expected_basic_token = b64encode(f"{username}:{password}".encode()).decode()
+    assert headers["Authorization"] == f"Basic {expected_basic_token}"
+
+
+def test_sessions_base():
+    # When
+    headers = asyncio.run(_sent_headers(sessions.base, DummyAuth()))
+
+    # Then
+    assert headers["X-Dummy"] == "dummy"
+
+
+async def _sent_headers(session_factory, *args):
+    sent = {}
+
+    def handler(request):
+        sent.update(request.headers)
+        return httpx.Response(HTTPStatus.OK)
+
+    async with session_factory(*args, transport=httpx.MockTransport(handler)) as session:
+        assert isinstance(session, httpx.AsyncClient)
+        await session.get("https://url.com")
+
+    return httpx.Headers(sent)
+
+
+class DummyAuth(AuthBase):  # pylint: disable=too-few-public-methods
+
+    def __call__(self, r):
+        r.headers["X-Dummy"] = "dummy"
+        return r
@@ -0,0 +1,101 @@
+import json
+from http import HTTPStatus
+
+import responses
+from requests import Session
+
+from clientapi import APIHTTPError, ClientAPI
+from clientapi.batch import BatchResult, execute_many
+from clientapi.mocks import http_200_callback, http_404_callback
+
+
+# Scenarios for execute_many
+# Scenario 01: Success - Results in input order
+# Scenario 02: Success - Results as they complete
+# Scenario 03: Failed item does not abort the batch
+# Scenario 04: Empty batch
+# Scenario 05: Result representation
+@responses.activate
+def test_execute_many_ordered():
+    # Given
+    url = "https://url.com"
+    ids = list(range(30))
+    for i in ids:
+        responses.add_callback(
+            url=f"{url}/items/{i}",
+            method="GET",
+            callback=http_200_callback(body={"id": i}),
+        )
+
+    api = ClientAPI(url=url, session=Session(), log_requests=False)
+
+    # When
+    results = list(api.execute_many([{"resource": f"/items/{i}"} for i in ids], max_workers=8))
+
+    # Then
+    assert [result.index for result in results] == ids
+    assert [json.loads(result.response.content)["id"] for result in results] == ids
+    assert all(result.ok for result in results)
+
+
+@responses.activate
+def test_execute_many_unordered():
+    # Given
+    url = "https://url.com"
+    ids = list(range(10))
+    for i in ids:
+        responses.add_callback(
+            url=f"{url}/items/{i}",
+            method="GET",
+            callback=http_200_callback(body={"id": i}),
+        )
+
+    api = ClientAPI(url=url, session=Session(), log_requests=False)
+
+    # When
+    results = list(api.execute_many([{"resource": f"/items/{i}"} for i in ids], ordered=False))
+
+    # Then
+    assert sorted(result.index for result in results) == ids
+    for result in results:
+        assert json.loads(result.response.content)["id"] == result.index
+
+
+@responses.activate
+def test_execute_many_captures_errors():
+    # Given
+    url = "https://url.com"
+    responses.add_callback(url=f"{url}/items/1", method="GET", callback=http_200_callback(body={"id": 1}))
+    responses.add_callback(url=f"{url}/items/2", method="GET", callback=http_404_callback(body={"id": 2}))
+    responses.add_callback(url=f"{url}/items/3", method="GET", callback=http_200_callback(body={"id": 3}))
+
+    api = ClientAPI(url=url, session=Session(), log_requests=False)
+    requests = [{"resource": f"/items/{i}"} for i in (1, 2, 3)]
+
+    # When
+    results = list(api.execute_many(requests))
+
+    # Then
+    assert [result.ok for result in results] == [True, False, True]
+    failed = results[1]
+    assert failed.request == requests[1]
+    assert failed.response is None
+    assert isinstance(failed.error, APIHTTPError)
+    assert failed.error.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_execute_many_empty():
+    # When
+    results = list(execute_many(_unexpected_call, []))
+
+    # Then
+    assert results == []
+
+
+def test_batch_result_repr():
+    # Then
+    assert repr(BatchResult(0, {}, error=ValueError("x"))) == "BatchResult(index=0, error=ValueError('x'))"
+
+
+def _unexpected_call(**_):
+    raise AssertionError("No request was expected")
@@ -0,0 +1,268 @@
+from http import HTTPStatus
+from unittest.mock import Mock
+
+import pytest
+import responses
+from requests import Session
+
+from clientapi import APIHTTPError, ClientAPI
+from clientapi.breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from clientapi.mocks import (
+    http_200_callback,
+    http_404_callback,
+    http_503_callback,
+)
+from clientapi.ratelimit import RateLimiter, RateLimitExceeded
+
+
+# Scenarios for CircuitBreaker
+# Scenario 01: Opens when the failure rate reaches the threshold
+# Scenario 02: Opens when the slow call rate reaches the threshold
+# Scenario 03: Half open after the timeout and closes after successful trial calls
+# Scenario 04: Half open re-opens on a failed trial call
+# Scenario 05: Listeners get notified of state changes
+# Scenario 06: Failure classification
+# Scenario 07: Released trial calls can be used again
+# Scenario 08: Late outcomes of calls let through before a state change are ignored
+def test_breaker_opens_on_failure_rate():
+    # Given
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, window_size=4, minimum_calls=4, clock=FakeClock())
+
+    # When
+    for failed in (False, True, False):
+        breaker.before_call()
+        breaker.record(failed, 0.1)
+
+    # Then
+    assert breaker.state == CircuitState.CLOSED
+
+    # When
+    breaker.before_call()
+    breaker.record_failure()
+
+    # Then
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError) as ex_info:
+        breaker.before_call()
+    assert ex_info.value.code == "circuit_open"
+    assert ex_info.value.source == {"state": "open", "retry_after": 30}
+
+
+def test_breaker_opens_on_slow_call_rate():
+    # Given
+    breaker = CircuitBreaker(slow_call_duration=1, slow_call_rate_threshold=0.5, window_size=2, minimum_calls=2)
+
+    # When
+    breaker.record_success(duration=0.2)
+    breaker.record_success(duration=1.5)
+
+    # Then
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_breaker_half_open_closes():
+    # Given
+    clock = FakeClock()
+    breaker = CircuitBreaker(minimum_calls=1, open_timeout=10, half_open_max_calls=2, clock=clock)
+    breaker.record_failure()
+
+    # When
+    clock.now += 10
+
+    # Then
+    assert breaker.state == CircuitState.HALF_OPEN
+    breaker.before_call()
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # When
+    breaker.record_success()
+    breaker.record_success()
+
+    # Then
+    assert breaker.state == CircuitState.CLOSED
+    breaker.before_call()
+
+
+def test_breaker_half_open_reopens():
+    # Given
+    clock = FakeClock()
+    breaker = CircuitBreaker(minimum_calls=1, open_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now += 10
+    breaker.before_call()
+
+    # When
+    breaker.record_failure()
+
+    # Then
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_breaker_listeners():
+    # Given
+    clock = FakeClock()
+    breaker = CircuitBreaker(minimum_calls=1, open_timeout=10, clock=clock)
+    listener = Mock()
+    breaker.add_listener(listener)
+
+    # When
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 10
+    breaker.before_call()
+    breaker.record_success()
+
+    # Then
+    assert [call.args for call in listener.call_args_list] == [
+        (breaker, CircuitState.CLOSED, CircuitState.OPEN),
+        (breaker, CircuitState.OPEN, CircuitState.HALF_OPEN),
+        (breaker, CircuitState.HALF_OPEN, CircuitState.CLOSED),
+    ]
+
+
+def test_breaker_is_failure():
+    # Then
+    assert CircuitBreaker.is_failure(error=ConnectionError())
+    assert CircuitBreaker.is_failure(response=Mock(status_code=HTTPStatus.BAD_GATEWAY))
+    assert not CircuitBreaker.is_failure(response=Mock(status_code=HTTPStatus.NOT_FOUND))
+    assert not CircuitBreaker.is_failure(response=Mock(status_code=HTTPStatus.OK))
+
+
+def test_breaker_release():
+    # Given
+    clock = FakeClock()
+    breaker = CircuitBreaker(minimum_calls=1, open_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now += 10
+    breaker.before_call()
+
+    # When
+    breaker.release()
+
+    # Then
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_breaker_ignores_late_outcomes():
+    # Given
+    clock = FakeClock()
+    breaker = CircuitBreaker(window_size=2, minimum_calls=2, open_timeout=10, clock=clock)
+    permit = breaker.before_call()
+    for _ in range(2):
+        breaker.record_failure(permit=breaker.before_call())
+    clock.now += 10
+
+    # When
+    breaker.record(False, 12.0, permit)
+    breaker.release(permit)
+
+    # Then
+    assert breaker.state == CircuitState.HALF_OPEN
+    trial_permit = breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success(permit=trial_permit)
+    assert breaker.state == CircuitState.CLOSED
+
+
+# Scenarios for ClientAPI with a CircuitBreaker
+# Scenario 01: Failed - Fails fast without sending the request once open
+# Scenario 02: Success - Client errors don't open the circuit
+# Scenario 03: Rate limited calls don't take the trial calls of a half open circuit
+# Scenario 04: Calls failing before getting a response give their trial call back
+@responses.activate
+def test_client_fails_fast_when_open():
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    for _ in range(2):
+        responses.add_callback(url=f"{url}{resource}", method="GET", callback=http_503_callback())
+
+    api = ClientAPI(url=url, session=Session(), circuit_breaker=CircuitBreaker(window_size=2, minimum_calls=2))
+
+    # When
+    for _ in range(2):
+        with pytest.raises(APIHTTPError):
+            api.execute_request(resource=resource)
+
+    # Then
+    with pytest.raises(CircuitOpenError):
+        api.execute_request(resource=resource)
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_client_errors_do_not_open_the_circuit():
+    # Given
+    url = "https://url.com"
+    responses.add_callback(url=f"{url}/missing", method="GET", callback=http_404_callback())
+    responses.add_callback(url=f"{url}/hello", method="GET", callback=http_200_callback(body={}))
+
+    breaker = CircuitBreaker(minimum_calls=1)
+    api = ClientAPI(url=url, session=Session(), circuit_breaker=breaker)
+
+    # When
+    with pytest.raises(APIHTTPError):
+        api.execute_request(resource="/missing")
+    response = api.execute_request(resource="/hello")
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+    assert breaker.state == CircuitState.CLOSED
+
+
+@responses.activate
+def test_client_rate_limited_trial_call():
+    # Given
+    url = "https://url.com"
+    responses.add_callback(url=f"{url}/hello", method="GET", callback=http_200_callback(body={}))
+    clock = FakeClock()
+    breaker = CircuitBreaker(minimum_calls=1, open_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now += 10
+    api = ClientAPI(url=url, session=Session(), circuit_breaker=breaker, rate_limiter=RateLimiter(rate=1, block=False))
+    api.execute_request(resource="/hello")
+    breaker.record_failure()
+    clock.now += 10
+
+    # When
+    with pytest.raises(RateLimitExceeded):
+        api.execute_request(resource="/hello")
+
+    # Then
+    assert breaker.state == CircuitState.HALF_OPEN
+    breaker.before_call()
+
+
+def test_client_failed_upload_trial_call():
+    # Given
+    clock = FakeClock()
+    breaker = CircuitBreaker(minimum_calls=1, open_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now += 10
+    session = Mock()
+    session.request.side_effect = ValueError("The upload failed")
+    api = ClientAPI(url="https://url.com", session=session, circuit_breaker=breaker)
+
+    # When
+    with pytest.raises(ValueError):
+        api.execute_request(resource="/hello", method="POST", data=iter([b"a"]))
+
+    # Then
+    assert breaker.state == CircuitState.HALF_OPEN
+    breaker.before_call()
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
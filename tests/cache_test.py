@@ -0,0 +1,289 @@
+import json
+import time
+from email.utils import formatdate
+from http import HTTPStatus
+
+import responses
+from requests import Response, Session
+
+from clientapi import ClientAPI
+from clientapi.cache import (
+    CachedResponse,
+    MemoryCache,
+    ResponseCache,
+    SQLiteCache,
+    request_key,
+)
+from clientapi.mocks import http_200_callback, http_304_callback
+
+
+# Scenarios for request_key
+# Scenario 01: Stable regardless of params order and headers case
+# Scenario 02: Every header but the ignored ones is part of the key, hashed
+def test_request_key():
+    # When
+    key = request_key("get", "https://url.com/a", {"b": 2, "a": [1, 3]}, {"accept": "application/json"})
+    same_key = request_key("GET", "https://url.com/a", [("a", 1), ("b", "2"), ("a", 3)], {"Accept": "application/json"})
+
+    # Then
+    assert key == same_key
+    assert key.startswith("GET https://url.com/a?a=1&a=3&b=2 [accept ")
+    assert request_key("GET", "https://url.com/a") == "GET https://url.com/a"
+
+
+def test_request_key_headers():
+    # Given
+    headers = {"Accept": "application/json", "X-Tenant-Id": "a", "SHARED_SECRET": "s3cr3t"}
+
+    # When
+    key = request_key("GET", "https://url.com/a", headers=headers)
+
+    # Then
+    assert request_key("GET", "https://url.com/a", headers={**headers, "traceparent": "00-1-2-01"}) == key
+    assert request_key("GET", "https://url.com/a", headers={**headers, "X-Tenant-Id": "b"}) != key
+    assert request_key("GET", "https://url.com/a", headers={**headers, "SHARED_SECRET": "other"}) != key
+    assert "s3cr3t" not in key
+
+
+# Scenarios for backends
+# Scenario 01: MemoryCache evicts the least recently used entries
+# Scenario 02: MemoryCache evicts by size
+# Scenario 03: SQLiteCache round trip and persistence
+# Scenario 04: SQLiteCache evicts by size
+def test_memory_cache_lru():
+    # Given
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", _entry(b"a"))
+    cache.set("b", _entry(b"b"))
+
+    # When
+    cache.get("a")
+    cache.set("c", _entry(b"c"))
+
+    # Then
+    assert cache.get("b") is None
+    assert cache.get("a").content == b"a"
+    assert cache.get("c").content == b"c"
+
+
+def test_memory_cache_max_bytes():
+    # Given
+    cache = MemoryCache(max_bytes=10)
+
+    # When
+    cache.set("a", _entry(b"12345"))
+    cache.set("b", _entry(b"12345"))
+    cache.set("c", _entry(b"1"))
+    cache.set("too_big", _entry(b"12345678901"))
+
+    # Then
+    assert cache.get("a") is None
+    assert cache.get("too_big") is None
+    assert len(cache) == 2
+
+
+def test_sqlite_cache_round_trip(tmp_path):
+    # Given
+    path = str(tmp_path / "cache.sqlite")
+    cache = SQLiteCache(path)
+    entry = _entry(b'{"a": 1}', headers={"ETag": '"v1"'})
+
+    # When
+    cache.set("a", entry)
+    cache.close()
+    stored = SQLiteCache(path).get("a")
+
+    # Then
+    assert stored.content == entry.content
+    assert stored.headers == entry.headers
+    assert stored.expires_at == entry.expires_at
+    assert stored.to_response().json() == {"a": 1}
+
+
+def test_sqlite_cache_max_bytes(tmp_path):
+    # Given
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"), max_bytes=10)
+
+    # When
+    cache.set("a", _entry(b"12345"))
+    cache.set("b", _entry(b"12345"))
+    cache.get("a")
+    cache.set("c", _entry(b"1"))
+
+    # Then
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert len(cache) == 2
+
+
+# Scenarios for ResponseCache
+# Scenario 01: Freshness from Cache-Control and Expires
+# Scenario 02: no-store and responses without validators nor freshness are not stored
+def test_response_cache_freshness():
+    # Given
+    cache = ResponseCache()
+
+    # When
+    cache.store("max_age", _response(headers={"Cache-Control": "public, max-age=60"}))
+    cache.store("expires", _response(headers={"Expires": formatdate(time.time() + 60, usegmt=True)}))
+    cache.store("no_cache", _response(headers={"Cache-Control": "no-cache", "ETag": '"v1"'}))
+
+    # Then
+    assert cache.get("max_age").is_fresh()
+    assert cache.get("expires").is_fresh()
+    assert not cache.get("no_cache").is_fresh()
+
+
+def test_response_cache_not_stored():
+    # Given
+    cache = ResponseCache()
+
+    # When
+    cache.store("no_store", _response(headers={"Cache-Control": "no-store", "ETag": '"v1"'}))
+    cache.store("no_freshness", _response())
+    cache.store("error", _response(HTTPStatus.INTERNAL_SERVER_ERROR, headers={"Cache-Control": "max-age=60"}))
+
+    # Then
+    assert len(cache.backend) == 0
+
+
+# Scenarios for ClientAPI with a ResponseCache
+# Scenario 01: Fresh responses are served without a request
+# Scenario 02: Stale responses are revalidated and a 304 is a cache hit
+# Scenario 03: Unsafe methods are not cached
+# Scenario 04: Cached responses can be iterated
+# Scenario 05: Responses to different headers are not shared
+@responses.activate
+def test_client_serves_fresh_responses():
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    body = {"attribute": 1234}
+    responses.add_callback(
+        url=f"{url}{resource}",
+        method="GET",
+        callback=http_200_callback(body=body, headers={"Cache-Control": "max-age=60"}),
+    )
+
+    api = ClientAPI(url=url, session=Session(), cache=ResponseCache())
+
+    # When
+    first = api.execute_request(resource=resource)
+    second = api.execute_request(resource=resource)
+
+    # Then
+    assert json.loads(first.content) == json.loads(second.content) == body
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_client_revalidates_stale_responses():
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    body = {"attribute": 1234}
+    responses.add_callback(
+        url=f"{url}{resource}",
+        method="GET",
+        callback=http_200_callback(body=body, headers={"ETag": '"v1"'}),
+    )
+    responses.add_callback(
+        url=f"{url}{resource}",
+        method="GET",
+        callback=http_304_callback(headers={"ETag": '"v1"'}, request_headers={"If-None-Match": '"v1"'}),
+    )
+
+    api = ClientAPI(url=url, session=Session(), cache=ResponseCache())
+
+    # When
+    api.execute_request(resource=resource)
+    revalidated = api.execute_request(resource=resource)
+
+    # Then
+    assert len(responses.calls) == 2
+    assert revalidated.status_code == HTTPStatus.OK
+    assert json.loads(revalidated.content) == body
+
+
+@responses.activate
+def test_client_does_not_cache_unsafe_methods():
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    for _ in range(2):
+        responses.add_callback(
+            url=f"{url}{resource}",
+            method="POST",
+            callback=http_200_callback(body={}, headers={"Cache-Control": "max-age=60"}),
+        )
+
+    api = ClientAPI(url=url, session=Session(), cache=ResponseCache())
+
+    # When
+    api.execute_request(resource=resource, method="POST", data="{}")
+    api.execute_request(resource=resource, method="POST", data="{}")
+
+    # Then
+    assert len(responses.calls) == 2
+
+
+def _response(status_code=HTTPStatus.OK, headers=None):
+    response = Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = b"{}"  # pylint: disable=protected-access
+    return response
+
+
+@responses.activate
+def test_client_iterates_cached_responses():
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    responses.add_callback(
+        url=f"{url}{resource}",
+        method="GET",
+        callback=http_200_callback(body={"attribute": 1234}, headers={"Cache-Control": "max-age=60"}),
+    )
+
+    api = ClientAPI(url=url, session=Session(), cache=ResponseCache())
+    first = api.execute_request(resource=resource)
+
+    # When
+    cached = api.execute_request(resource=resource)
+
+    # Then
+    assert b"".join(cached.iter_content(4)) == first.content
+    assert list(cached.iter_lines()) == [first.content]
+
+
+@responses.activate
+def test_client_does_not_share_responses_between_headers():
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    for tenant in ("a", "b"):
+        responses.add_callback(
+            url=f"{url}{resource}",
+            method="GET",
+            callback=http_200_callback(
+                body={"tenant": tenant},
+                headers={"Cache-Control": "max-age=60"},
+                request_headers={"X-Tenant-Id": tenant},
+            ),
+        )
+
+    api = ClientAPI(url=url, session=Session(), cache=ResponseCache())
+
+    # When
+    first = api.execute_request(resource=resource, headers={"X-Tenant-Id": "a"})
+    second = api.execute_request(resource=resource, headers={"X-Tenant-Id": "b"})
+
+    # Then
+    assert json.loads(first.content) == {"tenant": "a"}
+    assert json.loads(second.content) == {"tenant": "b"}
+    assert len(responses.calls) == 2
+
+
+def _entry(content, headers=None):
+    return CachedResponse(HTTPStatus.OK, "OK", headers or {}, content, "https://url.com", "utf-8", time.time() + 60)
@@ -1,15 +1,18 @@
+import io
 import json
 import logging
 import re
 import uuid
 from http import HTTPStatus
 from logging import DEBUG, INFO
+from unittest.mock import patch
 
 import pytest
 import responses
 from requests import Session
 
-from clientapi import APIHTTPError, ClientAPI
+from clientapi import APIHTTPError, ClientAPI, ContentType
+from clientapi.logger import LogPolicy
 from clientapi.mocks import http_200_callback, http_404_callback
 
 log_regex = re.compile(r"(Response|Request): (.*)")
@@ -20,6 +23,11 @@ log_regex = re.compile(r"(Response|Request): (.*)")
 # Scenario 02: Success - Execute with default logger disabled
 # Scenario 03: Success - Execute with external logger
 # Scenario 04: Failed - Execute HTTP Error
+# Scenario 05: Success - Execute with request logging turned off in the client
+# Scenario 06: Success - Log details are not serialized when DEBUG is disabled
+# Scenario 07: Success - Log details are truncated and redacted by the log policy
+# Scenario 08: Success - Streamed responses are logged without their body
+# Scenario 09: Success - Upload sources are streamed and not logged
 @responses.activate
 def test_execute_success_with_default_logger_disabled(caplog):
     # Given
@@ -207,3 +215,160 @@ def test_execute_http_error():
         "url": f"{url}{resource}",
     }
     assert err.source == expected_source
+
+
+@responses.activate
+def test_execute_success_with_request_logging_off(caplog):
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    body = {"attribute": 1234}
+
+    responses.add_callback(
+        url=f"{url}{resource}",
+        method="GET",
+        callback=http_200_callback(body=body),
+    )
+
+    clientapi_logger = logging.getLogger("clientapi")
+    clientapi_logger.setLevel(DEBUG)
+
+    session = Session()
+
+    # When
+    api = ClientAPI(url=url, session=session, log_requests=False)
+    response = api.execute_request(resource=resource)
+
+    # Then
+    assert json.loads(response.content) == body
+    assert len(caplog.records) == 0
+
+
+@responses.activate
+def test_execute_does_not_serialize_log_details_when_debug_disabled():
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    body = {"attribute": 1234}
+
+    responses.add_callback(
+        url=f"{url}{resource}",
+        method="GET",
+        callback=http_200_callback(body=body),
+    )
+
+    clientapi_logger = logging.getLogger("clientapi")
+    clientapi_logger.setLevel(INFO)
+
+    session = Session()
+    api = ClientAPI(url=url, session=session)
+
+    # When
+    with patch("clientapi.client._get_request_log_detail") as request_log_detail, \
+            patch("clientapi.client._get_response_log_detail") as response_log_detail:
+        api.execute_request(resource=resource)
+
+    # Then
+    request_log_detail.assert_not_called()
+    response_log_detail.assert_not_called()
+
+
+@responses.activate
+def test_execute_success_with_log_policy(caplog):
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    body = {"attribute": "a" * 100}
+
+    responses.add_callback(
+        url=f"{url}{resource}",
+        method="POST",
+        callback=http_200_callback(body=body),
+    )
+
+    clientapi_logger = logging.getLogger("clientapi")
+    clientapi_logger.setLevel(DEBUG)
+
+    session = Session()
+    api = ClientAPI(url=url, session=session, log_policy=LogPolicy(max_body_length=10))
+
+    # When
+    api.execute_request(
+        resource=resource,
+        method="POST",
+        headers={"Authorization": "Bearer secret"},
+        data=json.dumps(body),
+    )
+
+    # Then
+    request_log_detail = json.loads(log_regex.search(caplog.records[0].message)[2])
+    assert request_log_detail["headers"]["Authorization"] == LogPolicy.REDACTED
+    assert request_log_detail["data"].startswith(json.dumps(body)[:10] + "...[truncated")
+
+    response_log_detail = json.loads(log_regex.search(caplog.records[1].message)[2])
+    assert response_log_detail["body"].startswith(json.dumps(body)[:10] + "...[truncated")
+
+
+@responses.activate
+def test_execute_stream_does_not_log_body(caplog):
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    body = {"attribute": 1234}
+
+    responses.add_callback(
+        url=f"{url}{resource}",
+        method="GET",
+        callback=http_200_callback(body=body),
+    )
+
+    clientapi_logger = logging.getLogger("clientapi")
+    clientapi_logger.setLevel(DEBUG)
+
+    api = ClientAPI(url=url, session=Session())
+
+    # When
+    response = api.execute_request(resource=resource, stream=True)
+    response_log = caplog.records[1].message
+    content = response.content
+
+    # Then
+    assert json.loads(content) == body
+    response_log_detail = json.loads(log_regex.search(response_log)[2])
+    assert response_log_detail["status_code"] == HTTPStatus.OK
+    assert "body" not in response_log_detail
+
+
+@pytest.mark.parametrize(
+    "upload, expected_log",
+    [
+        (lambda: io.BytesIO(b"a,b\n1,2\n"), "[BytesIO upload, 8 bytes]"),
+        (lambda: (chunk for chunk in [b"a,b\n", b"1,2\n"]), "[generator upload]"),
+        (lambda: memoryview(b"a,b\n1,2\n"), "[memoryview upload, 8 bytes]"),
+    ],
+)
+@responses.activate
+def test_execute_upload(caplog, upload, expected_log):
+    # Given
+    url = "https://url.com"
+    resource = "/import"
+    received = []
+
+    def callback(request):
+        body = request.body
+        received.append(bytes(body) if isinstance(body, (bytes, memoryview)) else b"".join(body))
+        return HTTPStatus.OK, {}, ""
+
+    responses.add_callback(url=f"{url}{resource}", method="POST", callback=callback)
+
+    logging.getLogger("clientapi").setLevel(DEBUG)
+    api = ClientAPI(url=url, session=Session())
+
+    # When
+    api.execute_request(resource=resource, method="POST", data=upload(), content_type=ContentType.OCTET_STREAM)
+
+    # Then
+    assert received == [b"a,b\n1,2\n"]
+    assert responses.calls[0].request.headers["Content-Type"] == ContentType.OCTET_STREAM
+    request_log_detail = json.loads(log_regex.search(caplog.records[0].message)[2])
+    assert request_log_detail["data"] == expected_log
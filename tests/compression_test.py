@@ -0,0 +1,137 @@
+import gzip
+import io
+import json
+import logging
+import re
+import zlib
+from http import HTTPStatus
+
+import pytest
+import responses
+from requests import Session
+
+from clientapi import ClientAPI
+from clientapi.compression import ENCODERS, Compression
+
+URL = "https://url.com"
+RESOURCE = "/employees"
+BODY = json.dumps([{"name": f"employee {i}", "email": f"employee{i}@company.com"} for i in range(100)])
+
+log_regex = re.compile(r"(Response|Request): (.*)")
+
+
+# Scenarios for Compression
+# Scenario 01: Bodies above the threshold are compressed
+# Scenario 02: Small bodies and upload sources are not compressed
+# Scenario 03: Unknown encodings are rejected
+@pytest.mark.parametrize("encoding, decompress", [("gzip", gzip.decompress), ("deflate", zlib.decompress)])
+def test_compress(encoding, decompress):
+    # Given
+    compression = Compression(encoding, threshold=100)
+
+    # When
+    data, detail = compression.compress(BODY)
+
+    # Then
+    assert decompress(data) == BODY.encode()
+    assert detail["encoding"] == encoding
+    assert detail["original_bytes"] == len(BODY)
+    assert detail["compressed_bytes"] == len(data) < len(BODY)
+    assert detail["time_ms"] >= 0
+
+
+def test_compress_skips_bodies():
+    # Given
+    compression = Compression(threshold=100)
+
+    # When / Then
+    assert compression.compress("x" * 99) is None
+    assert compression.compress(io.BytesIO(BODY.encode())) is None
+    assert compression.compress(None) is None
+
+
+def test_compression_unknown_encoding():
+    # When / Then
+    with pytest.raises(ValueError):
+        Compression("lzma")
+    assert {"gzip", "deflate"} <= set(ENCODERS)
+
+
+# Scenarios for ClientAPI with compression
+# Scenario 01: Success - Body compressed with Content-Encoding, logged uncompressed with its compression time
+# Scenario 02: Success - Compression turned off for a single request
+# Scenario 03: Success - Accept-Encoding of the compression
+# Scenario 04: Success - Bodies already encoded by the caller are not compressed again, whatever the header case
+@responses.activate
+def test_client_compression(caplog):
+    # Given
+    responses.add_callback(url=f"{URL}{RESOURCE}", method="POST", callback=_echo)
+    logging.getLogger("clientapi").setLevel(logging.DEBUG)
+    api = ClientAPI(url=URL, session=Session(), compression=Compression("gzip", threshold=100))
+
+    # When
+    response = api.execute_request(RESOURCE, method="POST", data=BODY)
+
+    # Then
+    assert response.json() == {"content_encoding": "gzip", "body": BODY}
+    request_log_detail = json.loads(log_regex.search(caplog.records[0].message)[2])
+    assert request_log_detail["data"] == BODY
+    assert request_log_detail["headers"]["Content-Encoding"] == "gzip"
+    assert request_log_detail["compression"]["original_bytes"] == len(BODY)
+    response_log_detail = json.loads(log_regex.search(caplog.records[1].message)[2])
+    assert response_log_detail["compress_ms"] == request_log_detail["compression"]["time_ms"]
+
+
+@responses.activate
+def test_client_compression_off_per_request():
+    # Given
+    responses.add_callback(url=f"{URL}{RESOURCE}", method="POST", callback=_echo)
+    api = ClientAPI(url=URL, session=Session(), log_requests=False, compression=Compression(threshold=100))
+
+    # When
+    response = api.execute_request(RESOURCE, method="POST", data=BODY, compression=False)
+
+    # Then
+    assert response.json() == {"content_encoding": None, "body": BODY}
+
+
+@responses.activate
+def test_client_accept_encoding():
+    # Given
+    responses.add_callback(url=f"{URL}{RESOURCE}", method="GET", callback=_echo)
+    api = ClientAPI(url=URL, session=Session(), log_requests=False, compression=Compression(accept_encoding="identity"))
+
+    # When
+    api.execute_request(RESOURCE)
+
+    # Then
+    assert responses.calls[0].request.headers["Accept-Encoding"] == "identity"
+
+
+@responses.activate
+def test_client_already_encoded_body():
+    # Given
+    responses.add_callback(url=f"{URL}{RESOURCE}", method="POST", callback=_echo)
+    api = ClientAPI(
+        url=URL,
+        session=Session(),
+        log_requests=False,
+        compression=Compression(threshold=100, accept_encoding="identity"),
+    )
+    headers = {"content-encoding": "gzip", "accept-encoding": "gzip"}
+
+    # When
+    response = api.execute_request(RESOURCE, method="POST", data=gzip.compress(BODY.encode()), headers=headers)
+
+    # Then
+    assert response.json() == {"content_encoding": "gzip", "body": BODY}
+    assert responses.calls[0].request.headers["Accept-Encoding"] == "gzip"
+
+
+def _echo(request):
+    encoding = request.headers.get("Content-Encoding")
+    body = request.body or b""
+    if encoding == "gzip":
+        body = gzip.decompress(body)
+    body = body.decode() if isinstance(body, bytes) else body
+    return HTTPStatus.OK, {"Content-Type": "application/json"}, json.dumps({"content_encoding": encoding, "body": body})
@@ -1,16 +1,25 @@
 import json
+import pickle
 from http import HTTPStatus
+from unittest.mock import Mock
 from uuid import UUID
 
 import pytest
 from pydantic import BaseModel, ValidationError
 from requests import HTTPError, Request, Response
 
-from clientapi import APIClientError, APIHTTPError, APIValidationError
+from clientapi import (
+    APIClientError,
+    APIHTTPError,
+    APIValidationError,
+    jsoncodec,
+)
+from clientapi.responses import JsonAPIError
 
 
 # APIClientError Scenarios
 # Scenario 01: Content
+# Scenario 02: Pickling
 def test_api_client_error_content():
     # Given
     code = "validation_error"
@@ -32,11 +41,32 @@ def test_api_client_error_content():
     assert content["detail"] == detail
     assert content["source"] == source
     assert str(err) == f"({code}) {detail}. Source: {str(source)}"
+    assert err.args == (code, detail)
+
+
+def test_api_client_error_pickle():
+    # Given
+    err = APIHTTPError("employee_not_found", "Not found", {"pointer": "/data"}, HTTPStatus.NOT_FOUND)
+
+    # When
+    copy = pickle.loads(pickle.dumps(err))
+
+    # Then
+    assert type(copy) is APIHTTPError
+    assert copy.content == err.content
+    assert copy.status_code == HTTPStatus.NOT_FOUND
+    assert str(copy) == str(err)
+    assert copy.args == ("employee_not_found", "Not found")
 
 
 # APIHTTPError Scenarios
 # Scenario 01: HTTPError wrap
 # Scenario 02: HTTPError with non-electric format
+# Scenario 03: Bodies of another Content-Type are not parsed
+# Scenario 04: Big bodies are truncated in the source
+# Scenario 05: JsonAPI errors array
+# Scenario 06: Errors of a bulk request by pointer and by row
+# Scenario 07: Errors are only validated when accessed
 def test_http_error_wrap():
     # Given
     status_code = HTTPStatus.BAD_REQUEST
@@ -119,6 +149,104 @@ def test_http_error_wrap_with_no_electric_format():
     assert api_http_error.source == expected_source
 
 
+def test_http_error_wrap_skips_other_content_types(monkeypatch):
+    # Given
+    loads = Mock()
+    monkeypatch.setattr(jsoncodec, "loads", loads)
+    body = '{"code": "overloaded", "detail": "Try later"}'
+    err = build_http_error(HTTPStatus.SERVICE_UNAVAILABLE, body, "text/html; charset=utf-8")
+
+    # When
+    api_http_error = APIHTTPError.wrap(err)
+
+    # Then
+    loads.assert_not_called()
+    assert api_http_error.code == "unknown"
+    assert api_http_error.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert api_http_error.source["text"] == body
+
+
+def test_http_error_wrap_truncates_text():
+    # Given
+    body = "<html>" + "ñ" * 5000 + "</html>"
+    err = build_http_error(HTTPStatus.BAD_GATEWAY, body, "text/html; charset=utf-8")
+
+    # When
+    api_http_error = APIHTTPError.wrap(err)
+
+    # Then
+    size = len(body.encode())
+    assert api_http_error.source["text"].startswith("<html>ññ")
+    assert api_http_error.source["text"].endswith(f"ñ...[truncated, {size} in total]")
+    assert len(api_http_error.source["text"]) < APIHTTPError.max_text_length + 40
+
+
+def test_http_error_wrap_errors_array():
+    # Given
+    errors = [
+        build_error("/data/0", status=422, code="invalid_email", detail="Not an email"),
+        build_error("/data/2/attributes/email", status="422", title="Duplicated"),
+    ]
+    body = json.dumps({"errors": errors})
+    err = build_http_error(HTTPStatus.UNPROCESSABLE_ENTITY, body, "application/vnd.api+json")
+
+    # When
+    api_http_error = APIHTTPError.wrap(err)
+
+    # Then
+    assert api_http_error.code == "invalid_email"
+    assert api_http_error.detail == "Not an email"
+    assert api_http_error.source == {"pointer": "/data/0"}
+    assert len(api_http_error.errors) == 2
+    assert api_http_error.errors[1].status == "422"
+    assert api_http_error.errors[1].code is None
+    assert api_http_error.errors[1].pointer == "/data/2/attributes/email"
+
+
+def test_http_error_errors_lookup():
+    # Given
+    errors = [build_error(f"/data/{row}/attributes/email", code="invalid_email") for row in range(300)]
+    bad_parameter = {"code": "bad_parameter", "source": {"parameter": "include"}}
+    errors += [
+        build_error("/data/7", code="missing"),
+        build_error("/data", code="batch_too_big"),
+        bad_parameter,
+        "not an error object",
+    ]
+    body = json.dumps({"errors": errors})
+    err = build_http_error(HTTPStatus.UNPROCESSABLE_ENTITY, body, "application/json")
+
+    # When
+    api_http_error = APIHTTPError.wrap(err)
+
+    # Then
+    assert [error.code for error in api_http_error.errors.for_row(7)] == ["invalid_email", "missing"]
+    assert api_http_error.errors.for_row(300) == []
+    assert api_http_error.errors.for_row(0, prefix="/included") == []
+    assert [error.code for error in api_http_error.errors.by_pointer("/data")] == ["batch_too_big"]
+    assert api_http_error.errors.by_pointer("/data/8/attributes/email")[0].code == "invalid_email"
+    assert api_http_error.errors[-1].detail == "not an error object"
+    assert [error.code for error in api_http_error.errors[301:303]] == ["batch_too_big", "bad_parameter"]
+
+
+def test_http_error_errors_are_lazy(monkeypatch):
+    # Given
+    errors = [{"code": f"error_{row}", "source": {"pointer": f"/data/{row}"}} for row in range(100)]
+    body = json.dumps({"errors": errors})
+    err = build_http_error(HTTPStatus.UNPROCESSABLE_ENTITY, body, "application/json")
+    parse_obj = Mock(wraps=JsonAPIError.parse_obj)
+    monkeypatch.setattr(JsonAPIError, "parse_obj", parse_obj)
+
+    # When
+    api_http_error = APIHTTPError.wrap(err)
+    api_http_error.errors.for_row(42)
+    api_http_error.errors.for_row(42)
+
+    # Then
+    assert parse_obj.call_count == 2
+    assert api_http_error.errors[42] is api_http_error.errors.for_row(42)[0]
+
+
 # APIValidationError
 # Scenario 01: ValidationError wrap
 # Scenario 02: ValidationError wrap with Attribute Error
@@ -152,6 +280,24 @@ def test_validation_error_attribute_error_wrap():
     assert electric_error.source is None
 
 
+def build_http_error(status_code, body, content_type):
+    response = Response()
+    response.status_code = status_code
+    response._content = body.encode()
+    response.headers["Content-Type"] = content_type
+    response.encoding = "utf-8"
+    response.url = "some_url"
+
+    request = Request()
+    request.method = "GET"
+
+    return HTTPError("The message", request=request, response=response)
+
+
+def build_error(pointer, **fields):
+    return {**fields, "source": {"pointer": pointer}}
+
+
 class FakeValidationError(ValidationError):
 
     def __init__(self) -> None:
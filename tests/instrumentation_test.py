@@ -0,0 +1,173 @@
+from enum import Enum
+from http import HTTPStatus
+from unittest.mock import Mock
+
+import pytest
+import responses
+from requests import Session
+
+from clientapi import APIHTTPError, ClientAPI
+from clientapi.instrumentation import (
+    Histogram,
+    InMemoryMetrics,
+    Instrumentation,
+    Labels,
+    OpenTelemetryTracing,
+)
+from clientapi.mocks import (
+    http_200_callback,
+    http_404_callback,
+    http_503_callback,
+)
+from clientapi.retry import RetryPolicy
+
+URL = "https://url.com"
+
+
+# Scenarios for Histogram
+# Scenario 01: Count, sum, mean and quantiles
+# Scenario 02: Empty histogram
+def test_histogram():
+    # Given
+    histogram = Histogram(buckets=(10, 100, 1000))
+
+    # When
+    for value in [1, 5, 20, 50, 80, 2000]:
+        histogram.observe(value)
+
+    # Then
+    assert histogram.count == 6
+    assert histogram.sum == 2156
+    assert histogram.counts == [2, 3, 0, 1]
+    assert histogram.min == 1 and histogram.max == 2000
+    assert histogram.quantile(0) == 1
+    assert 10 <= histogram.quantile(0.5) <= 80
+    assert histogram.quantile(1) == 2000
+
+
+def test_histogram_empty():
+    # When / Then
+    assert Histogram().quantile(0.99) is None
+    assert Histogram().mean is None
+
+
+# Scenarios for ClientAPI instrumentation
+# Scenario 01: Success - Metrics labeled by method and route template
+# Scenario 02: Failed - Metrics labeled by status code and error code
+# Scenario 03: Retries are counted
+# Scenario 04: A failing hook doesn't break the request
+# Scenario 05: Spans of an OpenTelemetry compatible tracer
+@responses.activate
+def test_metrics_success():
+    # Given
+    for employee_id in ("1", "2"):
+        responses.add_callback(
+            url=f"{URL}/employees/{employee_id}",
+            method="GET",
+            callback=http_200_callback(body={}),
+        )
+    metrics = InMemoryMetrics()
+    api = ClientAPI(url=URL, session=Session(), log_requests=False, instrumentation=[metrics])
+
+    # When
+    for employee_id in ("1", "2"):
+        api.execute_request(Path.EMPLOYEE.format(employee_id=employee_id), route=Path.EMPLOYEE)
+
+    # Then
+    labels = Labels("GET", "/employees/{employee_id}", HTTPStatus.OK, None)
+    assert metrics.requests == {labels: 2}
+    assert metrics.latency[labels].count == 2
+    assert metrics.histogram("get", Path.EMPLOYEE, HTTPStatus.OK) is metrics.latency[labels]
+
+
+@responses.activate
+def test_metrics_error():
+    # Given
+    body = {"code": "employee_not_found", "detail": "Not found"}
+    responses.add_callback(url=f"{URL}/employees/1", method="GET", callback=http_404_callback(body=body))
+    metrics = InMemoryMetrics()
+    api = ClientAPI(url=URL, session=Session(), log_requests=False, instrumentation=[metrics])
+
+    # When
+    with pytest.raises(APIHTTPError):
+        api.execute_request("/employees/1", route=Path.EMPLOYEE)
+
+    # Then
+    labels = Labels("GET", "/employees/{employee_id}", HTTPStatus.NOT_FOUND, "employee_not_found")
+    assert metrics.requests == {labels: 1}
+
+
+@responses.activate
+def test_metrics_retries():
+    # Given
+    responses.add_callback(url=f"{URL}/employees", method="GET", callback=http_503_callback())
+    responses.add_callback(url=f"{URL}/employees", method="GET", callback=http_200_callback(body={}))
+    metrics = InMemoryMetrics()
+    api = ClientAPI(
+        url=URL,
+        session=Session(),
+        log_requests=False,
+        retry=RetryPolicy(sleep=Mock()),
+        instrumentation=[metrics],
+    )
+
+    # When
+    api.execute_request("/employees")
+
+    # Then
+    assert metrics.retries == {Labels("GET", "/employees", HTTPStatus.SERVICE_UNAVAILABLE, None): 1}
+    assert metrics.requests == {Labels("GET", "/employees", HTTPStatus.OK, None): 1}
+
+
+@responses.activate
+def test_failing_hook(caplog):
+    # Given
+    responses.add_callback(url=f"{URL}/employees", method="GET", callback=http_200_callback(body={}))
+    metrics = InMemoryMetrics()
+    api = ClientAPI(url=URL, session=Session(), log_requests=False, instrumentation=[FailingHook(), metrics])
+
+    # When
+    response = api.execute_request("/employees")
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+    assert sum(metrics.requests.values()) == 1
+    assert "Instrumentation hook before_request failed for GET /employees" in caplog.text
+
+
+@responses.activate
+def test_tracing():
+    # Given
+    responses.add_callback(url=f"{URL}/employees", method="GET", callback=http_503_callback())
+    responses.add_callback(url=f"{URL}/employees", method="GET", callback=http_503_callback())
+    tracer = Mock()
+    span = tracer.start_span.return_value
+    api = ClientAPI(
+        url=URL,
+        session=Session(),
+        log_requests=False,
+        retry=RetryPolicy(max_attempts=2, sleep=Mock()),
+        instrumentation=[OpenTelemetryTracing(tracer)],
+    )
+
+    # When
+    with pytest.raises(APIHTTPError) as ex_info:
+        api.execute_request("/employees")
+
+    # Then
+    assert tracer.start_span.call_args.args == ("GET /employees",)
+    assert tracer.start_span.call_args.kwargs["attributes"]["url.full"] == f"{URL}/employees"
+    assert span.add_event.call_args.args == ("retry",)
+    span.set_attribute.assert_any_call("http.response.status_code", HTTPStatus.SERVICE_UNAVAILABLE)
+    span.record_exception.assert_called_once_with(ex_info.value)
+    span.end.assert_called_once()
+
+
+class Path(str, Enum):
+    EMPLOYEE = "/employees/{employee_id}"
+
+
+class FailingHook(Instrumentation):
+
+    def before_request(self, call):
+        raise RuntimeError("boom")
@@ -0,0 +1,115 @@
+import datetime
+from unittest.mock import Mock
+from uuid import UUID
+
+import pytest
+import responses
+from pydantic import BaseModel
+from requests import Session
+
+from clientapi import ClientAPI, jsoncodec, parse
+from clientapi import responses as jsonapi
+from clientapi.jsoncodec import OrjsonCodec, StdlibCodec
+from clientapi.mocks import http_200_callback
+
+CODECS = [StdlibCodec()] + ([OrjsonCodec()] if jsoncodec.orjson is not None else [])
+
+
+# Scenarios for codecs
+# Scenario 01: UUIDs and datetimes are encoded as strings
+# Scenario 02: Documents are decoded from str and bytes
+# Scenario 03: Malformed documents raise ValueError
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_dumps(codec):
+    # Given
+    obj = {
+        "id": UUID("c0a8a4e8-6d3b-4a4e-8f3a-2b9f1b1e9c10"),
+        "created_at": datetime.datetime(2021, 5, 1, 10, 30, tzinfo=datetime.timezone.utc),
+        "day": datetime.date(2021, 5, 1),
+    }
+
+    # When
+    encoded = codec.dumps(obj)
+
+    # Then
+    assert isinstance(encoded, str)
+    assert jsoncodec.StdlibCodec().loads(encoded) == {
+        "id": "c0a8a4e8-6d3b-4a4e-8f3a-2b9f1b1e9c10",
+        "created_at": "2021-05-01T10:30:00+00:00",
+        "day": "2021-05-01",
+    }
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_loads(codec):
+    # When / Then
+    assert codec.loads('{"a": [1, 2.5, null]}') == {"a": [1, 2.5, None]}
+    assert codec.loads(b'{"a": "\xc3\xb1"}') == {"a": "ñ"}
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_loads_malformed(codec):
+    # When / Then
+    with pytest.raises(ValueError):
+        codec.loads(b'{"a": ')
+
+
+# Scenarios for set_codec
+# Scenario 01: parse and the logs of the client use the configured codec
+# Scenario 02: The default codec keeps integers that don't fit in 64 bits
+@responses.activate
+def test_set_codec(caplog):
+    # Given
+    url = "https://url.com"
+    responses.add_callback(url=f"{url}/dummy", method="GET", callback=http_200_callback(body={"attr": "value"}))
+    codec = RecordingCodec()
+    previous = jsoncodec.get_codec()
+    jsoncodec.set_codec(codec)
+
+    try:
+        # When
+        with caplog.at_level("DEBUG", logger="clientapi"):
+            response = ClientAPI(url=url, session=Session()).execute_request("/dummy")
+            obj = parse(response, DummyModel)
+    finally:
+        jsoncodec.set_codec(previous)
+
+    # Then
+    assert obj.attr == "value"
+    assert codec.loaded == 1
+    assert codec.dumped == 2
+
+
+def test_default_codec_big_integers():
+    # Given
+    response = Mock()
+    response.content = b'{"data": {"id": 98765432109876543210987}}'
+
+    # When
+    obj = parse(response, jsonapi.entity(BigIdModel))
+
+    # Then
+    assert obj.data.id == 98765432109876543210987
+
+
+class RecordingCodec(StdlibCodec):
+
+    def __init__(self):
+        self.loaded = 0
+        self.dumped = 0
+
+    def dumps(self, obj):
+        self.dumped += 1
+        return super().dumps(obj)
+
+    def loads(self, data):
+        self.loaded += 1
+        return super().loads(data)
+
+
+class DummyModel(BaseModel):
+    attr: str
+
+
+class BigIdModel(BaseModel):
+    id: int
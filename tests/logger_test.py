@@ -0,0 +1,99 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from clientapi.logger import LazyLogDetail, LogPolicy
+
+
+# Scenarios for LazyLogDetail
+# Scenario 01: Serializes only once and only when formatted
+def test_lazy_log_detail_serializes_on_demand():
+    # Given
+    func = Mock(return_value="detail")
+
+    # When
+    detail = LazyLogDetail(func, "a", "b")
+
+    # Then
+    func.assert_not_called()
+    assert str(detail) == "detail"
+    assert str(detail) == "detail"
+    func.assert_called_once_with("a", "b")
+
+
+# Scenarios for LogPolicy
+# Scenario 01: Header redaction
+# Scenario 02: Body truncation
+# Scenario 03: Response body truncation without full decode
+# Scenario 04: Sampling
+# Scenario 05: Invalid sample rate
+# Scenario 06: Bytes bodies are truncated without a max body length
+def test_log_policy_redacts_headers():
+    # Given
+    policy = LogPolicy()
+    headers = {"authorization": "Bearer token", "SHARED_SECRET": "key", "Accept": "application/json"}
+
+    # When
+    redacted = policy.headers(headers)
+
+    # Then
+    assert redacted == {
+        "authorization": LogPolicy.REDACTED,
+        "SHARED_SECRET": LogPolicy.REDACTED,
+        "Accept": "application/json",
+    }
+
+
+def test_log_policy_truncates_body():
+    # Given
+    policy = LogPolicy(max_body_length=5)
+
+    # When / Then
+    assert policy.body("short") == "short"
+    assert policy.body("a longer body") == "a lon...[truncated, 13 in total]"
+    assert policy.body(b"a longer body") == "a lon...[truncated, 13 in total]"
+    assert policy.body({"form": "data"}) == {"form": "data"}
+
+
+def test_log_policy_truncates_response_body():
+    # Given
+    policy = LogPolicy(max_body_length=4)
+    response = Mock()
+    response.content = "ñandú y más".encode()
+    response.encoding = "utf-8"
+
+    # When
+    body = policy.response_body(response)
+
+    # Then
+    assert body == f"ñan...[truncated, {len(response.content)} in total]"
+
+
+def test_log_policy_sampling():
+    # Given
+    policy = LogPolicy(sample_rate=0.25)
+
+    # When / Then
+    with patch("clientapi.logger.random.random", return_value=0.1):
+        assert policy.sample()
+    with patch("clientapi.logger.random.random", return_value=0.5):
+        assert not policy.sample()
+    assert LogPolicy(sample_rate=1).sample()
+    assert not LogPolicy(sample_rate=0).sample()
+
+
+def test_log_policy_invalid_sample_rate():
+    # When / Then
+    with pytest.raises(ValueError):
+        LogPolicy(sample_rate=2)
+
+
+def test_log_policy_truncates_bytes_body_by_default():
+    # Given
+    policy = LogPolicy()
+    max_length = LogPolicy.DEFAULT_MAX_BYTES_BODY_LENGTH
+
+    # When / Then
+    assert policy.body(b"short") == "short"
+    assert policy.body(b"a" * (max_length + 1)) == f"{'a' * max_length}...[truncated, {max_length + 1} in total]"
+    assert policy.body("a" * (max_length + 1)) == "a" * (max_length + 1)
@@ -0,0 +1,216 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+import responses
+from pydantic import BaseModel
+from requests import Session
+
+from clientapi import APIHTTPError, ClientAPI
+from clientapi.mocks import http_200_callback, http_500_callback
+from clientapi.pagination import (
+    Cursor,
+    LinksNext,
+    Offset,
+    PageNumber,
+    PaginationError,
+    iter_pages,
+)
+
+URL = "https://url.com"
+RESOURCE = "/items"
+
+
+# Scenarios for pagination schemes
+# Scenario 01: links.next with absolute, relative and missing links
+# Scenario 02: Cursor
+# Scenario 03: Page number
+# Scenario 04: Offset
+# Scenario 05: links.next under a base URL with a path
+# Scenario 06: Failed - links.next outside of the base URL
+# Scenario 07: Page number and offset only stopping on empty pages
+def test_links_next():
+    # Given
+    pagination = LinksNext()
+
+    # When / Then
+    assert pagination.next(URL, RESOURCE, None, _links(f"{URL}/items?page=2"), []) == ("/items?page=2", None)
+    assert pagination.next(URL, RESOURCE, None, _links("/items?page=3"), []) == ("/items?page=3", None)
+    assert pagination.next(URL, RESOURCE, None, _links({"href": "/items?page=4"}), []) == ("/items?page=4", None)
+    assert pagination.next(URL, RESOURCE, None, _links(None), []) is None
+    assert pagination.next(URL, RESOURCE, None, {}, []) is None
+
+
+def test_cursor():
+    # Given
+    pagination = Cursor()
+
+    # When / Then
+    assert pagination.first(RESOURCE, {"a": 1}) == (RESOURCE, {"a": 1})
+    body = {"meta": {"next_cursor": "abc"}}
+    assert pagination.next(URL, RESOURCE, {"a": 1}, body, [1]) == (RESOURCE, {"a": 1, "page[cursor]": "abc"})
+    assert pagination.next(URL, RESOURCE, {"a": 1}, {"meta": {}}, [1]) is None
+
+
+def test_page_number():
+    # Given
+    pagination = PageNumber(size=2)
+
+    # When
+    resource, params = pagination.first(RESOURCE, None)
+
+    # Then
+    assert params == {"page[number]": 1, "page[size]": 2}
+    assert pagination.next(URL, resource, params, {}, [1, 2]) == (RESOURCE, {"page[number]": 2, "page[size]": 2})
+    assert pagination.next(URL, resource, params, {}, [1]) is None
+
+
+def test_offset():
+    # Given
+    pagination = Offset(limit=2)
+
+    # When
+    resource, params = pagination.first(RESOURCE, None)
+
+    # Then
+    assert params == {"page[offset]": 0, "page[limit]": 2}
+    assert pagination.next(URL, resource, params, {}, [1, 2]) == (RESOURCE, {"page[offset]": 2, "page[limit]": 2})
+    assert pagination.next(URL, resource, params, {}, []) is None
+
+
+def test_links_next_base_path():
+    # Given
+    pagination = LinksNext()
+    base_url = "https://url.com/v1"
+
+    def next_resource(link):
+        return pagination.next(base_url, "/items?page=1", None, _links(link), [])[0]
+
+    # When / Then
+    assert next_resource("https://url.com/v1/items?page=2") == "/items?page=2"
+    assert next_resource("http://URL.com/v1/items?page=2") == "/items?page=2"
+    assert next_resource("/v1/items?page=2") == "/items?page=2"
+    assert next_resource("items?page=2") == "/items?page=2"
+    assert next_resource("?page=2") == "/items?page=2"
+
+
+@pytest.mark.parametrize("link", ["https://other.com/v1/items?page=2", "/v10/items?page=2", "/items?page=2"])
+def test_links_next_outside_base_url(link):
+    # When / Then
+    with pytest.raises(PaginationError):
+        LinksNext().next("https://url.com/v1", "/items", None, _links(link), [])
+
+
+def test_short_pages():
+    # Given
+    page_number = PageNumber(size=100, stop_on_short_page=False)
+    offset = Offset(limit=100, stop_on_short_page=False)
+    _, page_params = page_number.first(RESOURCE, None)
+    _, offset_params = offset.first(RESOURCE, None)
+
+    # When / Then
+    assert page_number.next(URL, RESOURCE, page_params, {}, [1, 2])[1]["page[number]"] == 2
+    assert page_number.next(URL, RESOURCE, page_params, {}, []) is None
+    assert offset.next(URL, RESOURCE, offset_params, {}, [1, 2])[1]["page[offset]"] == 2
+    assert offset.next(URL, RESOURCE, offset_params, {}, []) is None
+
+
+# Scenarios for iter_pages
+# Scenario 01: Next page is fetched while the current one is processed
+# Scenario 02: Stops fetching when the caller stops consuming
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_iter_pages(prefetch):
+    # Given
+    pages = {1: [1, 2], 2: [3, 4], 3: [5]}
+    fetched = []
+
+    def fetch_page(_, params):
+        fetched.append(params["page[number]"])
+        return {}, pages[params["page[number]"]]
+
+    # When
+    items = list(iter_pages(fetch_page, PageNumber(size=2, size_param=None), URL, RESOURCE, prefetch=prefetch))
+
+    # Then
+    assert items == [1, 2, 3, 4, 5]
+    assert fetched == [1, 2, 3]
+
+
+def test_iter_pages_prefetches_next_page():
+    # Given
+    second_page_fetched = threading.Event()
+
+    def fetch_page(_, params):
+        if params["page[number]"] == 2:
+            second_page_fetched.set()
+        return {}, [params["page[number]"]] if params["page[number]"] <= 2 else []
+
+    items = iter_pages(fetch_page, PageNumber(size=1, size_param=None), URL, RESOURCE, prefetch=1)
+
+    # When
+    first = next(items)
+
+    # Then
+    assert first == 1
+    assert second_page_fetched.wait(timeout=5)
+    assert list(items) == [2]
+
+
+# Scenarios for ClientAPI.paginate
+# Scenario 01: Success - Follows links.next
+# Scenario 02: Failed - Page error is raised to the caller
+@responses.activate
+def test_client_paginate():
+    # Given
+    responses.add_callback(
+        url=f"{URL}{RESOURCE}?filter=x",
+        method="GET",
+        callback=http_200_callback(body=_page([1, 2], f"{URL}{RESOURCE}?filter=x&page=2")),
+        match_querystring=True,
+    )
+    responses.add_callback(
+        url=f"{URL}{RESOURCE}?filter=x&page=2",
+        method="GET",
+        callback=http_200_callback(body=_page([3], None)),
+        match_querystring=True,
+    )
+
+    api = ClientAPI(url=URL, session=Session(), log_requests=False)
+
+    # When
+    items = list(api.paginate(RESOURCE, Item, params={"filter": "x"}))
+
+    # Then
+    assert [item.id for item in items] == [1, 2, 3]
+
+
+@responses.activate
+def test_client_paginate_error():
+    # Given
+    responses.add_callback(
+        url=f"{URL}{RESOURCE}",
+        method="GET",
+        callback=http_200_callback(body=_page([1], f"{URL}/broken")),
+    )
+    responses.add_callback(url=f"{URL}/broken", method="GET", callback=http_500_callback())
+
+    api = ClientAPI(url=URL, session=Session(), log_requests=False)
+    items = api.paginate(RESOURCE, Item)
+
+    # When / Then
+    assert next(items).id == 1
+    with pytest.raises(APIHTTPError) as ex_info:
+        next(items)
+    assert ex_info.value.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+class Item(BaseModel):
+    id: int
+
+
+def _links(next_link):
+    return {"links": {"next": next_link}}
+
+
+def _page(ids, next_link):
+    return {"data": [{"id": id_} for id_ in ids], **_links(next_link)}
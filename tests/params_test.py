@@ -0,0 +1,22 @@
+from clientapi.params import include, sparse_fieldsets
+
+# Scenarios for sparse_fieldsets
+# Scenario 01: One parameter by type
+
+
+def test_sparse_fieldsets():
+    # When
+    params = sparse_fieldsets({"employees": ["name", "email"], "departments": ("id", "name")})
+
+    # Then
+    assert params == {"fields[employees]": "name,email", "fields[departments]": "id,name"}
+
+
+# Scenarios for include
+# Scenario 01: Comma separated relationship paths
+def test_include():
+    # When
+    params = include("department", "manager.department")
+
+    # Then
+    assert params == {"include": "department,manager.department"}
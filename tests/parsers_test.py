@@ -1,10 +1,16 @@
 import json
+from typing import Dict, List, Optional, Tuple, Union
 from unittest.mock import Mock
 
 import pytest
-from pydantic import BaseModel
+import responses
+from pydantic import BaseModel, Field
+from requests import Session
 
-from clientapi import APIValidationError, parse
+from clientapi import APIValidationError, ClientAPI, parse, parse_stream
+from clientapi import responses as jsonapi
+from clientapi.mocks import http_200_callback
+from clientapi.parsers import ParsePolicy, _JsonStream, construct, project
 
 # Scenarios for parse
 # Scenario 01: Success
@@ -41,5 +47,282 @@ def test_parse_validation_error():
         _ = parse(response, DummyModel)
 
 
+# Scenarios for parse_stream
+# Scenario 01: Success - Items are parsed one by one regardless of chunk boundaries
+# Scenario 02: Success - Streamed through ClientAPI
+# Scenario 03: Validation Error in an item
+# Scenario 04: Malformed JSON
+# Scenario 05: Data that is not an array
+# Scenario 06: Other top level values are skipped without keeping them in memory
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 4096])
+def test_parse_stream_success(chunk_size):
+    # Given
+    meta = {"total": 3, "nested": [{"tricky": "]}\\\"{["}]}
+    data = [{"attribute": 1}, {"attribute": 22}, {"attribute": 333}]
+    body = {"meta": meta, "count": 12345, "data": data, "links": {"next": None, "escaped": "\\"}}
+
+    response = Mock()
+    response.iter_content = _chunked(json.dumps(body).encode())
+
+    # When
+    items = list(parse_stream(response, DummyModel, chunk_size=chunk_size))
+
+    # Then
+    assert [item.attribute for item in items] == [1, 22, 333]
+    response.close.assert_called_once()
+
+
+@responses.activate
+def test_parse_stream_from_client():
+    # Given
+    url = "https://url.com"
+    resource = "/items"
+    body = {"data": [{"attribute": i} for i in range(1000)]}
+    responses.add_callback(url=f"{url}{resource}", method="GET", callback=http_200_callback(body=body))
+
+    api = ClientAPI(url=url, session=Session())
+
+    # When
+    response = api.execute_request(resource=resource, stream=True)
+    items = parse_stream(response, DummyModel, chunk_size=128)
+
+    # Then
+    assert next(items).attribute == 0
+    assert [item.attribute for item in items] == list(range(1, 1000))
+
+
+def test_parse_stream_validation_error():
+    # Given
+    response = Mock()
+    response.iter_content = _chunked(json.dumps({"data": [{"attribute": 1}, {"not_the": "schema"}]}).encode())
+
+    # When
+    items = parse_stream(response, DummyModel)
+
+    # Then
+    assert next(items).attribute == 1
+    with pytest.raises(APIValidationError):
+        next(items)
+
+
+def test_parse_stream_malformed_json():
+    # Given
+    response = Mock()
+    response.iter_content = _chunked(b'{"data": [{"attribute": 1} {"attribute": 2}]}')
+
+    # When / Then
+    with pytest.raises(APIValidationError) as ex_info:
+        list(parse_stream(response, DummyModel))
+    assert ex_info.value.source[0]["type"] == "value_error.jsondecode"
+
+
+# Scenarios for trusted parsing
+# Scenario 01: Nested models are built without validation
+# Scenario 02: Sampled documents are validated
+# Scenario 03: Documents that are not objects are validated
+# Scenario 04: Client parse policy
+# Scenario 05: Nested models are built through nested containers
+def test_construct():
+    # Given
+    owner, items, by_key = {"attribute": 1}, [{"attribute": 2}, {"attribute": 3}], {"a": {"attribute": 4}}
+    obj = {"id": "1", "ownerModel": owner, "items": items, "by_key": by_key, "extra_field": True}
+
+    # When
+    parsed = construct(NestedModel, obj)
+
+    # Then
+    assert parsed.id == "1"  # Not coerced
+    assert parsed.owner == DummyModel(attribute=1)
+    assert parsed.items == [DummyModel(attribute=2), DummyModel(attribute=3)]
+    assert parsed.by_key == {"a": DummyModel(attribute=4)}
+    assert parsed.parent is None
+    assert parsed.tags == []
+    assert parsed.__fields_set__ == {"id", "owner", "items", "by_key"}
+
+
+def test_construct_nested_containers():
+    # Given
+    groups = {"a": [{"attribute": 1}], "b": []}
+    matrix = [[{"attribute": 2}], [{"attribute": 3}, {"attribute": 4}]]
+    pair = [{"attribute": 5}, {"attribute": 6}]
+    obj = {"groups": groups, "matrix": matrix, "pair": pair, "either": {"attribute": 7}, "numbers": [[1, 2]]}
+
+    # When
+    parsed = construct(ContainersModel, obj)
+
+    # Then
+    assert parsed.groups["a"][0].attribute == 1
+    assert [[item.attribute for item in row] for row in parsed.matrix] == [[2], [3, 4]]
+    assert [item.attribute for item in parsed.pair] == [5, 6]
+    assert parsed.either == {"attribute": 7}  # Unions are not built
+    assert parsed.numbers is obj["numbers"]
+
+
+def test_parse_trusted_skips_validation():
+    # Given
+    response = Mock()
+    response.content = json.dumps({"data": [{"not_the": "schema"}]}).encode()
+
+    # When
+    parsed = parse(response, jsonapi.collection(DummyModel), policy=ParsePolicy(trusted=True))
+
+    # Then
+    assert len(parsed.data) == 1
+    assert isinstance(parsed.data[0], DummyModel)
+
+
+def test_parse_trusted_sampled_validation():
+    # Given
+    response = Mock()
+    response.content = json.dumps({"not_the": "schema"}).encode()
+
+    # When / Then
+    with pytest.raises(APIValidationError):
+        parse(response, DummyModel, policy=ParsePolicy(trusted=True, validation_rate=1))
+
+
+def test_parse_trusted_not_an_object():
+    # Given
+    response = Mock()
+    response.content = b"[1, 2]"
+
+    # When / Then
+    with pytest.raises(APIValidationError):
+        parse(response, DummyModel, policy=ParsePolicy(trusted=True))
+
+
+@responses.activate
+def test_client_parse_policy():
+    # Given
+    url = "https://url.com"
+    responses.add_callback(url=f"{url}/dummy", method="GET", callback=http_200_callback(body={"attribute": "x"}))
+    trusted = ClientAPI(url=url, session=Session(), log_requests=False, parse_policy=ParsePolicy(trusted=True))
+    validated = ClientAPI(url=url, session=Session(), log_requests=False)
+
+    # When
+    parsed = trusted.parse(trusted.execute_request("/dummy"), DummyModel)
+
+    # Then
+    assert parsed.attribute == "x"
+    with pytest.raises(APIValidationError):
+        validated.parse(validated.execute_request("/dummy"), DummyModel)
+
+
+# Scenarios for projections
+# Scenario 01: Only the given paths are kept, through lists
+# Scenario 02: A path to an object keeps the whole object
+# Scenario 03: parse validates the projected document only
+# Scenario 04: parse_stream projects every item
+def test_project():
+    # Given
+    obj = {"data": [{"id": 1, "attributes": {"name": "a", "age": 2}}, {"id": 2}], "meta": {"total": 2}}
+
+    # When
+    projected = project(obj, ["data.id", "data.attributes.name", "missing.path"])
+
+    # Then
+    assert projected == {"data": [{"id": 1, "attributes": {"name": "a"}}, {"id": 2}]}
+
+
+def test_project_whole_object():
+    # Given
+    obj = {"data": {"id": 1, "attributes": {"name": "a", "age": 2}}}
+
+    expected = {"data": {"attributes": {"name": "a", "age": 2}}}
+
+    # When / Then
+    assert project(obj, ["data.attributes.name", "data.attributes"]) == expected
+    assert project(obj, ["data.attributes", "data.attributes.name"]) == expected
+
+
+def test_parse_fields():
+    # Given
+    response = Mock()
+    response.content = json.dumps({"attribute": 1, "other": {"invalid": "for", "the": "model"}}).encode()
+
+    # When
+    parsed = parse(response, ProjectionModel, fields=["attribute"])
+
+    # Then
+    assert parsed.attribute == 1
+    assert parsed.other is None
+
+
+def test_parse_stream_fields():
+    # Given
+    response = Mock()
+    response.iter_content = _chunked(b'{"data": [{"attribute": 1, "other": {"a": 1}}, {"attribute": 2}]}')
+
+    # When
+    items = list(parse_stream(response, ProjectionModel, fields=["attribute"]))
+
+    # Then
+    assert [(item.attribute, item.other) for item in items] == [(1, None), (2, None)]
+
+
+@pytest.mark.parametrize("data", [{"attribute": 1}, None, "items"])
+def test_parse_stream_data_not_an_array(data):
+    # Given
+    response = Mock()
+    response.iter_content = _chunked(json.dumps({"data": data}).encode())
+
+    # When / Then
+    with pytest.raises(APIValidationError) as ex_info:
+        list(parse_stream(response, DummyModel))
+    assert "Expecting an array under 'data'" in ex_info.value.source[0]["msg"]
+
+
+def test_parse_stream_skips_other_values():
+    # Given
+    included = [{"id": str(i), "name": "x" * 100, "tricky": "\\\"]}"} for i in range(20000)]
+    content = json.dumps({"included": included, "data": [{"attribute": 1}]}).encode()
+    buffer_sizes = []
+
+    def chunks():
+        for i in range(0, len(content), 4096):
+            buffer_sizes.append(len(stream._buffer))  # pylint: disable=protected-access
+            yield content[i:i + 4096]
+
+    stream = _JsonStream(chunks())
+
+    # When
+    items = list(stream.iter_items("data"))
+
+    # Then
+    assert items == [{"attribute": 1}]
+    assert len(content) > 2 * _JsonStream._COMPACT_THRESHOLD  # pylint: disable=protected-access
+    assert max(buffer_sizes) < _JsonStream._COMPACT_THRESHOLD + 2 * 4096  # pylint: disable=protected-access
+
+
+def _chunked(content):
+
+    def iter_content(chunk_size):
+        return (content[i:i + chunk_size] for i in range(0, len(content), chunk_size))
+
+    return iter_content
+
+
 class DummyModel(BaseModel):
     attribute: int
+
+
+class NestedModel(BaseModel):
+    id: int
+    owner: DummyModel = Field(..., alias="ownerModel")
+    parent: Optional[DummyModel]
+    items: List[DummyModel]
+    by_key: Dict[str, DummyModel]
+    tags: List[str] = []
+
+
+class ContainersModel(BaseModel):
+    groups: Dict[str, List[DummyModel]]
+    matrix: List[List[DummyModel]]
+    pair: Tuple[DummyModel, DummyModel]
+    either: Union[DummyModel, int]
+    numbers: List[List[int]]
+
+
+class ProjectionModel(BaseModel):
+    attribute: int
+    other: Optional[DummyModel]
@@ -0,0 +1,200 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import httpx
+import pytest
+import responses
+from requests import Session
+
+from clientapi import ClientAPI
+from clientapi.aio import AsyncClientAPI
+from clientapi.mocks import http_200_callback
+from clientapi.ratelimit import RateLimiter, RateLimitExceeded, TokenBucket
+
+
+# Scenarios for TokenBucket
+# Scenario 01: Burst up to capacity and refill over time
+# Scenario 02: Blocking acquire waits for the refill
+# Scenario 03: Failed - Non blocking acquire fails fast
+# Scenario 04: Failed - Blocking acquire with timeout
+# Scenario 05: Thread safety
+# Scenario 06: Async acquire
+# Scenario 07: Invalid rate and capacity
+# Scenario 08: Rates under one token per second
+def test_token_bucket_burst_and_refill():
+    # Given
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+
+    # When / Then
+    assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.try_acquire() == 0.5
+
+    clock.now += 0.5
+    assert bucket.try_acquire() == 0
+
+    clock.now += 100
+    assert [bucket.try_acquire() for _ in range(4)] == [0, 0, 0, 0.5]
+
+
+def test_token_bucket_blocking_acquire():
+    # Given
+    clock = FakeClock()
+    bucket = TokenBucket(rate=4, capacity=1, clock=clock)
+    bucket.acquire()
+
+    # When
+    bucket.acquire(sleep=clock.sleep)
+
+    # Then
+    assert clock.slept == [0.25]
+
+
+def test_token_bucket_non_blocking_acquire():
+    # Given
+    bucket = TokenBucket(rate=1, clock=FakeClock())
+    bucket.acquire()
+
+    # When / Then
+    with pytest.raises(RateLimitExceeded) as ex_info:
+        bucket.acquire(block=False)
+    assert ex_info.value.code == "rate_limit_exceeded"
+    assert ex_info.value.source == {"retry_after": 1}
+
+
+def test_token_bucket_acquire_timeout():
+    # Given
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, clock=clock)
+    bucket.acquire()
+
+    # When / Then
+    with pytest.raises(RateLimitExceeded):
+        bucket.acquire(timeout=0.5, sleep=clock.sleep)
+    assert clock.slept == []
+
+
+def test_token_bucket_thread_safety():
+    # Given
+    bucket = TokenBucket(rate=0.001, capacity=100)
+
+    # When
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(lambda _: bucket.try_acquire(), range(200)))
+
+    # Then
+    assert results.count(0) == 100
+
+
+def test_token_bucket_async_acquire():
+    # Given
+    bucket = TokenBucket(rate=100, capacity=1)
+
+    async def acquire_twice():
+        await bucket.acquire_async()
+        await bucket.acquire_async()
+
+    # When / Then
+    asyncio.run(acquire_twice())
+
+
+def test_token_bucket_invalid_rate():
+    # When / Then
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, capacity=0.5)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, capacity=2).acquire(tokens=3)
+
+
+def test_token_bucket_slow_rate():
+    # Given
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0.5, clock=clock)
+
+    # When
+    bucket.acquire(sleep=clock.sleep)
+    bucket.acquire(sleep=clock.sleep)
+
+    # Then
+    assert bucket.capacity == 1
+    assert clock.slept == [2]
+
+
+# Scenarios for RateLimiter
+# Scenario 01: Buckets per base url, per method and overrides
+# Scenario 02: Failed - ClientAPI fails fast before sending the request
+# Scenario 03: Failed - AsyncClientAPI fails fast before sending the request
+def test_rate_limiter_buckets():
+    # Given
+    limiter = RateLimiter(rate=10, limits={"https://slow.com": (1, 2), ("https://url.com", "POST"): (5, 5)})
+
+    # When
+    get_bucket = limiter.bucket("https://url.com", "GET")
+    post_bucket = limiter.bucket("https://url.com", "post")
+    slow_bucket = limiter.bucket("https://slow.com", "GET")
+
+    # Then
+    assert get_bucket is limiter.bucket("https://url.com", "DELETE")
+    assert (get_bucket.rate, get_bucket.capacity) == (10, 10)
+    assert (post_bucket.rate, post_bucket.capacity) == (5, 5)
+    assert (slow_bucket.rate, slow_bucket.capacity) == (1, 2)
+    assert slow_bucket is limiter.bucket("https://slow.com", "POST")
+
+    per_method = RateLimiter(rate=10, per_method=True)
+    assert per_method.bucket("https://url.com", "GET") is not per_method.bucket("https://url.com", "POST")
+
+
+@responses.activate
+def test_client_fails_fast_when_rate_limited():
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    responses.add_callback(url=f"{url}{resource}", method="GET", callback=http_200_callback(body={}))
+
+    limiter = RateLimiter(rate=0.001, capacity=1, block=False)
+    api = ClientAPI(url=url, session=Session(), rate_limiter=limiter)
+    api.execute_request(resource=resource)
+
+    # When / Then
+    with pytest.raises(RateLimitExceeded):
+        api.execute_request(resource=resource)
+    assert len(responses.calls) == 1
+
+
+def test_async_client_fails_fast_when_rate_limited():
+    # Given
+    url = "https://url.com"
+    calls = []
+    limiter = RateLimiter(rate=0.001, capacity=1, block=False)
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(HTTPStatus.OK, json={})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as session:
+            api = AsyncClientAPI(session=session, url=url, rate_limiter=limiter)
+            await api.execute_request(resource="/hello")
+            await api.execute_request(resource="/hello")
+
+    # When / Then
+    with pytest.raises(RateLimitExceeded):
+        asyncio.run(run())
+    assert len(calls) == 1
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
@@ -1,10 +1,20 @@
+from typing import Dict, Optional
+
+import pytest
 from pydantic import BaseModel
 
-from clientapi import responses
+from clientapi import APIValidationError, responses
+from clientapi.parsers import ParsePolicy
+from clientapi.responses import Relationship
 
 # Scenarios for responses
 # Scenario 01: entity
 # Scenario 02: collection
+# Scenario 03: Wrappers are built once per model
+# Scenario 04: Wrappers of different models have different names
+# Scenario 05: Relationships resolved with the included resources
+# Scenario 06: Resolved resources are memoized
+# Scenario 07: Included resources are built with the policy of the document
 
 
 def test_entity():
@@ -29,5 +39,117 @@ def test_collection():
     assert parsed.data[0].some_attr == "some_value"
 
 
+def test_wrappers_are_memoized():
+    # When / Then
+    assert responses.entity(MyDummyModel) is responses.entity(MyDummyModel)
+    assert responses.collection(MyDummyModel) is responses.collection(MyDummyModel)
+    assert responses.entity(MyDummyModel) is not responses.collection(MyDummyModel)
+
+
+def test_wrapper_names():
+    # When
+    entity = responses.entity(MyDummyModel)
+    collection = responses.collection(MyDummyModel)
+    other = responses.entity(MyOtherDummyModel)
+    optional = responses.entity(Optional[MyDummyModel])
+    other_optional = responses.entity(Optional[MyOtherDummyModel])
+
+    # Then
+    assert entity.__name__ == "JsonAPIEntityResponse[tests.responses_test.MyDummyModel]"
+    assert collection.__name__ == "JsonAPICollectionResponse[tests.responses_test.MyDummyModel]"
+    assert other.__name__ != entity.__name__
+    assert optional.__name__ == "JsonAPIEntityResponse[typing.Optional[tests.responses_test.MyDummyModel]]"
+    assert other_optional.__name__ != optional.__name__
+
+
+def test_included_relationships():
+    # Given
+    model = responses.collection(Employee, included={"departments": Department})
+
+    # When
+    document = model.parse_obj(_compound_document())
+
+    # Then
+    first, second = document.data
+    assert document.related(first, "department") == Department(id="10", type="departments", name="Sales")
+    assert document.related(second, "department") is None
+    assert document.related(first, "manager") is None
+    assert document.related(second, "manager") == {"id": "2", "type": "people"}
+    assert [department.name for department in document.related(first, "teams")] == ["Sales", "Ops"]
+    assert document.resolve("departments", 10).name == "Sales"
+    assert document.resolve("departments", "12") is None
+    assert responses.collection(Employee, included={"departments": Department}) is model
+    assert responses.collection(Employee) is not model
+
+
+def test_included_resources_are_memoized():
+    # Given
+    document = responses.collection(Employee, included={"departments": Department}).parse_obj(_compound_document())
+
+    # When
+    department = document.related(document.data[0], "department")
+
+    # Then
+    assert document.related(document.data[0], "department") is department
+    assert document.related(document.data[0], "teams")[0] is department
+
+
+def test_included_resources_policy():
+    # Given
+    model = responses.collection(Employee, included={"departments": Department})
+    document = {**_compound_document(), "included": [{"id": "10", "type": "departments", "name": None}]}
+
+    # When
+    trusted = ParsePolicy(trusted=True).build(model, document)
+    validated = ParsePolicy().build(model, document)
+
+    # Then
+    assert trusted.related(trusted.data[0], "department").name is None
+    with pytest.raises(APIValidationError) as ex_info:
+        validated.related(validated.data[0], "department")
+    assert ex_info.value.source[0]["loc"] == ("name",)
+
+
+class Department(BaseModel):
+    id: str
+    type: str
+    name: str
+
+
+class Employee(BaseModel):
+    id: str
+    type: str
+    relationships: Optional[Dict[str, Relationship]]
+
+
 class MyDummyModel(BaseModel):
     some_attr: str
+
+
+class MyOtherDummyModel(BaseModel):
+    other_attr: int
+
+
+def _compound_document():
+    sales = {"id": "10", "type": "departments", "name": "Sales"}
+    ops = {"id": "11", "type": "departments", "name": "Ops"}
+    manager = {"id": "2", "type": "people"}
+    first = _employee("1", department=_to_one(sales), teams=_to_many(sales, ops))
+    second = _employee("2", department=_to_one(None), manager=_to_one(manager))
+    return {"data": [first, second], "included": [sales, ops, manager]}
+
+
+def _employee(id_, **relationships):
+    return {"id": id_, "type": "employees", "relationships": relationships}
+
+
+def _to_one(resource):
+    return {"data": _identifier(resource) if resource else None}
+
+
+def _to_many(*resources):
+    return {"data": [_identifier(resource) for resource in resources]}
+
+
+def _identifier(resource):
+    return {"id": resource["id"], "type": resource["type"]}
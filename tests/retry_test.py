@@ -0,0 +1,241 @@
+import io
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http import HTTPStatus
+from unittest.mock import Mock, patch
+
+import pytest
+import responses
+from requests import ConnectionError as RequestsConnectionError
+from requests import Session
+
+from clientapi import APIHTTPError, ClientAPI
+from clientapi.mocks import (
+    http_200_callback,
+    http_429_callback,
+    http_503_callback,
+)
+from clientapi.retry import RetryPolicy, get_retry_after
+
+
+# Scenarios for RetryPolicy
+# Scenario 01: Retryable statuses, methods and errors
+# Scenario 02: Exponential backoff with full jitter
+# Scenario 03: Retry-After in seconds and as HTTP date
+# Scenario 04: Max attempts and total timeout
+# Scenario 05: Invalid max attempts
+# Scenario 06: Gives up when Retry-After is over the max
+def test_retry_policy_is_retryable():
+    # Given
+    policy = RetryPolicy()
+
+    # When / Then
+    assert policy.is_retryable("GET", response=_response(HTTPStatus.SERVICE_UNAVAILABLE))
+    assert policy.is_retryable("put", response=_response(HTTPStatus.TOO_MANY_REQUESTS))
+    assert policy.is_retryable("GET", error=RequestsConnectionError())
+    assert not policy.is_retryable("GET", response=_response(HTTPStatus.NOT_FOUND))
+    assert not policy.is_retryable("GET", error=ValueError())
+    assert not policy.is_retryable("POST", response=_response(HTTPStatus.SERVICE_UNAVAILABLE))
+    assert RetryPolicy(methods=["POST"]).is_retryable("POST", response=_response(HTTPStatus.SERVICE_UNAVAILABLE))
+
+
+def test_retry_policy_backoff():
+    # Given
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+
+    # When / Then
+    with patch("clientapi.retry.random.uniform", side_effect=lambda low, high: high) as uniform:
+        assert policy.get_delay(1) == 1
+        assert policy.get_delay(2) == 2
+        assert policy.get_delay(3) == 4
+        assert policy.get_delay(10) == 5
+    assert all(call.args[0] == 0 for call in uniform.call_args_list)
+
+
+def test_retry_policy_retry_after():
+    # Given
+    policy = RetryPolicy()
+    future = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+    # When / Then
+    assert policy.get_delay(1, _response(HTTPStatus.TOO_MANY_REQUESTS, {"Retry-After": "7"})) == 7
+    assert 25 < get_retry_after(_response(HTTPStatus.TOO_MANY_REQUESTS, {"Retry-After": format_datetime(future)})) <= 30
+    assert get_retry_after(_response(HTTPStatus.TOO_MANY_REQUESTS, {"Retry-After": "not a date"})) is None
+    assert get_retry_after(_response(HTTPStatus.TOO_MANY_REQUESTS)) is None
+
+
+def test_retry_policy_limits():
+    # Given
+    policy = RetryPolicy(max_attempts=2, total_timeout=5)
+    response = _response(HTTPStatus.SERVICE_UNAVAILABLE, {"Retry-After": "1"})
+    slow_response = _response(HTTPStatus.SERVICE_UNAVAILABLE, {"Retry-After": "10"})
+
+    # When / Then
+    with patch("clientapi.retry.time.monotonic", return_value=100):
+        assert policy.next_delay("GET", 1, started_at=100, response=response) == 1
+        assert policy.next_delay("GET", 2, started_at=100, response=response) is None
+        assert policy.next_delay("GET", 1, started_at=100, response=slow_response) is None
+
+
+def test_retry_policy_invalid_max_attempts():
+    # When / Then
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+def test_retry_policy_max_retry_after():
+    # Given
+    policy = RetryPolicy(max_retry_after=60)
+    response = _response(HTTPStatus.SERVICE_UNAVAILABLE, {"Retry-After": "60"})
+    day_response = _response(HTTPStatus.SERVICE_UNAVAILABLE, {"Retry-After": "86400"})
+
+    # When / Then
+    assert policy.next_delay("GET", 1, started_at=time.monotonic(), response=response) == 60
+    assert policy.next_delay("GET", 1, started_at=time.monotonic(), response=day_response) is None
+    assert RetryPolicy(max_retry_after=None).get_delay(1, day_response) == 86400
+
+
+# Scenarios for ClientAPI with a RetryPolicy
+# Scenario 01: Success after retrying 429 and 503
+# Scenario 02: Failed - Gives up after max attempts
+# Scenario 03: Failed - Non idempotent methods are not retried
+# Scenario 04: Success after a connection error
+# Scenario 05: Success - File uploads are rewound before retrying
+# Scenario 06: Failed - Iterator uploads are not retried, they are consumed by the first attempt
+@responses.activate
+def test_client_retries_until_success(caplog):
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    body = {"attribute": 1234}
+    responses.add_callback(
+        url=f"{url}{resource}",
+        method="GET",
+        callback=http_429_callback(headers={"Retry-After": "2"}),
+    )
+    responses.add_callback(url=f"{url}{resource}", method="GET", callback=http_503_callback())
+    responses.add_callback(url=f"{url}{resource}", method="GET", callback=http_200_callback(body=body))
+
+    logging.getLogger("clientapi").setLevel(logging.INFO)
+
+    sleep = Mock()
+    api = ClientAPI(url=url, session=Session(), retry=RetryPolicy(backoff_factor=0, sleep=sleep))
+
+    # When
+    response = api.execute_request(resource=resource)
+
+    # Then
+    assert json.loads(response.content) == body
+    assert [call.args[0] for call in sleep.call_args_list] == [2, 0]
+    retry_logs = [record.message for record in caplog.records if record.message.startswith("Retry: ")]
+    assert len(retry_logs) == 2
+    first_retry = json.loads(retry_logs[0][len("Retry: "):])
+    assert first_retry["attempt"] == 1
+    assert first_retry["status_code"] == HTTPStatus.TOO_MANY_REQUESTS
+    assert first_retry["delay_ms"] == 2000
+
+
+@responses.activate
+def test_client_retries_give_up():
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    for _ in range(3):
+        responses.add_callback(url=f"{url}{resource}", method="GET", callback=http_503_callback())
+
+    sleep = Mock()
+    api = ClientAPI(url=url, session=Session(), retry=RetryPolicy(max_attempts=3, sleep=sleep))
+
+    # When
+    with pytest.raises(APIHTTPError) as ex_info:
+        api.execute_request(resource=resource)
+
+    # Then
+    assert ex_info.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert sleep.call_count == 2
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_client_does_not_retry_non_idempotent_methods():
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    responses.add_callback(url=f"{url}{resource}", method="POST", callback=http_503_callback())
+
+    sleep = Mock()
+    api = ClientAPI(url=url, session=Session(), retry=RetryPolicy(sleep=sleep))
+
+    # When
+    with pytest.raises(APIHTTPError):
+        api.execute_request(resource=resource, method="POST", data="{}")
+
+    # Then
+    sleep.assert_not_called()
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_client_retries_connection_errors():
+    # Given
+    url = "https://url.com"
+    resource = "/hello"
+    responses.add(url=f"{url}{resource}", method="GET", body=RequestsConnectionError("boom"))
+    responses.add_callback(url=f"{url}{resource}", method="GET", callback=http_200_callback(body={}))
+
+    api = ClientAPI(url=url, session=Session(), retry=RetryPolicy(sleep=Mock()))
+
+    # When
+    response = api.execute_request(resource=resource)
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+
+
+@responses.activate
+def test_client_retries_rewind_file_uploads():
+    # Given
+    url = "https://url.com"
+    resource = "/import"
+    responses.add_callback(url=f"{url}{resource}", method="PUT", callback=http_503_callback())
+    responses.add_callback(url=f"{url}{resource}", method="PUT", callback=http_200_callback(body={}))
+
+    upload = io.BytesIO(b"header\nrow 1\nrow 2\n")
+    upload.readline()
+    api = ClientAPI(url=url, session=Session(), retry=RetryPolicy(sleep=Mock()))
+
+    # When
+    response = api.execute_request(resource=resource, method="PUT", data=upload)
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+    assert [call.request.body for call in responses.calls] == [b"row 1\nrow 2\n", b"row 1\nrow 2\n"]
+
+
+@responses.activate
+def test_client_does_not_retry_iterator_uploads():
+    # Given
+    url = "https://url.com"
+    resource = "/import"
+    responses.add_callback(url=f"{url}{resource}", method="PUT", callback=http_503_callback())
+
+    sleep = Mock()
+    api = ClientAPI(url=url, session=Session(), retry=RetryPolicy(sleep=sleep))
+
+    # When
+    with pytest.raises(APIHTTPError):
+        api.execute_request(resource=resource, method="PUT", data=(row for row in [b"row 1\n", b"row 2\n"]))
+
+    # Then
+    sleep.assert_not_called()
+    assert len(responses.calls) == 1
+
+
+def _response(status_code, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
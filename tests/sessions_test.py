@@ -1,4 +1,5 @@
 from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
 
 from requests import Session
 from requests.auth import AuthBase, HTTPBasicAuth
@@ -12,6 +13,12 @@ from clientapi.auth import Bearer, SharedSecret
 # Scenario 02: bearer
 # Scenario 03: secret key
 # Scenario 04: basic
+# Scenario 05: base
+# Scenario 06: registry reuses sessions by base url and auth
+# Scenario 07: registry is thread safe
+# Scenario 08: registry adapter pool settings
+# Scenario 09: registry close
+# Scenario 10: pooled does not close the session
 def test_sessions_no_auth():
     # When
     with sessions.no_auth() as s:
@@ -78,6 +85,86 @@ def test_sessions_base():
         assert isinstance(s.auth, AuthBase)
 
 
+def test_registry_reuses_sessions():
+    # Given
+    registry = sessions.SessionRegistry()
+    url = "https://url.com"
+
+    # When
+    no_auth = registry.get(url)
+    bearer = registry.get(url, Bearer("token"))
+    same_bearer = registry.get(url, Bearer("token"))
+    other_bearer = registry.get(url, Bearer("other_token"))
+    basic = registry.get(url, HTTPBasicAuth("user", "pass"))
+    same_basic = registry.get(url, HTTPBasicAuth("user", "pass"))
+    other_url = registry.get("https://other.com")
+
+    # Then
+    assert registry.get(url) is no_auth
+    assert bearer is same_bearer
+    assert basic is same_basic
+    assert bearer is not other_bearer
+    assert no_auth is not other_url
+    assert len(registry) == 5
+
+
+def test_registry_is_thread_safe():
+    # Given
+    registry = sessions.SessionRegistry()
+
+    # When
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(lambda _: registry.get("https://url.com", SharedSecret("key")), range(200)))
+
+    # Then
+    assert len({id(session) for session in results}) == 1
+
+
+def test_registry_pool_settings():
+    # Given
+    registry = sessions.SessionRegistry(pool_connections=4, pool_maxsize=32, pool_block=True)
+
+    # When
+    session = registry.get("https://url.com")
+
+    # Then
+    adapter = session.get_adapter("https://url.com")
+    assert adapter._pool_connections == 4  # pylint: disable=protected-access
+    assert adapter._pool_maxsize == 32  # pylint: disable=protected-access
+    assert adapter._pool_block is True  # pylint: disable=protected-access
+
+
+def test_registry_close():
+    # Given
+    registry = sessions.SessionRegistry()
+    session = registry.get("https://url.com")
+    registry.get("https://other.com")
+
+    # When
+    registry.close("https://url.com")
+
+    # Then
+    assert len(registry) == 1
+    assert registry.get("https://url.com") is not session
+
+    # When
+    registry.close_all()
+
+    # Then
+    assert len(registry) == 0
+
+
+def test_sessions_pooled():
+    # When
+    with sessions.pooled("https://url.com", Bearer("token")) as s:
+        pass
+
+    # Then
+    assert isinstance(s.auth, Bearer)
+    with sessions.pooled("https://url.com", Bearer("token")) as other:
+        assert other is s
+
+
 def _get_expected_basic_token(username, password):
     basic_str = f"{username}:{password}"
     return b64encode(basic_str.encode()).decode()
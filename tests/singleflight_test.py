@@ -0,0 +1,168 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+import responses
+from requests import Session
+
+from clientapi import APIHTTPError, ClientAPI
+from clientapi.cache import request_key
+from clientapi.mocks import http_200_callback, http_503_callback
+from clientapi.singleflight import SingleFlight
+
+CONCURRENCY = 8
+
+
+# Scenarios for SingleFlight
+# Scenario 01: Concurrent calls with the same key run once and share the result
+# Scenario 02: Concurrent calls share the error
+# Scenario 03: Calls after the in-flight one finished run again
+def test_single_flight_shares_result():
+    # Given
+    single_flight = SingleFlight()
+    executions = []
+
+    def func():
+        _wait_for_waiters(single_flight, "key")
+        executions.append(1)
+        return {"value": 1}
+
+    # When
+    results = _run_concurrently(lambda: single_flight.do("key", func))
+
+    # Then
+    assert len(executions) == 1
+    assert all(result == {"value": 1} for result in results)
+
+
+def test_single_flight_shares_error():
+    # Given
+    single_flight = SingleFlight()
+
+    def func():
+        _wait_for_waiters(single_flight, "key")
+        raise ValueError("boom")
+
+    def call():
+        with pytest.raises(ValueError):
+            single_flight.do("key", func)
+
+    # When / Then
+    _run_concurrently(call)
+    assert single_flight.in_flight("key") == 0
+
+
+def test_single_flight_runs_again_after_finishing():
+    # Given
+    single_flight = SingleFlight()
+    executions = []
+
+    # When
+    single_flight.do("key", lambda: executions.append(1))
+    single_flight.do("key", lambda: executions.append(1))
+
+    # Then
+    assert len(executions) == 2
+
+
+# Scenarios for ClientAPI with single flight
+# Scenario 01: Concurrent identical GETs share one upstream call
+# Scenario 02: Concurrent identical GETs share the error
+# Scenario 03: Concurrent GETs with different headers are not coalesced
+@responses.activate
+def test_client_coalesces_identical_requests():
+    # Given
+    url = "https://url.com"
+    resource = "/employees/1"
+    api = ClientAPI(url=url, session=Session(), log_requests=False, single_flight=True)
+    callback = http_200_callback(body={"id": 1})
+    single_flight = api._single_flight  # pylint: disable=protected-access
+
+    def gated_callback(request):
+        _wait_for_waiters(single_flight, request_key("GET", f"{url}{resource}"))
+        return callback(request)
+
+    responses.add_callback(url=f"{url}{resource}", method="GET", callback=gated_callback)
+
+    # When
+    results = _run_concurrently(lambda: api.execute_request(resource=resource))
+
+    # Then
+    assert len(responses.calls) == 1
+    assert all(response.json() == {"id": 1} for response in results)
+    assert len({id(response) for response in results}) == CONCURRENCY
+
+
+@responses.activate
+def test_client_coalesced_requests_share_errors():
+    # Given
+    url = "https://url.com"
+    resource = "/employees/1"
+    api = ClientAPI(url=url, session=Session(), log_requests=False, single_flight=True)
+    callback = http_503_callback()
+    single_flight = api._single_flight  # pylint: disable=protected-access
+
+    def gated_callback(request):
+        _wait_for_waiters(single_flight, request_key("GET", f"{url}{resource}"))
+        return callback(request)
+
+    responses.add_callback(url=f"{url}{resource}", method="GET", callback=gated_callback)
+
+    def call():
+        with pytest.raises(APIHTTPError) as ex_info:
+            api.execute_request(resource=resource)
+        return ex_info.value.status_code
+
+    # When
+    results = _run_concurrently(call)
+
+    # Then
+    assert len(responses.calls) == 1
+    assert results == [HTTPStatus.SERVICE_UNAVAILABLE] * CONCURRENCY
+
+
+@responses.activate
+def test_client_does_not_coalesce_different_headers():
+    # Given
+    url = "https://url.com"
+    resource = "/employees/1"
+    api = ClientAPI(url=url, session=Session(), log_requests=False, single_flight=True)
+    both_in_flight = threading.Barrier(2, timeout=5)
+
+    def callback(request):
+        both_in_flight.wait()
+        return http_200_callback(body={"tenant": request.headers["X-Tenant-Id"]})(request)
+
+    responses.add_callback(url=f"{url}{resource}", method="GET", callback=callback)
+
+    # When
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(api.execute_request, resource=resource, headers={"X-Tenant-Id": tenant})
+            for tenant in ("a", "b")
+        ]
+        results = [future.result().json() for future in futures]
+
+    # Then
+    assert len(responses.calls) == 2
+    assert results == [{"tenant": "a"}, {"tenant": "b"}]
+
+
+def _run_concurrently(func):
+    barrier = threading.Barrier(CONCURRENCY)
+
+    def run():
+        barrier.wait()
+        return func()
+
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        futures = [executor.submit(run) for _ in range(CONCURRENCY)]
+        return [future.result() for future in futures]
+
+
+def _wait_for_waiters(single_flight, key, timeout=5):
+    deadline = time.monotonic() + timeout
+    while single_flight.in_flight(key) < CONCURRENCY and time.monotonic() < deadline:
+        time.sleep(0.001)
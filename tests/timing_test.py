@@ -0,0 +1,116 @@
+from unittest.mock import Mock
+
+import responses
+from pydantic import BaseModel
+from requests import Session
+
+from clientapi import ClientAPI, parse
+from clientapi.cache import ResponseCache
+from clientapi.mocks import http_200_callback, http_503_callback
+from clientapi.ratelimit import RateLimiter
+from clientapi.retry import RetryPolicy
+from clientapi.timing import Timing
+
+URL = "https://url.com"
+RESOURCE = "/hello"
+
+
+# Scenarios for Timing
+# Scenario 01: Only the phases that happened are reported
+def test_timing_as_dict():
+    # Given
+    timing = Timing()
+    timing.ttfb_ms = 1.5
+    timing.attempts = 1
+
+    # When / Then
+    assert timing.as_dict() == {"ttfb_ms": 1.5, "attempts": 1, "cached": False}
+    assert repr(timing) == "Timing(ttfb_ms=1.5, attempts=1, cached=False)"
+
+
+# Scenarios for the timing of ClientAPI
+# Scenario 01: Success - Round trip, download and parse phases
+# Scenario 02: Success - Streamed responses have no download phase
+# Scenario 03: Success - Retries and queueing in the rate limiter
+# Scenario 04: Success - Cache hits are not sent
+@responses.activate
+def test_client_timing():
+    # Given
+    responses.add_callback(url=f"{URL}{RESOURCE}", method="GET", callback=http_200_callback(body={"attribute": 1}))
+    api = ClientAPI(url=URL, session=Session(), log_requests=False)
+
+    # When
+    response = api.execute_request(RESOURCE)
+    parse(response, DummyModel)
+
+    # Then
+    timing = response.timing
+    assert timing.attempts == 1
+    assert not timing.cached
+    assert timing.ttfb_ms >= 0
+    assert timing.download_ms >= 0
+    assert timing.decode_ms >= 0
+    assert timing.validation_ms >= 0
+    assert timing.total_ms >= timing.ttfb_ms + timing.download_ms
+    assert timing.queue_ms is None
+    assert timing.retry_ms is None
+
+
+@responses.activate
+def test_client_timing_stream():
+    # Given
+    responses.add_callback(url=f"{URL}{RESOURCE}", method="GET", callback=http_200_callback(body={"attribute": 1}))
+    api = ClientAPI(url=URL, session=Session(), log_requests=False)
+
+    # When
+    response = api.execute_request(RESOURCE, stream=True)
+
+    # Then
+    assert response.timing.ttfb_ms >= 0
+    assert response.timing.download_ms is None
+
+
+@responses.activate
+def test_client_timing_retries():
+    # Given
+    responses.add_callback(url=f"{URL}{RESOURCE}", method="GET", callback=http_503_callback())
+    responses.add_callback(url=f"{URL}{RESOURCE}", method="GET", callback=http_200_callback(body={}))
+    api = ClientAPI(
+        url=URL,
+        session=Session(),
+        log_requests=False,
+        retry=RetryPolicy(sleep=Mock()),
+        rate_limiter=RateLimiter(rate=100),
+    )
+
+    # When
+    response = api.execute_request(RESOURCE)
+
+    # Then
+    assert response.timing.attempts == 2
+    assert response.timing.retry_ms >= 0
+    assert response.timing.queue_ms >= 0
+
+
+@responses.activate
+def test_client_timing_cache_hit():
+    # Given
+    responses.add_callback(
+        url=f"{URL}{RESOURCE}",
+        method="GET",
+        callback=http_200_callback(body={}, headers={"Cache-Control": "max-age=60"}),
+    )
+    api = ClientAPI(url=URL, session=Session(), log_requests=False, cache=ResponseCache())
+    api.execute_request(RESOURCE)
+
+    # When
+    response = api.execute_request(RESOURCE)
+
+    # Then
+    assert response.timing.cached
+    assert response.timing.attempts == 0
+    assert response.timing.ttfb_ms is None
+
+
+class DummyModel(BaseModel):
+    attribute: int
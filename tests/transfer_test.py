@@ -0,0 +1,176 @@
+import hashlib
+import io
+from http import HTTPStatus
+
+import pytest
+import responses
+from requests import Session
+
+from clientapi import APIHTTPError, ClientAPI
+from clientapi.mocks import (
+    http_200_callback,
+    http_206_callback,
+    http_404_callback,
+    http_416_callback,
+)
+from clientapi.transfer import DownloadError
+
+URL = "https://url.com"
+RESOURCE = "/report"
+CONTENT = bytes(range(256)) * 40
+
+
+# Scenarios for download
+# Scenario 01: Success - To a path, a binary handle and a buffer, in chunks
+# Scenario 02: Success - Checksum computed while streaming
+# Scenario 03: Failed - Content bigger than the buffer
+# Scenario 04: Failed - HTTP error
+@pytest.mark.parametrize("dest_type", ["path", "handle", "buffer"])
+@responses.activate
+def test_download(tmp_path, dest_type):
+    # Given
+    responses.add_callback(url=f"{URL}{RESOURCE}", method="GET", callback=http_200_callback(body=CONTENT))
+    dest = {
+        "path": tmp_path / "report.bin",
+        "handle": io.BytesIO(),
+        "buffer": bytearray(len(CONTENT)),
+    }[dest_type]
+
+    # When
+    result = _api().download(RESOURCE, dest, chunk_size=1000)
+
+    # Then
+    assert result.bytes_written == result.size == len(CONTENT)
+    assert not result.resumed
+    assert result.checksum is None
+    written = {
+        "path": lambda: dest.read_bytes(),
+        "handle": lambda: dest.getvalue(),
+        "buffer": lambda: bytes(dest),
+    }[dest_type]()
+    assert written == CONTENT
+
+
+@responses.activate
+def test_download_checksum():
+    # Given
+    responses.add_callback(url=f"{URL}{RESOURCE}", method="GET", callback=http_200_callback(body=CONTENT))
+
+    # When
+    result = _api().download(RESOURCE, io.BytesIO(), chunk_size=1000, checksum="sha256")
+
+    # Then
+    assert result.checksum == hashlib.sha256(CONTENT).hexdigest()
+
+
+@responses.activate
+def test_download_buffer_too_small():
+    # Given
+    responses.add_callback(url=f"{URL}{RESOURCE}", method="GET", callback=http_200_callback(body=CONTENT))
+
+    # When / Then
+    with pytest.raises(DownloadError):
+        _api().download(RESOURCE, bytearray(100))
+
+
+@responses.activate
+def test_download_http_error(tmp_path):
+    # Given
+    responses.add_callback(url=f"{URL}{RESOURCE}", method="GET", callback=http_404_callback())
+
+    # When / Then
+    with pytest.raises(APIHTTPError) as ex_info:
+        _api().download(RESOURCE, tmp_path / "report.bin")
+    assert ex_info.value.status_code == HTTPStatus.NOT_FOUND
+
+
+# Scenarios for resumed downloads
+# Scenario 01: Success - The rest of the content is appended (206)
+# Scenario 02: Success - The server ignores the range and sends it all (200)
+# Scenario 03: Success - The partial download was already complete (416)
+# Scenario 04: Failed - The server sends another range
+@responses.activate
+def test_download_resume(tmp_path):
+    # Given
+    dest = tmp_path / "report.bin"
+    dest.write_bytes(CONTENT[:1000])
+    responses.add_callback(
+        url=f"{URL}{RESOURCE}",
+        method="GET",
+        callback=http_206_callback(
+            body=CONTENT[1000:],
+            headers={"Content-Range": f"bytes 1000-{len(CONTENT) - 1}/{len(CONTENT)}"},
+            request_headers={"Range": "bytes=1000-"},
+        ),
+    )
+
+    # When
+    result = _api().download(RESOURCE, dest, checksum="md5", resume=True, headers={"accept-encoding": "gzip"})
+
+    # Then
+    assert responses.calls[0].request.headers["Accept-Encoding"] == "identity"
+    assert result.resumed
+    assert result.bytes_written == len(CONTENT) - 1000
+    assert result.size == len(CONTENT)
+    assert result.checksum == hashlib.md5(CONTENT).hexdigest()
+    assert dest.read_bytes() == CONTENT
+
+
+@responses.activate
+def test_download_resume_range_ignored(tmp_path):
+    # Given
+    dest = tmp_path / "report.bin"
+    dest.write_bytes(b"stale partial content")
+    responses.add_callback(url=f"{URL}{RESOURCE}", method="GET", callback=http_200_callback(body=CONTENT))
+
+    # When
+    result = _api().download(RESOURCE, dest, resume=True)
+
+    # Then
+    assert not result.resumed
+    assert result.size == len(CONTENT)
+    assert dest.read_bytes() == CONTENT
+
+
+@responses.activate
+def test_download_resume_complete(tmp_path):
+    # Given
+    dest = tmp_path / "report.bin"
+    dest.write_bytes(CONTENT)
+    responses.add_callback(url=f"{URL}{RESOURCE}", method="GET", callback=http_416_callback())
+
+    # When
+    result = _api().download(RESOURCE, dest, checksum="sha256", resume=True)
+
+    # Then
+    assert result.resumed
+    assert result.bytes_written == 0
+    assert result.size == len(CONTENT)
+    assert result.checksum == hashlib.sha256(CONTENT).hexdigest()
+
+
+@responses.activate
+def test_download_resume_wrong_range(tmp_path):
+    # Given
+    dest = tmp_path / "report.bin"
+    dest.write_bytes(CONTENT[:1000])
+    responses.add_callback(
+        url=f"{URL}{RESOURCE}",
+        method="GET",
+        callback=http_206_callback(body=CONTENT[500:], headers={"Content-Range": f"bytes 500-{len(CONTENT) - 1}/*"}),
+    )
+
+    # When / Then
+    with pytest.raises(DownloadError):
+        _api().download(RESOURCE, dest, resume=True)
+    assert dest.read_bytes() == CONTENT[:1000]
+
+
+def test_download_resume_not_a_path():
+    # When / Then
+    with pytest.raises(ValueError):
+        _api().download(RESOURCE, io.BytesIO(), resume=True)
+
+
+def _api():
+    return ClientAPI(url=URL, session=Session(), log_requests=False)